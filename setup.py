@@ -12,6 +12,7 @@ REQUIRED = [
     'Plone>=6.1',
 ]
 EXTRAS = {
+    'orjson': ['orjson'],
     'test': ['plone.app.testing']
 }
 
@@ -44,5 +45,9 @@ setup(
     entry_points="""
     [z3c.autoinclude.plugin]
     target = plone
+
+    [console_scripts]
+    kyra-load-test = interaktiv.kyra.loadtest:main
+    kyra-stub-server = interaktiv.kyra.stubserver:main
     """
 )
@@ -1,3 +1,10 @@
+import asyncio
+from functools import cached_property
+from typing import Any, Awaitable, List, Optional
+
+from interaktiv.kyra.api.async_api import AsyncFiles
+from interaktiv.kyra.api.async_api import AsyncPrompts
+from interaktiv.kyra.api.base import APIContext
 from interaktiv.kyra.api.files import Files
 from interaktiv.kyra.api.prompts import Prompts
 
@@ -6,15 +13,69 @@ class KyraAPI:
     """Main API client for Kyra AI assistant service.
 
     This class serves as the central entry point for all Kyra API operations.
+    The sub-clients are created on first access and share one lazily
+    initialized connection and authentication context.
 
     Attributes:
+        context: Credentials, token and deadline shared by the sub-clients.
+            ``budget`` limits all calls to that many seconds from now.
         prompts: Interface for prompt-related operations (CRUD, apply).
         files: Interface for file-related operations (upload, download, delete).
     """
 
-    prompts: Prompts
-    files: Files
+    context: APIContext
+
+    def __init__(self, budget: Optional[float] = None):
+        self.context = APIContext(budget)
+
+    @cached_property
+    def prompts(self) -> Prompts:
+        return Prompts(self.context)
+
+    @cached_property
+    def files(self) -> Files:
+        return Files(self.context)
+
+
+class AsyncKyraAPI:
+    """Asyncio variant of ``KyraAPI`` for running independent calls
+    concurrently.
+
+    Example::
+
+        kyra = AsyncKyraAPI()
+        prompt, files = kyra.gather(
+            kyra.prompts.get(prompt_id),
+            kyra.files.get(prompt_id)
+        )
+
+    Attributes:
+        context: Credentials and token shared by the sub-clients.
+        prompts: Coroutine interface for prompt-related operations.
+        files: Coroutine interface for file-related operations.
+    """
+
+    context: APIContext
+
+    def __init__(self, budget: Optional[float] = None):
+        self.context = APIContext(budget)
+
+    @cached_property
+    def prompts(self) -> AsyncPrompts:
+        return AsyncPrompts(self.context)
+
+    @cached_property
+    def files(self) -> AsyncFiles:
+        return AsyncFiles(self.context)
+
+    @staticmethod
+    def gather(*calls: Awaitable[Any]) -> List[Any]:
+        """Run the given calls concurrently from synchronous code and return
+        their results in order.
+
+        Must not be called while an event loop is running in this thread.
+        """
+        async def _gather():
+            return await asyncio.gather(*calls)
 
-    def __init__(self):
-        self.prompts = Prompts()
-        self.files = Files()
+        return asyncio.run(_gather())
@@ -0,0 +1,58 @@
+"""Asyncio based clients for concurrent Kyra API calls."""
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import executor
+from interaktiv.kyra.api.files import Files
+from interaktiv.kyra.api.prompts import PromptsBase
+
+
+class AsyncAPIBase(APIBase):
+    """Coroutine variant of ``APIBase.request``.
+
+    Headers, token and settings are resolved in the event loop thread,
+    which is the calling Zope thread when run via ``AsyncKyraAPI.gather``.
+    Only the HTTP exchange itself runs in the shared executor, over the
+    same pooled session as the synchronous clients. The client methods
+    are those of the synchronous clients, they return coroutines here
+    because ``_call`` does.
+    """
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            include_content_type: bool = True,
+            get_content: bool = False,
+            endpoint: Optional[str] = None,
+            operation: str = 'get',
+            cache: bool = False,
+            **kwargs
+    ) -> Dict[str, Any]:
+        with self._start_span(method, url, operation) as span:
+            send, timings = self._prepare_request(
+                span, method, url, include_content_type, get_content, endpoint, operation, cache, **kwargs
+            )
+            result = await asyncio.get_running_loop().run_in_executor(executor, send)
+            self._finish_request(span, timings, method, url, operation, result)
+            return result
+
+    async def _call(
+            self,
+            method: str,
+            url: str,
+            finish: Optional[Callable[[Dict[str, Any]], Any]] = None,
+            **kwargs
+    ) -> Any:
+        result = await self.request(method, url, **kwargs)
+        return finish(result) if finish is not None else result
+
+
+class AsyncPrompts(AsyncAPIBase, PromptsBase):
+    """Coroutine variant of the gateway calls of ``Prompts``."""
+
+
+class AsyncFiles(AsyncAPIBase, Files):
+    """Coroutine variant of ``Files``."""
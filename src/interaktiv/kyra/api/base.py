@@ -1,60 +1,242 @@
 """Base class for Kyra API client operations."""
 
+import copy
+import dataclasses
+import functools
+import gzip
+import json
+import logging
 import time
-from typing import Tuple, Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Any, Callable, Dict, Optional
+from urllib.parse import urlencode
 
 import requests
 from interaktiv.kyra import logger
-from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
-from interaktiv.kyra.registry.ai_assistant_cache import IAIAssistantCacheSchema
-from plone import api
+from interaktiv.kyra.api.breaker import BREAKER_FAILURE_THRESHOLD_DEFAULT
+from interaktiv.kyra.api.breaker import CircuitBreaker
+from interaktiv.kyra.api.breaker import circuit_breakers
+from interaktiv.kyra.api.bulkhead import Bulkhead
+from interaktiv.kyra.api.bulkhead import apply_bulkhead
+from interaktiv.kyra.api.cache import ResponseCache
+from interaktiv.kyra.api.cache import broadcast_invalidation
+from interaktiv.kyra.api.cache import prompt_cache
+from interaktiv.kyra.api.cache import sync_invalidations
+from interaktiv.kyra.api.coalesce import single_flight
+from interaktiv.kyra.api.codec import get_codec
+from interaktiv.kyra.api.metrics import get_body_size
+from interaktiv.kyra.api.metrics import metrics
+from interaktiv.kyra.api.ratelimit import TokenBucket
+from interaktiv.kyra.api.ratelimit import rate_limiters
+from interaktiv.kyra.api.retry import NO_RETRY
+from interaktiv.kyra.api.retry import RetryPolicy
+from interaktiv.kyra.api.session import HTTP_POOL_CONNECTIONS_DEFAULT
+from interaktiv.kyra.api.session import HTTP_POOL_MAXSIZE_DEFAULT
+from interaktiv.kyra.api.session import session_pool
+from interaktiv.kyra.api.timing import CallTimings
+from interaktiv.kyra.api.timing import measure
+from interaktiv.kyra.api.tokens import TOKEN_REFRESH_MARGIN_DEFAULT
+from interaktiv.kyra.api.tokens import get_jwt_expiration
+from interaktiv.kyra.api.tokens import token_store
+from interaktiv.kyra.api.tracing import NOOP_SPAN
+from interaktiv.kyra.api.tracing import SPAN_KIND_CLIENT
+from interaktiv.kyra.api.tracing import get_tracing_file
+from interaktiv.kyra.api.tracing import tracer
+from interaktiv.kyra.registry.settings import get_settings
+from urllib3.util.request import ACCEPT_ENCODING
 
 KEYCLOAK_TOKEN_EXPIRATION_TIME_DEFAULT = 1200
 
+# Default (connect, read) timeouts in seconds per operation
+OPERATION_TIMEOUTS = {
+    'list': (3.05, 10.0),
+    'get': (3.05, 10.0),
+    'apply': (3.05, 120.0),
+    'upload': (3.05, 60.0),
+    'download': (3.05, 60.0),
+    'token': (3.05, 10.0),
+}
+
+# Operations whose JSON bodies are gzip compressed above the threshold
+COMPRESSED_OPERATIONS = frozenset(('apply', 'create', 'update'))
+
+BUSY_ERROR = 'Assistant busy - please try again in a moment'
+
+# Headers of a request revalidating a stale prompt cache entry
+CONDITIONAL_HEADERS = frozenset(('If-None-Match', 'If-Modified-Since'))
+
+ASYNC_MAX_WORKERS = 10
+
+# Worker threads for calls sent in the background, like those of
+# ``AsyncKyraAPI`` and the prefetched pages of ``Prompts.iter_all``
+executor = ThreadPoolExecutor(
+    max_workers=ASYNC_MAX_WORKERS,
+    thread_name_prefix='interaktiv.kyra async'
+)
+
+slow_call_logger = logging.getLogger('interaktiv.kyra.slow_calls')
+
+
+class APIContext:
+    """Connection and authentication state shared by the API sub-clients.
+
+    Credentials and token are resolved on first use and then reused by
+    every client borrowing the context, so ``KyraAPI`` reads them only once
+    no matter how many sub-clients a request touches. An optional deadline
+    (``time.monotonic`` based) caps the timeouts of all following calls.
+    """
+
+    credentials: Optional[Tuple[str, str, str, str]]
+    token: Optional[str]
+    deadline: Optional[float]
+
+    def __init__(self, budget: Optional[float] = None) -> None:
+        self.credentials = None
+        self.token = None
+        self.deadline = None
+        if budget:
+            self.set_budget(budget)
+
+    def set_budget(self, budget: float) -> None:
+        """Limit all following calls to ``budget`` seconds from now."""
+        self.deadline = time.monotonic() + budget
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestOptions:
+    """Per-call policies, resolved in the calling thread for ``APIBase._send``."""
+
+    operation: str = 'get'
+    retry_policy: RetryPolicy = NO_RETRY
+    breaker: Optional[CircuitBreaker] = None
+    timeout: Tuple[float, float] = OPERATION_TIMEOUTS['get']
+    deadline: Optional[float] = None
+    compress_min_size: int = 0
+    rate_limiter: Optional[TokenBucket] = None
+    rate_limit_wait: float = 0
+    bulkhead: Optional[Bulkhead] = None
+    bulkhead_wait: float = 0
+    timings: Optional[CallTimings] = None
+    cache: Optional[ResponseCache] = None
+
+    def get_wait(self, wait: float) -> float:
+        """``wait`` cut down to the time left until the deadline."""
+        if self.deadline is not None:
+            wait = min(wait, self.deadline - time.monotonic())
+        return max(0.0, wait)
+
+    def get_timeout(self, attempt_deadline: Optional[float] = None) -> Tuple[float, float]:
+        """Connect and read timeout, cut down to the earliest deadline.
+
+        Raises ``requests.Timeout`` if that deadline has already passed.
+        """
+        deadlines = [d for d in (self.deadline, attempt_deadline) if d is not None]
+        if not deadlines:
+            return self.timeout
+
+        remaining = min(deadlines) - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout('Request deadline exceeded')
+        connect, read = self.timeout
+        return min(connect, remaining), min(read, remaining)
+
 
 class APIBase:
     """Handles authentication via Keycloak, token management, and provides
     a unified interface for making HTTP requests to the Kyra gateway service.
+
+    Attributes:
+        endpoint: Endpoint class of the client, calls of one class share a
+            circuit breaker.
     """
 
-    gateway_url: str
-    realms_url: str
-    client_id: str
-    client_secret: str
-    token: str
+    endpoint: str = 'gateway'
+    context: APIContext
+
+    def __init__(self, context: Optional[APIContext] = None) -> None:
+        self.context = context or APIContext()
+
+    @property
+    def gateway_url(self) -> str:
+        return self._get_credentials()[0]
+
+    @property
+    def realms_url(self) -> str:
+        return self._get_credentials()[1]
 
-    def __init__(self) -> None:
-        self.gateway_url, self.realms_url, self.client_id, self.client_secret = self._get_api_credentials()
-        self.token = self._get_token(self.realms_url, self.client_id, self.client_secret)
+    @property
+    def client_id(self) -> str:
+        return self._get_credentials()[2]
+
+    @property
+    def client_secret(self) -> str:
+        return self._get_credentials()[3]
+
+    @property
+    def token(self) -> str:
+        if self.context.token is None:
+            self.context.token = self._get_token(self.realms_url, self.client_id, self.client_secret)
+        return self.context.token
+
+    def _get_credentials(self) -> Tuple[str, str, str, str]:
+        if self.context.credentials is None:
+            self.context.credentials = self._get_api_credentials()
+        return self.context.credentials
 
     @staticmethod
     def _get_api_credentials() -> Tuple[str, str, str, str]:
-        gateway_url = api.portal.get_registry_record(
-            name='gateway_url',
-            interface=IAIAssistantSchema
-        )
-        realms_url = api.portal.get_registry_record(
-            name='keycloak_realms_url',
-            interface=IAIAssistantSchema
+        settings = get_settings()
+        return (
+            settings.gateway_url,
+            settings.keycloak_realms_url,
+            settings.keycloak_client_id,
+            settings.keycloak_client_secret
         )
-        client_id = api.portal.get_registry_record(
-            name='keycloak_client_id',
-            interface=IAIAssistantSchema
-        )
-        client_secret = api.portal.get_registry_record(
-            name='keycloak_client_secret',
-            interface=IAIAssistantSchema
-        )
-        return gateway_url, realms_url, client_id, client_secret
+
+    @staticmethod
+    def _get_pool_settings() -> Tuple[int, int, int]:
+        settings = get_settings()
+        pool_connections = settings.http_pool_connections or HTTP_POOL_CONNECTIONS_DEFAULT
+        pool_maxsize = settings.http_pool_maxsize or HTTP_POOL_MAXSIZE_DEFAULT
+        return pool_connections, pool_maxsize, settings.http_pool_idle_timeout
+
+    def _get_session(self) -> requests.Session:
+        return session_pool.get(*self._get_pool_settings())
 
     def _get_token(self, realms_url: str, client_id: str, client_secret: str) -> str:
         if not (realms_url and client_id and client_secret):
             return ''
 
-        token_from_registry = self._get_token_from_registry()
-        if token_from_registry:
-            return token_from_registry
+        settings = get_settings()
+        token_expiration_time = settings.keycloak_token_expiration_time or KEYCLOAK_TOKEN_EXPIRATION_TIME_DEFAULT
+        refresh_margin = settings.keycloak_token_refresh_margin or TOKEN_REFRESH_MARGIN_DEFAULT
+        pool_settings = self._get_pool_settings()
+        timeout = self._get_timeout('token')
+
+        span = tracer.start_span('keycloak token', attributes={'url.full': realms_url}) if tracer.enabled else NOOP_SPAN
+        with span:
+            # The fetch runs in the background renewer as well, so it must
+            # not read the registry itself
+            token = token_store.get(
+                (realms_url, client_id),
+                lambda: self._fetch_token(
+                    realms_url, client_id, client_secret, pool_settings, token_expiration_time, timeout
+                ),
+                refresh_margin
+            )
+            if not token:
+                span.set_error('No token')
+            return token
 
+    @staticmethod
+    def _fetch_token(
+            realms_url: str,
+            client_id: str,
+            client_secret: str,
+            pool_settings: Tuple[int, int, int],
+            default_lifetime: float,
+            timeout: Tuple[float, float] = OPERATION_TIMEOUTS['token']
+    ) -> Tuple[str, float]:
         token_url = f'{realms_url}/protocol/openid-connect/token'
 
         data = {
@@ -63,80 +245,394 @@ class APIBase:
             'client_secret': client_secret,
         }
 
+        token = ''
+        status = 'error'
+        response = None
+        started = time.monotonic()
         try:
-            response = requests.post(token_url, data=data)
+            response = session_pool.get(*pool_settings).post(token_url, data=data, timeout=timeout)
+            status = str(response.status_code)
             response.raise_for_status()
 
             token_data = response.json()
             token = token_data.get('access_token', '')
-
-            self._update_token_in_registry(token)
-            return token
+            return token, APIBase._get_token_lifetime(token_data, token, default_lifetime)
 
         except requests.HTTPError:
-            return ''
+            return '', 0
+
+        except (requests.ConnectionError, requests.Timeout) as e:
+            status = 'timeout' if isinstance(e, requests.Timeout) else 'connection_error'
+            logger.error(f'Keycloak token request failed: {e}')
+            return '', 0
+
+        finally:
+            metrics.observe_request('token', status, time.monotonic() - started, response)
+            metrics.count_token_refresh(bool(token))
 
     @staticmethod
-    def _get_token_from_registry() -> str:
-        token_timestamp = api.portal.get_registry_record(
-             name='keycloak_token_timestamp',
-             interface=IAIAssistantCacheSchema
-        )
-        if not token_timestamp:
-            return ''
+    def _get_token_lifetime(token_data: Dict[str, Any], token: str, default_lifetime: float) -> float:
+        """Lifetime in seconds from ``expires_in``, the JWT ``exp`` claim or
+        the configured expiration time, in this order.
+        """
+        try:
+            expires_in = float(token_data.get('expires_in') or 0)
+        except (TypeError, ValueError):
+            expires_in = 0
+        if expires_in > 0:
+            return expires_in
 
-        token_expiration_time = api.portal.get_registry_record(
-            name='keycloak_token_expiration_time',
-            interface=IAIAssistantSchema
-        ) or KEYCLOAK_TOKEN_EXPIRATION_TIME_DEFAULT
+        expiration = get_jwt_expiration(token)
+        if expiration and expiration > time.time():
+            return expiration - time.time()
 
-        now_timestamp = time.time()
-        diff_timestamps = float(now_timestamp) - float(token_timestamp)
-        if diff_timestamps > token_expiration_time:
-            return ''
+        return default_lifetime
 
-        token = api.portal.get_registry_record(
-            name='keycloak_token_value',
-            interface=IAIAssistantCacheSchema
-        )
-        if not token:
-            return ''
+    def request(
+            self,
+            method: str,
+            url: str,
+            include_content_type: bool = True,
+            get_content: bool = False,
+            endpoint: Optional[str] = None,
+            operation: str = 'get',
+            cache: bool = False,
+            **kwargs
+    ) -> Dict[str, Any]:
+        """Send a request to the gateway.
+
+        ``endpoint`` overrides the endpoint class of the client for the
+        circuit breaker, ``operation`` selects the configured timeouts.
+        Calls that are not listed in ``OPERATION_TIMEOUTS``, like create or
+        delete, use those of ``get``. GET calls with ``cache`` are served
+        from the prompt cache while it is enabled.
+        """
+        with self._start_span(method, url, operation) as span:
+            send, timings = self._prepare_request(
+                span, method, url, include_content_type, get_content, endpoint, operation, cache, **kwargs
+            )
+            result = send()
+            self._finish_request(span, timings, method, url, operation, result)
+            return result
+
+    def _call(
+            self,
+            method: str,
+            url: str,
+            finish: Optional[Callable[[Dict[str, Any]], Any]] = None,
+            **kwargs
+    ) -> Any:
+        """Send a request for a client method and pass the result through
+        ``finish``. The clients implement their methods with this, so
+        ``AsyncAPIBase`` only has to override it and ``request``.
+        """
+        result = self.request(method, url, **kwargs)
+        return finish(result) if finish is not None else result
+
+    def _prepare_request(
+            self,
+            span: Any,
+            method: str,
+            url: str,
+            include_content_type: bool = True,
+            get_content: bool = False,
+            endpoint: Optional[str] = None,
+            operation: str = 'get',
+            cache: bool = False,
+            **kwargs
+    ) -> Tuple[Callable[[], Dict[str, Any]], Optional[CallTimings]]:
+        """Resolve everything that needs the site for a call and return a
+        function sending it, which may run in a worker thread, with the
+        timings of the call.
+        """
+        timings = self._get_call_timings()
+        with measure(timings, 'token'):
+            headers = self._get_headers(include_content_type)
+        if not headers:
+            return lambda: {'error': 'No headers available'}, timings
+        if span.traceparent:
+            headers['traceparent'] = span.traceparent
+
+        with measure(timings, 'settings'):
+            session = self._get_session()
+            options = self._get_request_options(endpoint or self.endpoint, operation, timings, cache)
+        return functools.partial(self._send, session, method, url, headers, get_content, options, **kwargs), timings
+
+    def _finish_request(
+            self,
+            span: Any,
+            timings: Optional[CallTimings],
+            method: str,
+            url: str,
+            operation: str,
+            result: Any
+    ) -> None:
+        self._end_span(span, result)
+        if timings is not None:
+            self._log_slow_call(timings, method, url, operation, result, span)
+
+    @staticmethod
+    def _get_call_timings() -> Optional[CallTimings]:
+        """Timings of a call, if the slow-call log is enabled."""
+        started = time.monotonic()
+        if get_settings().slow_call_threshold <= 0:
+            return None
+        timings = CallTimings(started)
+        timings.add('settings', time.monotonic() - started)
+        return timings
+
+    def _log_slow_call(
+            self,
+            timings: CallTimings,
+            method: str,
+            url: str,
+            operation: str,
+            result: Any,
+            span: Any = None
+    ) -> None:
+        """Log a JSON record of the call if it took longer than the
+        configured threshold.
+        """
+        duration = timings.get_duration()
+        if duration < get_settings().slow_call_threshold:
+            return
+
+        record = {
+            'event': 'slow_call',
+            'operation': operation,
+            'method': method,
+            'url': url,
+            'prompt_id': self._get_prompt_id(url),
+            'error': result.get('error') if isinstance(result, dict) else None,
+            'duration': round(duration, 4),
+            'payload_size': timings.payload_size,
+            'response_size': timings.response_size,
+            'phases': {phase: round(seconds, 4) for phase, seconds in timings.phases.items()},
+        }
+        if span is not None and span.traceparent:
+            record['traceparent'] = span.traceparent
+        slow_call_logger.warning(json.dumps(record))
 
-        return token
+    def _get_prompt_id(self, url: str) -> Optional[str]:
+        gateway_url = (self.gateway_url or '').rstrip('/')
+        if not gateway_url or not url.startswith(gateway_url):
+            return None
+        return url[len(gateway_url):].strip('/').split('/')[0] or None
 
     @staticmethod
-    def _update_token_in_registry(token: str) -> None:
-        api.portal.set_registry_record(
-            name='keycloak_token_value',
-            value=token,
-            interface=IAIAssistantCacheSchema
-        )
-        api.portal.set_registry_record(
-             name='keycloak_token_timestamp',
-             value=str(time.time()),
-             interface=IAIAssistantCacheSchema
+    def _start_span(method: str, url: str, operation: str):
+        """Client span of a gateway call, a no-op unless tracing is on."""
+        tracer.configure(get_tracing_file())
+        if not tracer.enabled:
+            return NOOP_SPAN
+        return tracer.start_span(
+            f'kyra {operation}',
+            SPAN_KIND_CLIENT,
+            {'http.request.method': method, 'url.full': url, 'kyra.operation': operation}
         )
 
-    def request(
+    @staticmethod
+    def _end_span(span, result: Any) -> None:
+        if isinstance(result, dict) and result.get('error'):
+            span.set_error(str(result['error']))
+
+    def _get_request_options(
             self,
+            endpoint: str,
+            operation: str = 'get',
+            timings: Optional[CallTimings] = None,
+            cache: bool = False
+    ) -> RequestOptions:
+        settings = get_settings()
+        breaker = circuit_breakers.get(
+            (self.gateway_url or '', endpoint),
+            failure_threshold=settings.breaker_failure_threshold or BREAKER_FAILURE_THRESHOLD_DEFAULT,
+            reset_timeout=settings.breaker_reset_timeout
+        )
+        return RequestOptions(
+            operation=operation,
+            retry_policy=self._get_retry_policy(),
+            breaker=breaker,
+            timeout=self._get_timeout(operation),
+            deadline=self.context.deadline,
+            compress_min_size=settings.compression_min_size if operation in COMPRESSED_OPERATIONS else 0,
+            rate_limiter=self._get_rate_limiter(operation),
+            rate_limit_wait=settings.rate_limit_max_wait,
+            bulkhead=self._get_bulkhead(operation),
+            bulkhead_wait=settings.bulkhead_apply_queue_timeout,
+            timings=timings,
+            cache=self._get_cache() if cache else None
+        )
+
+    def _get_cache(self) -> Optional[ResponseCache]:
+        settings = get_settings()
+        if settings.prompt_cache_ttl <= 0 or settings.prompt_cache_max_size <= 0:
+            return None
+        prompt_cache.configure(settings.prompt_cache_ttl, settings.prompt_cache_max_size * 1024 * 1024)
+        domain_id = self._get_domain_id()
+        sync_invalidations(prompt_cache, lambda key: key[2] == domain_id)
+        return prompt_cache
+
+    def _invalidate_cache(self, *urls: str, broadcast: bool = True) -> None:
+        """Evict the cached results of ``urls`` in this process and, with
+        ``broadcast``, tell the other processes to drop theirs.
+        """
+        domain_id = self._get_domain_id()
+        prompt_cache.invalidate(lambda key: key[0] in urls and key[2] == domain_id)
+        if broadcast and get_settings().prompt_cache_ttl > 0:
+            broadcast_invalidation()
+
+    @staticmethod
+    def _get_bulkhead(operation: str) -> Optional[Bulkhead]:
+        settings = get_settings()
+        if operation != 'apply' or settings.bulkhead_apply_max_concurrent <= 0:
+            return None
+        apply_bulkhead.configure(settings.bulkhead_apply_max_concurrent, max(0, settings.bulkhead_apply_max_queue))
+        return apply_bulkhead
+
+    def _get_rate_limiter(self, operation: str) -> Optional[TokenBucket]:
+        """Token bucket of the domain id for apply or metadata calls, if
+        that class is limited.
+        """
+        settings = get_settings()
+        if operation == 'apply':
+            operation_class, rate, burst = 'apply', settings.rate_limit_apply, settings.rate_limit_apply_burst
+        else:
+            operation_class, rate, burst = 'metadata', settings.rate_limit_metadata, settings.rate_limit_metadata_burst
+        if not rate or rate <= 0:
+            return None
+        return rate_limiters.get((self._get_domain_id(), operation_class), rate, max(1, burst))
+
+    @staticmethod
+    def _get_timeout(operation: str) -> Tuple[float, float]:
+        settings = get_settings()
+        if operation not in OPERATION_TIMEOUTS:
+            operation = 'get'
+        default_connect, default_read = OPERATION_TIMEOUTS[operation]
+        connect = getattr(settings, f'timeout_{operation}_connect') or default_connect
+        read = getattr(settings, f'timeout_{operation}_read') or default_read
+        return connect, read
+
+    @staticmethod
+    def _send(
+            session: requests.Session,
             method: str,
             url: str,
-            include_content_type: bool = True,
+            headers: Dict[str, str],
             get_content: bool = False,
+            options: RequestOptions = RequestOptions(),
             **kwargs
     ) -> Dict[str, Any]:
-        headers = self._get_headers(include_content_type)
-        if not headers:
-            return {'error': 'No headers available'}
+        """Send a prepared request and map the response to a result dict.
+
+        Everything that needs the site, like settings and token, has to be
+        resolved by the caller, so this also runs in worker threads.
+        Identical concurrent GET calls share one upstream call. Cached GET
+        calls are answered from ``options.cache`` while fresh and
+        revalidated with a conditional request once stale.
+        """
+        request_key = APIBase._get_request_key(method, url, headers, kwargs)
+        if options.cache is not None and request_key is not None:
+            entry = options.cache.get(request_key)
+            if entry is not None and entry.fresh:
+                metrics.count_request(options.operation, 'cache_hit')
+                return copy.deepcopy(entry.data)
+            if entry is not None:
+                headers = {**headers, **entry.get_validators()}
+        send = functools.partial(
+            APIBase._send_once, session, method, url, headers, get_content, options, request_key, **kwargs
+        )
+        if request_key is None:
+            return send()
+        return single_flight.do(request_key, send)
+
+    @staticmethod
+    def _send_once(
+            session: requests.Session,
+            method: str,
+            url: str,
+            headers: Dict[str, str],
+            get_content: bool,
+            options: RequestOptions,
+            fallback_key: Optional[Tuple],
+            **kwargs
+    ) -> Dict[str, Any]:
+        bulkhead = options.bulkhead
+        if bulkhead is not None and not bulkhead.acquire(options.get_wait(options.bulkhead_wait)):
+            logger.warning(f'Bulkhead {bulkhead.name} is full, rejecting request')
+            metrics.count_request(options.operation, 'busy')
+            return {'error': BUSY_ERROR, 'busy': True}
 
         try:
-            response = requests.request(method, url, headers=headers, timeout=30, **kwargs)
+            limiter = options.rate_limiter
+            if limiter is not None and not limiter.acquire(options.get_wait(options.rate_limit_wait)):
+                logger.warning(f'Rate limit {limiter.name} reached, rejecting request')
+                metrics.count_request(options.operation, 'busy')
+                return {'error': BUSY_ERROR, 'busy': True}
+
+            return APIBase._dispatch(session, method, url, headers, get_content, options, fallback_key, **kwargs)
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+
+    @staticmethod
+    def _dispatch(
+            session: requests.Session,
+            method: str,
+            url: str,
+            headers: Dict[str, str],
+            get_content: bool,
+            options: RequestOptions,
+            fallback_key: Optional[Tuple],
+            **kwargs
+    ) -> Dict[str, Any]:
+        breaker = options.breaker
+        if breaker is not None and not breaker.allow():
+            metrics.count_request(options.operation, 'circuit_open')
+            fallback = breaker.get_fallback(fallback_key) if fallback_key else None
+            if fallback is not None:
+                logger.warning(f'Circuit breaker {breaker.name} is open, serving last known result')
+                return copy.deepcopy(fallback)
+            logger.warning(f'Circuit breaker {breaker.name} is open, rejecting request')
+            return {'error': 'Service temporarily unavailable - please try again later'}
+
+        healthy = False
+        status = 'error'
+        response = None
+        started = time.monotonic()
+        try:
+            headers, kwargs = APIBase._encode_body(headers, options, kwargs)
+            response = APIBase._exchange(session, method, url, headers, options, **kwargs)
+            revalidated = None
+            if response.status_code == 304 and options.cache is not None and fallback_key:
+                revalidated = options.cache.revalidate(fallback_key)
+                if revalidated is None:
+                    # The entry was evicted while the conditional request was
+                    # on its way, so there is nothing left that is not modified
+                    unconditional = {
+                        key: value for key, value in headers.items() if key not in CONDITIONAL_HEADERS
+                    }
+                    if unconditional != headers:
+                        response = APIBase._exchange(session, method, url, unconditional, options, **kwargs)
+
+            if options.timings is not None:
+                options.timings.payload_size, options.timings.response_size = get_body_size(response)
+            status = str(response.status_code)
+            healthy = response.status_code < 500
             response.raise_for_status()
+            if revalidated is not None:
+                return revalidated
 
             # Handle successful responses
             if response.status_code in (200, 201) and hasattr(response, 'content'):
                 if 'application/json' in response.headers.get('content-type'):
-                    return response.json()
+                    with measure(options.timings, 'decode'):
+                        result = get_codec().loads(response.content)
+                    if breaker is not None and fallback_key:
+                        breaker.remember(fallback_key, copy.deepcopy(result))
+                    if options.cache is not None and fallback_key and response.status_code == 200:
+                        options.cache.set(fallback_key, result, len(response.content), response.headers)
+                    return result
                 elif get_content:
                     return {'content': response.content}
             elif response.status_code == 204:
@@ -149,7 +645,7 @@ class APIBase:
             logger.error(f'API HTTP error: {e}')
             if e.response is not None:
                 try:
-                    error_detail = e.response.json()
+                    error_detail = get_codec().loads(e.response.content)
                     error_msg = error_detail.get('error', str(e))
                     logger.error(f'API error detail: {error_detail}')
                     return {'error': error_msg}
@@ -158,10 +654,12 @@ class APIBase:
             return {'error': str(e)}
 
         except requests.Timeout:
+            status = 'timeout'
             logger.error('API request timeout')
             return {'error': 'Request timeout - please try again'}
 
         except requests.ConnectionError:
+            status = 'connection_error'
             logger.error('API connection error')
             return {'error': 'Cannot connect to API service'}
 
@@ -169,6 +667,113 @@ class APIBase:
             logger.error(f'API request failed: {e}')
             return {'error': f'Request failed: {e}'}
 
+        finally:
+            metrics.observe_request(options.operation, status, time.monotonic() - started, response)
+            if breaker is not None:
+                breaker.record(healthy)
+
+    @staticmethod
+    def _encode_body(
+            headers: Dict[str, str],
+            options: RequestOptions,
+            kwargs: Dict[str, Any]
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Encode a ``json`` body with the configured codec and gzip it if
+        it reaches ``options.compress_min_size``.
+        """
+        if kwargs.get('json') is None:
+            return headers, kwargs
+
+        kwargs = dict(kwargs)
+        body = get_codec().dumps(kwargs.pop('json'))
+        headers = {**headers, 'Content-Type': 'application/json'}
+        if options.compress_min_size and len(body) >= options.compress_min_size:
+            body = gzip.compress(body, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        kwargs['data'] = body
+        return headers, kwargs
+
+    @staticmethod
+    def _get_request_key(method: str, url: str, headers: Dict[str, str], kwargs: Dict[str, Any]) -> Optional[Tuple]:
+        """Identity of a GET call for coalescing and breaker fallbacks."""
+        if method.upper() != 'GET':
+            return None
+        params = urlencode(sorted((kwargs.get('params') or {}).items()), doseq=True)
+        return url, params, headers.get('x-domain-id')
+
+    @staticmethod
+    def _exchange(
+            session: requests.Session,
+            method: str,
+            url: str,
+            headers: Dict[str, str],
+            options: RequestOptions,
+            **kwargs
+    ) -> requests.Response:
+        """Send the request, repeating it as the retry policy allows.
+
+        The first attempt gets the full operation timeout, retries only the
+        rest of the retry deadline. No attempt outlasts the deadline passed
+        down by the caller. Returns the last response or raises the last
+        connection error.
+        """
+        retry_policy = options.retry_policy
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            retry_deadline = started + retry_policy.deadline if attempt > 1 else None
+            timeout = options.get_timeout(retry_deadline)
+            try:
+                response = APIBase._request_once(session, method, url, headers, timeout, options.timings, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = APIBase._get_retry_delay(options, method, attempt, started, error=e)
+                if delay is None:
+                    raise
+                logger.warning(f'API request failed ({e}), retrying in {delay:.2f}s')
+                metrics.count_retry(options.operation)
+            else:
+                delay = APIBase._get_retry_delay(options, method, attempt, started, response=response)
+                if delay is None:
+                    return response
+                logger.warning(f'API request returned {response.status_code}, retrying in {delay:.2f}s')
+                metrics.count_retry(options.operation)
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _request_once(
+            session: requests.Session,
+            method: str,
+            url: str,
+            headers: Dict[str, str],
+            timeout: Tuple[float, float],
+            timings: Optional[CallTimings],
+            **kwargs
+    ) -> requests.Response:
+        if timings is None:
+            return session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        with timings.exchange() as outcome:
+            outcome['response'] = session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            return outcome['response']
+
+    @staticmethod
+    def _get_retry_delay(options: RequestOptions, method: str, attempt: int, started: float, **kwargs) -> Optional[float]:
+        delay = options.retry_policy.get_delay(method, attempt, started, **kwargs)
+        if delay is not None and options.deadline is not None and options.deadline - time.monotonic() <= delay:
+            return None
+        return delay
+
+    @staticmethod
+    def _get_retry_policy() -> RetryPolicy:
+        settings = get_settings()
+        return RetryPolicy(
+            max_attempts=max(1, settings.retry_max_attempts),
+            backoff_base=settings.retry_backoff_base,
+            backoff_max=settings.retry_backoff_max,
+            deadline=settings.retry_deadline
+        )
+
     def _get_headers(self, include_content_type: bool = True) -> Dict[str, str]:
         domain_id = self._get_domain_id()
         if not (self.token and domain_id):
@@ -176,7 +781,8 @@ class APIBase:
 
         headers = {
             'Authorization': f'Bearer {self.token}',
-            'x-domain-id': domain_id
+            'x-domain-id': domain_id,
+            'Accept-Encoding': ACCEPT_ENCODING
         }
         if include_content_type:
             headers['Content-Type'] = 'application/json'
@@ -184,8 +790,4 @@ class APIBase:
 
     @staticmethod
     def _get_domain_id() -> str:
-        domain_id = api.portal.get_registry_record(
-            name='domain_id',
-            interface=IAIAssistantSchema
-        )
-        return domain_id or 'plone'
+        return get_settings().domain_id or 'plone'
@@ -0,0 +1,152 @@
+"""Circuit breakers guarding the Kyra gateway."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from interaktiv.kyra import logger
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+BREAKER_FAILURE_THRESHOLD_DEFAULT = 5
+BREAKER_RESET_TIMEOUT_DEFAULT = 30
+BREAKER_FALLBACK_SIZE = 100
+
+BreakerKey = Tuple[str, str]
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint class of the gateway after repeated
+    failures, so worker threads do not block on a service that is down.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. Then a single trial call
+    is let through (half-open): success closes the breaker, failure opens
+    it again. While open, the last successful result of a GET call can be
+    served as fallback.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = BREAKER_FAILURE_THRESHOLD_DEFAULT,
+            reset_timeout: float = BREAKER_RESET_TIMEOUT_DEFAULT
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._rejected = 0
+        self._fallbacks: OrderedDict = OrderedDict()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self._rejected += 1
+                    return False
+                self._set_state(HALF_OPEN)
+
+            if self._trial_running:
+                self._rejected += 1
+                return False
+            self._trial_running = True
+            return True
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a call that was allowed."""
+        with self._lock:
+            self._trial_running = False
+            if success:
+                self._failures = 0
+                if self._state != CLOSED:
+                    self._set_state(CLOSED)
+                return
+
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self._state != OPEN:
+                    self._set_state(OPEN)
+
+    def remember(self, key: Hashable, result: Dict[str, Any]) -> None:
+        """Keep ``result`` as fallback for ``key`` while the breaker is open."""
+        with self._lock:
+            self._fallbacks[key] = result
+            self._fallbacks.move_to_end(key)
+            while len(self._fallbacks) > BREAKER_FALLBACK_SIZE:
+                self._fallbacks.popitem(last=False)
+
+    def get_fallback(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._fallbacks.get(key)
+
+    def info(self) -> Dict[str, Any]:
+        """State of the breaker for operators."""
+        state = self.state
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': state,
+                'failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'rejected': self._rejected,
+                'fallbacks': len(self._fallbacks),
+            }
+
+    def _set_state(self, state: str) -> None:
+        logger.warning(f'Circuit breaker {self.name}: {self._state} -> {state}')
+        self._state = state
+
+
+class CircuitBreakers:
+    """Process-wide circuit breakers per gateway URL and endpoint class."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._breakers: Dict[BreakerKey, CircuitBreaker] = {}
+
+    def get(
+            self,
+            key: BreakerKey,
+            failure_threshold: int = BREAKER_FAILURE_THRESHOLD_DEFAULT,
+            reset_timeout: float = BREAKER_RESET_TIMEOUT_DEFAULT
+    ) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(' '.join(key), failure_threshold, reset_timeout)
+            breaker.failure_threshold = failure_threshold
+            breaker.reset_timeout = reset_timeout
+            return breaker
+
+    def info(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.info() for breaker in breakers]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,90 @@
+"""Bulkhead limiting concurrent long-running gateway calls."""
+
+import threading
+import time
+from typing import Any, Dict
+
+BULKHEAD_MAX_CONCURRENT_DEFAULT = 4
+BULKHEAD_MAX_QUEUE_DEFAULT = 8
+
+
+class Bulkhead:
+    """Lets at most ``max_concurrent`` calls run at once.
+
+    Up to ``max_queue`` further callers wait for a free slot, each at most
+    for its own timeout. Callers beyond that are turned away at once, so
+    slow calls can only ever occupy a bounded number of worker threads.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            max_concurrent: int = BULKHEAD_MAX_CONCURRENT_DEFAULT,
+            max_queue: int = BULKHEAD_MAX_QUEUE_DEFAULT
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._lock = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def acquire(self, timeout: float = 0) -> bool:
+        """Take a slot, waiting at most ``timeout`` seconds for it."""
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiting:
+                self._active += 1
+                return True
+
+            if self._waiting >= self.max_queue or timeout <= 0:
+                self._rejected += 1
+                return False
+
+            self._waiting += 1
+            try:
+                ends = time.monotonic() + timeout
+                while self._active >= self.max_concurrent:
+                    remaining = ends - time.monotonic()
+                    if remaining <= 0:
+                        self._timed_out += 1
+                        return False
+                    self._lock.wait(remaining)
+                self._active += 1
+                return True
+            finally:
+                self._waiting -= 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._lock.notify()
+
+    def configure(self, max_concurrent: int, max_queue: int) -> None:
+        with self._lock:
+            self.max_concurrent = max_concurrent
+            self.max_queue = max_queue
+            self._lock.notify_all()
+
+    def info(self) -> Dict[str, Any]:
+        """State of the bulkhead for operators."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'waiting': self._waiting,
+                'rejected': self._rejected,
+                'timed_out': self._timed_out,
+            }
+
+    def reset(self) -> None:
+        """Reset the counters, slots in use are kept."""
+        with self._lock:
+            self._rejected = 0
+            self._timed_out = 0
+
+
+apply_bulkhead = Bulkhead('apply')
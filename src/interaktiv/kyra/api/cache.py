@@ -0,0 +1,221 @@
+"""Process-wide cache of prompt list and detail results.
+
+Each Zope process has its own cache. Writes evict the affected entries
+in the writing process right away and bump a generation counter stored
+in the site's annotations; since the ZODB is shared, the other ZEO
+clients see the new generation at their next transaction and drop their
+cached entries of the site.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from Acquisition import aq_base
+from BTrees.Length import Length
+from zope.annotation.interfaces import IAnnotations
+from zope.component.hooks import getSite
+
+PROMPT_CACHE_TTL_DEFAULT = 60
+PROMPT_CACHE_MAX_SIZE_DEFAULT = 10
+
+GENERATION_KEY = 'interaktiv.kyra.prompt_cache_generation'
+
+
+class CacheEntry:
+    """A cached result with the validators of the response it came from."""
+
+    __slots__ = ('data', 'etag', 'last_modified', 'size', 'expires_at')
+
+    def __init__(self, data: Any, etag: str, last_modified: str, size: int, expires_at: float) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def get_validators(self) -> Dict[str, str]:
+        """Headers to revalidate the entry with a conditional request."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of decoded gateway results.
+
+    Entries are served without asking the gateway for ``ttl`` seconds.
+    After that, an entry with an ``ETag`` or ``Last-Modified`` validator is
+    revalidated with a conditional request, a ``304 Not Modified`` answer
+    makes it fresh again. The cache holds at most ``max_size`` bytes of
+    response bodies, least recently used entries are evicted first.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            ttl: float = PROMPT_CACHE_TTL_DEFAULT,
+            max_size: int = PROMPT_CACHE_MAX_SIZE_DEFAULT * 1024 * 1024
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidated = 0
+        self._generations: Dict[Hashable, int] = {}
+
+    def configure(self, ttl: float, max_size: int) -> None:
+        with self._lock:
+            self.ttl = ttl
+            self.max_size = max_size
+            self._evict()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """The entry of ``key``, fresh or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.fresh:
+                self._misses += 1
+            else:
+                self._hits += 1
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, data: Any, size: int, headers: Mapping[str, str]) -> None:
+        """Store a copy of ``data``, the decoded body of ``size`` bytes of a
+        response with ``headers``.
+        """
+        if size > self.max_size:
+            return
+        entry = CacheEntry(
+            copy.deepcopy(data),
+            headers.get('ETag') or '',
+            headers.get('Last-Modified') or '',
+            size,
+            time.monotonic() + self.ttl
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += size
+            self._evict()
+
+    def revalidate(self, key: Hashable) -> Optional[Any]:
+        """Mark the entry of ``key`` fresh after a ``304 Not Modified`` and
+        return a copy of its data.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.monotonic() + self.ttl
+            self._revalidated += 1
+            data = entry.data
+        return copy.deepcopy(data)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop the entries whose key matches ``predicate``, return their
+        number.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def sync_generation(self, scope: Hashable, generation: int, predicate: Callable[[Hashable], bool]) -> bool:
+        """Drop the entries matching ``predicate`` if ``generation`` of
+        ``scope`` is newer than the last one seen.
+
+        Generations only grow, so a thread still reading an older state
+        does not drop the cache again.
+        """
+        with self._lock:
+            seen = self._generations.get(scope)
+            if seen is not None and generation <= seen:
+                return False
+            self._generations[scope] = generation
+            if seen is None:
+                return False
+        self.invalidate(predicate)
+        return True
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+            self._revalidated = 0
+            self._generations.clear()
+
+    def info(self) -> Dict[str, Any]:
+        """State of the cache for operators."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'ttl': self.ttl,
+                'max_size': self.max_size,
+                'entries': len(self._entries),
+                'size': self._size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'revalidated': self._revalidated,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and self._size > self.max_size:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+
+
+def sync_invalidations(cache: ResponseCache, predicate: Callable[[Hashable], bool]) -> None:
+    """Drop the entries of ``cache`` matching ``predicate`` if another
+    process invalidated the prompts of the current site.
+    """
+    site = getSite()
+    if site is None:
+        return
+    # Read the annotations directly, adapting the site costs more than a
+    # cache hit
+    annotations = getattr(aq_base(site), '__annotations__', None)
+    counter = annotations.get(GENERATION_KEY) if annotations is not None else None
+    generation = counter() if counter is not None else 0
+    cache.sync_generation('/'.join(site.getPhysicalPath()), generation, predicate)
+
+
+def broadcast_invalidation() -> None:
+    """Tell the other processes to drop their cached prompts of the
+    current site, once the transaction commits.
+    """
+    site = getSite()
+    if site is None:
+        return
+    annotations = IAnnotations(site)
+    counter = annotations.get(GENERATION_KEY)
+    if counter is None:
+        counter = annotations[GENERATION_KEY] = Length()
+    counter.change(1)
+
+
+prompt_cache = ResponseCache('prompts')
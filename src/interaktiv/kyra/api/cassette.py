@@ -0,0 +1,254 @@
+"""Record and replay gateway and Keycloak calls for offline benchmarks.
+
+A cassette is a JSON file of recorded interactions. While recording, all
+calls go to the network and their responses and latencies are stored.
+While replaying, calls are answered from the cassette after sleeping for
+the recorded latency times ``latency_scale``, so throughput and latency of
+the API layer can be measured reproducibly without a gateway::
+
+    from interaktiv.kyra.api.cassette import use_cassette
+
+    with use_cassette('prompts.json', mode='record'):
+        KyraAPI().prompts.list()
+
+    with use_cassette('prompts.json', latency_scale=0.5):
+        KyraAPI().prompts.list()
+
+Request headers and bodies are not stored, as they contain the token and
+the Keycloak client secret. The tokens in Keycloak's token responses are
+replaced by placeholders, replayed calls send those instead. Requests are matched by method, URL and a
+digest of the body, then by method and URL alone. Repeated requests get
+the recorded responses in turn, starting over when all were used.
+"""
+
+import base64
+import contextlib
+import datetime
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from interaktiv.kyra.api.session import session_pool
+from interaktiv.kyra.api.timing import TimedHTTPAdapter
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+CASSETTE_VERSION = 1
+
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+
+# Response headers that no longer apply to the decoded body
+DROPPED_HEADERS = frozenset(('content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'))
+
+TOKEN_PATH_SUFFIX = '/protocol/openid-connect/token'
+TOKEN_FIELDS = ('access_token', 'refresh_token', 'id_token')
+
+
+class CassetteError(requests.RequestException):
+    """A request has no recorded interaction in the cassette."""
+
+
+def normalize_url(url: str) -> str:
+    """``url`` with its query parameters sorted."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+
+def scrub_tokens(url: str, content: bytes) -> bytes:
+    """``content`` with the tokens of a Keycloak token response replaced
+    by placeholders. Other responses are returned unchanged.
+    """
+    if not urlsplit(url).path.endswith(TOKEN_PATH_SUFFIX):
+        return content
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+    if not isinstance(data, dict):
+        return content
+    for field in TOKEN_FIELDS:
+        if field in data:
+            data[field] = f'recorded-{field}'
+    return json.dumps(data).encode('utf-8')
+
+
+def get_body_digest(request: requests.PreparedRequest) -> str:
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    elif not isinstance(body, bytes):
+        return ''
+    if request.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return hashlib.sha256(body).hexdigest()
+
+
+class Cassette:
+    """Interactions recorded to or replayed from a JSON file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._played: Dict[Tuple, int] = {}
+
+    def load(self) -> 'Cassette':
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CASSETTE_VERSION:
+            raise ValueError(f'Unsupported cassette version in {self.path}: {data.get("version")}')
+        with self._lock:
+            self.interactions = data['interactions']
+            self._played.clear()
+        return self
+
+    def save(self) -> None:
+        with self._lock:
+            data = {'version': CASSETTE_VERSION, 'interactions': list(self.interactions)}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+    def add(self, interaction: Dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def find(self, request: requests.PreparedRequest) -> Optional[Dict[str, Any]]:
+        """Next recorded interaction for ``request``."""
+        method, url, digest = request.method.upper(), normalize_url(request.url), get_body_digest(request)
+        with self._lock:
+            for key in ((method, url, digest), (method, url)):
+                matches = [
+                    interaction for interaction in self.interactions
+                    if self._get_key(interaction, len(key)) == key
+                ]
+                if matches:
+                    played = self._played.get(key, 0)
+                    self._played[key] = played + 1
+                    return matches[played % len(matches)]
+        return None
+
+    @staticmethod
+    def _get_key(interaction: Dict[str, Any], length: int) -> Tuple:
+        request = interaction['request']
+        return (request['method'], request['url'], request['body_sha256'])[:length]
+
+
+class CassetteAdapter(BaseAdapter):
+    """Transport adapter that records or replays calls with a cassette."""
+
+    def __init__(
+            self,
+            cassette: Cassette,
+            mode: str = MODE_REPLAY,
+            latency_scale: float = 1.0,
+            adapter: Optional[BaseAdapter] = None
+    ) -> None:
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f'Unknown cassette mode: {mode}')
+        super().__init__()
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.adapter = adapter or TimedHTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        if self.mode == MODE_RECORD:
+            return self._record(request, stream, timeout, verify, cert, proxies)
+        return self._replay(request, timeout)
+
+    def close(self) -> None:
+        self.adapter.close()
+
+    def _record(self, request, stream, timeout, verify, cert, proxies) -> requests.Response:
+        interaction = {
+            'request': {
+                'method': request.method.upper(),
+                'url': normalize_url(request.url),
+                'body_sha256': get_body_digest(request),
+            },
+        }
+        started = time.monotonic()
+        try:
+            response = self.adapter.send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+            content = response.content
+        except (requests.ConnectionError, requests.Timeout) as e:
+            interaction['latency'] = time.monotonic() - started
+            interaction['error'] = 'timeout' if isinstance(e, requests.Timeout) else 'connection_error'
+            self.cassette.add(interaction)
+            raise
+
+        interaction['latency'] = time.monotonic() - started
+        interaction['response'] = {
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            'body_base64': base64.b64encode(scrub_tokens(request.url, content)).decode('ascii'),
+        }
+        self.cassette.add(interaction)
+        return response
+
+    def _replay(self, request: requests.PreparedRequest, timeout) -> requests.Response:
+        interaction = self.cassette.find(request)
+        if interaction is None:
+            raise CassetteError(f'No recorded interaction for {request.method} {request.url}', request=request)
+
+        latency = interaction['latency'] * self.latency_scale
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and latency > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.ReadTimeout(f'Replayed call exceeded read timeout of {read_timeout}s', request=request)
+        time.sleep(latency)
+
+        error = interaction.get('error')
+        if error == 'timeout':
+            raise requests.ReadTimeout('Recorded timeout', request=request)
+        if error is not None:
+            raise requests.ConnectionError('Recorded connection error', request=request)
+
+        recorded = interaction['response']
+        content = base64.b64decode(recorded['body_base64'])
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.headers['Content-Length'] = str(len(content))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=latency)
+        return response
+
+
+@contextlib.contextmanager
+def use_cassette(path: str, mode: str = MODE_REPLAY, latency_scale: float = 1.0):
+    """Send all Kyra calls of this process through a cassette.
+
+    In ``record`` mode the cassette is written to ``path`` when the block
+    ends, in ``replay`` mode it is read from there. Yields the cassette.
+    """
+    cassette = Cassette(path)
+    if mode == MODE_REPLAY:
+        cassette.load()
+    session_pool.set_transport(CassetteAdapter(cassette, mode, latency_scale))
+    try:
+        yield cassette
+    finally:
+        session_pool.set_transport(None)
+        if mode == MODE_RECORD:
+            cassette.save()
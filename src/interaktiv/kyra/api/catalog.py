@@ -0,0 +1,90 @@
+"""In-memory catalog of the prompts of a domain with prebuilt indexes."""
+
+import bisect
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from interaktiv.kyra.api.codec import get_codec
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def normalize(text: str) -> str:
+    """Case folded ``text`` without accents, so ``Übersetzen`` is found as
+    ``ubersetzen``.
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+class PromptCatalog:
+    """Prompts indexed by category, action and the tokens of their name
+    and description.
+
+    Searches intersect the index entries and never walk all prompts. A
+    query token matches every indexed token it is a prefix of, found by
+    bisecting the sorted token list. Results keep the gateway's order.
+    """
+
+    def __init__(self, prompts: Iterable[Dict[str, Any]]) -> None:
+        self.prompts: List[Dict[str, Any]] = []
+        self._categories: Dict[str, Set[int]] = {}
+        self._actions: Dict[str, Set[int]] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        for prompt in prompts:
+            self._index(len(self.prompts), prompt)
+            self.prompts.append(prompt)
+        self._sorted_tokens = sorted(self._tokens)
+        self.size = len(get_codec().dumps(self.prompts))
+
+    def _index(self, position: int, prompt: Dict[str, Any]) -> None:
+        metadata = prompt.get('metadata') or {}
+        for category in metadata.get('categories') or []:
+            self._categories.setdefault(normalize(category).strip(), set()).add(position)
+        action = metadata.get('action')
+        if action:
+            self._actions.setdefault(normalize(action), set()).add(position)
+        for token in tokenize(f'{prompt.get("name") or ""} {prompt.get("description") or ""}'):
+            self._tokens.setdefault(token, set()).add(position)
+
+    def get_categories(self) -> List[str]:
+        """Normalized names of all categories."""
+        return sorted(self._categories)
+
+    def search(
+            self,
+            category: Optional[str] = None,
+            action: Optional[str] = None,
+            query: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Prompts matching all given filters. ``query`` matches prompts
+        whose name or description contains words starting with each of
+        its words.
+        """
+        matches: Optional[Set[int]] = None
+        if category:
+            matches = self._intersect(matches, self._categories.get(normalize(category).strip(), set()))
+        if action:
+            matches = self._intersect(matches, self._actions.get(normalize(action), set()))
+        for token in tokenize(query or ''):
+            matches = self._intersect(matches, self._match_prefix(token))
+        if matches is None:
+            return list(self.prompts)
+        return [self.prompts[position] for position in sorted(matches)]
+
+    def _match_prefix(self, prefix: str) -> Set[int]:
+        positions: Set[int] = set()
+        index = bisect.bisect_left(self._sorted_tokens, prefix)
+        while index < len(self._sorted_tokens) and self._sorted_tokens[index].startswith(prefix):
+            positions |= self._tokens[self._sorted_tokens[index]]
+            index += 1
+        return positions
+
+    @staticmethod
+    def _intersect(matches: Optional[Set[int]], positions: Set[int]) -> Set[int]:
+        return set(positions) if matches is None else matches & positions
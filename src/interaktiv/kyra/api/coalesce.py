@@ -0,0 +1,84 @@
+"""Coalescing of identical concurrent gateway calls."""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from interaktiv.kyra import logger
+
+
+class _Call:
+    """A call in progress that identical calls wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs identical concurrent calls only once.
+
+    The first caller of a key runs the call, callers arriving while it is
+    in flight wait for it and receive a copy of its result. Nothing is
+    cached, a call starting after the result arrived runs again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._calls.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                flight.waiters += 1
+                self._coalesced += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                waiters = flight.waiters
+            if waiters:
+                logger.debug(f'Coalesced {waiters} identical calls')
+                # Waiters copy the result, so they must not see later
+                # changes of the leader to it
+                flight.result = copy.deepcopy(flight.result)
+            flight.done.set()
+
+    def info(self) -> Dict[str, int]:
+        """Counters of executed and coalesced calls for operators."""
+        with self._lock:
+            return {
+                'executed': self._executed,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._calls),
+            }
+
+    def clear(self) -> None:
+        """Reset the counters."""
+        with self._lock:
+            self._executed = 0
+            self._coalesced = 0
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,52 @@
+"""JSON codecs for gateway request and response bodies."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec:
+    """Encodes request bodies to and decodes response bodies from UTF-8 JSON
+    with the standard library.
+    """
+
+    name = 'json'
+
+    @staticmethod
+    def dumps(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def loads(content: bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+    """``JSONCodec`` based on orjson, used when it is installed."""
+
+    name = 'orjson'
+
+    @staticmethod
+    def dumps(data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    @staticmethod
+    def loads(content: bytes) -> Any:
+        return orjson.loads(content)
+
+
+json_codec: JSONCodec = OrjsonCodec() if orjson is not None else JSONCodec()
+
+
+def get_codec() -> JSONCodec:
+    return json_codec
+
+
+def set_codec(codec: JSONCodec) -> None:
+    """Replace the codec used for all gateway calls."""
+    global json_codec
+    json_codec = codec
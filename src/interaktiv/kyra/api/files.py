@@ -11,11 +11,12 @@ class Files(APIBase):
     upload, download, list, and delete operations.
     """
 
+    endpoint = 'files'
+
     def get(self, prompt_id: str) -> List[Dict[str, Any]]:
         """Retrieve list of files attached to a prompt."""
         url = f'{self.gateway_url}/{prompt_id}/files'
-        response = self.request('GET', url)
-        return response.get('files', [response])
+        return self._call('GET', url, lambda response: response.get('files', [response]))
 
     def upload(self, prompt_id: str, file_field: FileUpload) -> Dict[str, Any]:
         """Upload one or more files to a prompt."""
@@ -26,7 +27,7 @@ class Files(APIBase):
             files.append(('files', (filename, file_data, content_type)))
 
         url = f'{self.gateway_url}/{prompt_id}/files'
-        return self.request('POST', url, include_content_type=False, files=files)
+        return self._call('POST', url, include_content_type=False, operation='upload', files=files)
 
     def _prepare_files(self, file_field: FileUpload) -> List[Tuple[bytes, str, str]]:
         files_data = []
@@ -57,11 +58,9 @@ class Files(APIBase):
     def download(self, prompt_id: str, file_id: str) -> Dict[str, Union[bytes, str]]:
         """Download a file from a prompt."""
         url = f'{self.gateway_url}/{prompt_id}/files/{file_id}/download'
-        response = self.request('GET', url, get_content=True)
-        return response
+        return self._call('GET', url, get_content=True, operation='download')
 
     def delete(self, prompt_id: str, file_id: str) -> Dict[str, Any]:
         """Delete a file from a prompt."""
         url = f'{self.gateway_url}/{prompt_id}/files/{file_id}'
-        response = self.request('DELETE', url)
-        return response
+        return self._call('DELETE', url)
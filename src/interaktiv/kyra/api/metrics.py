@@ -0,0 +1,164 @@
+"""In-process metrics of Kyra gateway and Keycloak calls."""
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def get_body_size(response: Optional[requests.Response]) -> Tuple[int, int]:
+    """Bytes sent and received by the exchange that produced ``response``."""
+    sent = received = 0
+
+    body = getattr(getattr(response, 'request', None), 'body', None)
+    if isinstance(body, (bytes, str)):
+        sent = len(body)
+
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        received = int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        content = getattr(response, 'content', None)
+        if isinstance(content, bytes):
+            received = len(content)
+    return sent, received
+
+
+class _Histogram:
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms, rendered in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._durations: Dict[Labels, _Histogram] = defaultdict(_Histogram)
+        self._requests: Dict[Labels, int] = defaultdict(int)
+        self._retries: Dict[Labels, int] = defaultdict(int)
+        self._bytes_sent: Dict[Labels, int] = defaultdict(int)
+        self._bytes_received: Dict[Labels, int] = defaultdict(int)
+        self._token_refreshes: Dict[Labels, int] = defaultdict(int)
+
+    def observe_request(
+            self,
+            operation: str,
+            status: str,
+            duration: float,
+            response: Optional[requests.Response] = None
+    ) -> None:
+        """Record a finished call. ``status`` is the HTTP status code or an
+        error class like ``timeout`` or ``busy``.
+        """
+        sent, received = get_body_size(response)
+        key = (('operation', operation),)
+        with self._lock:
+            self._durations[key].observe(duration)
+            self._requests[key + (('status', status),)] += 1
+            self._bytes_sent[key] += sent
+            self._bytes_received[key] += received
+
+    def count_request(self, operation: str, status: str) -> None:
+        """Record a call that was answered without reaching the server."""
+        with self._lock:
+            self._requests[(('operation', operation), ('status', status))] += 1
+
+    def count_retry(self, operation: str) -> None:
+        with self._lock:
+            self._retries[(('operation', operation),)] += 1
+
+    def count_token_refresh(self, success: bool) -> None:
+        with self._lock:
+            self._token_refreshes[(('result', 'success' if success else 'failure'),)] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def render(self, extra: Iterable[str] = ()) -> str:
+        """Return all metrics in the Prometheus text format, followed by the
+        already rendered ``extra`` lines.
+        """
+        with self._lock:
+            lines = []
+            lines += self._render_histogram(
+                'kyra_request_duration_seconds',
+                'Duration of gateway and Keycloak calls including retries.',
+                self._durations
+            )
+            lines += self._render_counter(
+                'kyra_requests_total', 'Finished calls by operation and status.', self._requests
+            )
+            lines += self._render_counter(
+                'kyra_request_retries_total', 'Repeated call attempts.', self._retries
+            )
+            lines += self._render_counter(
+                'kyra_request_bytes_sent_total', 'Request body bytes sent.', self._bytes_sent
+            )
+            lines += self._render_counter(
+                'kyra_response_bytes_received_total', 'Response body bytes received.', self._bytes_received
+            )
+            lines += self._render_counter(
+                'kyra_token_refreshes_total', 'Keycloak token fetches by result.', self._token_refreshes
+            )
+        lines += list(extra)
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_counter(name: str, help_text: str, values: Dict[Labels, int]) -> List[str]:
+        lines = [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for labels, value in sorted(values.items()):
+            lines.append(f'{name}{format_labels(labels)} {value}')
+        return lines
+
+    @staticmethod
+    def _render_histogram(name: str, help_text: str, values: Dict[Labels, _Histogram]) -> List[str]:
+        lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for labels, histogram in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {histogram.total}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+        return lines
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def render_gauge(name: str, help_text: str, values: Iterable[Tuple[Labels, float]], kind: str = 'gauge') -> List[str]:
+    """Render a metric whose values are read from elsewhere at scrape time."""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    for labels, value in values:
+        lines.append(f'{name}{format_labels(labels)} {value}')
+    return lines
+
+
+metrics = Metrics()
@@ -0,0 +1,140 @@
+"""Persistent mirror of the gateway's prompts in the site annotations.
+
+The mirror is stored in the ZODB, so all ZEO clients share it and reads
+stay local while the gateway is slow or down. A sync walks the prompt
+list and writes only prompts whose ``version`` or ``updatedAt`` changed,
+then drops prompts the gateway no longer lists. Creates, updates and
+deletes through the client are written through right away.
+"""
+
+import copy
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from BTrees.OOBTree import OOBTree
+from persistent.mapping import PersistentMapping
+from zope.annotation.interfaces import IAnnotations
+from zope.component.hooks import getSite
+
+MIRROR_KEY = 'interaktiv.kyra.prompt_mirror'
+
+
+class PromptMirror:
+    """Prompts of one gateway URL and domain id, kept in ``storage``."""
+
+    def __init__(self, storage: PersistentMapping) -> None:
+        self.storage = storage
+
+    @property
+    def source(self) -> Tuple[str, str]:
+        return self.storage['source']
+
+    @property
+    def synced(self) -> bool:
+        return self.storage.get('synced_at') is not None
+
+    def get_prompts(self) -> List[Dict[str, Any]]:
+        """Copies of the prompts in the gateway's order."""
+        prompts = self.storage['prompts']
+        return [copy.deepcopy(prompts[prompt_id]) for prompt_id in self.storage['order'] if prompt_id in prompts]
+
+    def get(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        prompt = self.storage['prompts'].get(prompt_id)
+        return copy.deepcopy(prompt) if prompt is not None else None
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'gateway_url': self.source[0],
+            'domain_id': self.source[1],
+            'prompts': len(self.storage['prompts']),
+            'watermark': self.storage.get('watermark'),
+            'synced_at': self.storage.get('synced_at'),
+        }
+
+    def sync(self, prompts: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Apply the complete prompt list of the gateway, return the number
+        of added, updated, deleted and unchanged prompts.
+
+        ``prompts`` is read completely before anything is written, so a
+        failing page leaves the mirror as it was.
+        """
+        listed = [prompt for prompt in prompts if prompt.get('id')]
+        stored = self.storage['prompts']
+        counts = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+        for prompt in listed:
+            current = stored.get(prompt['id'])
+            if current is None:
+                counts['added'] += 1
+            elif _is_changed(current, prompt):
+                counts['updated'] += 1
+            else:
+                counts['unchanged'] += 1
+                continue
+            stored[prompt['id']] = copy.deepcopy(prompt)
+
+        listed_ids = [prompt['id'] for prompt in listed]
+        for prompt_id in set(stored.keys()) - set(listed_ids):
+            del stored[prompt_id]
+            counts['deleted'] += 1
+
+        if list(self.storage['order']) != listed_ids:
+            self.storage['order'] = listed_ids
+        watermark = max((prompt.get('updatedAt') or '' for prompt in listed), default='') or None
+        if watermark != self.storage.get('watermark'):
+            self.storage['watermark'] = watermark
+        self.storage['synced_at'] = time.time()
+        return counts
+
+    def put(self, prompt: Dict[str, Any]) -> None:
+        """Write a created or updated prompt through."""
+        if not prompt.get('id'):
+            return
+        if prompt['id'] not in self.storage['prompts']:
+            self.storage['order'] = list(self.storage['order']) + [prompt['id']]
+        self.storage['prompts'][prompt['id']] = copy.deepcopy(prompt)
+
+    def remove(self, prompt_id: str) -> None:
+        """Write a delete through."""
+        if prompt_id not in self.storage['prompts']:
+            return
+        del self.storage['prompts'][prompt_id]
+        self.storage['order'] = [i for i in self.storage['order'] if i != prompt_id]
+
+
+def get_mirror(gateway_url: str, domain_id: str, create: bool = False) -> Optional[PromptMirror]:
+    """Mirror of the current site for ``gateway_url`` and ``domain_id``.
+
+    A mirror of another gateway URL or domain id is replaced if ``create``
+    is set and ignored otherwise.
+    """
+    site = getSite()
+    if site is None:
+        return None
+    annotations = IAnnotations(site)
+    storage = annotations.get(MIRROR_KEY)
+    source = (gateway_url, domain_id)
+    if storage is not None and tuple(storage['source']) == source:
+        return PromptMirror(storage)
+    if not create:
+        return None
+
+    storage = annotations[MIRROR_KEY] = PersistentMapping({
+        'source': source,
+        'prompts': OOBTree(),
+        'order': [],
+        'watermark': None,
+        'synced_at': None,
+    })
+    return PromptMirror(storage)
+
+
+def _get_revision(prompt: Dict[str, Any]) -> Tuple[Any, Any]:
+    return prompt.get('version'), prompt.get('updatedAt')
+
+
+def _is_changed(current: Dict[str, Any], prompt: Dict[str, Any]) -> bool:
+    if _get_revision(prompt) == (None, None):
+        return current != prompt
+    return _get_revision(current) != _get_revision(prompt)
+
@@ -1,46 +1,203 @@
 """Client for prompt-related operations in Kyra API."""
 
-from typing import Any, Dict
+import functools
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import executor
+from interaktiv.kyra.api.catalog import PromptCatalog
+from interaktiv.kyra.api.mirror import PromptMirror
+from interaktiv.kyra.api.mirror import get_mirror
 from interaktiv.kyra.api.types import PromptData, InstructionData
+from interaktiv.kyra.registry.settings import get_settings
 
 
-class Prompts(APIBase):
-    """Provides methods to create, read, update, delete, and apply prompts
-    for AI-assisted content generation and processing.
+class PromptListError(Exception):
+    """A page of the prompt list could not be fetched."""
+
+
+class _PendingPage:
+    """A page of prompts requested in the shared executor."""
+
+    def __init__(self, future: Future, finish: Callable[[Dict[str, Any]], Any]) -> None:
+        self.future = future
+        self.finish = finish
+
+    def result(self) -> Dict[str, Any]:
+        """Wait for the page and finish the call in the calling thread."""
+        response = self.future.result()
+        self.finish(response)
+        return response
+
+
+class PromptsBase(APIBase):
+    """Gateway calls for prompts, shared by ``Prompts`` and
+    ``AsyncPrompts``.
     """
 
+    endpoint = 'prompts'
+
     def list(self, page: int = 1, size: int = 100) -> Dict[str, Any]:
         """Retrieve paginated list of prompts."""
         params = {'page': page, 'size': size}
-        response = self.request('GET', self.gateway_url, params=params)
-        return response
+        return self._call('GET', self.gateway_url, operation='list', cache=True, params=params)
 
     def get(self, prompt_id: str) -> Dict[str, Any]:
         """Retrieve a single prompt by ID."""
         url = f'{self.gateway_url}/{prompt_id}'
-        return self.request('GET', url)
+        return self._call('GET', url, cache=True)
 
     def create(self, payload: PromptData) -> Dict[str, Any]:
         """Create a new prompt."""
-        response = self.request('POST', self.gateway_url, json=payload)
-        return response
+        finish = functools.partial(self._written, (self.gateway_url,))
+        return self._call('POST', self.gateway_url, finish, operation='create', json=payload)
 
     def update(self, prompt_id: str, payload: PromptData) -> Dict[str, Any]:
         """Update an existing prompt."""
         url = f'{self.gateway_url}/{prompt_id}'
-        response = self.request('PATCH', url, json=payload)
-        return response
+        finish = functools.partial(self._written, (self.gateway_url, url))
+        return self._call('PATCH', url, finish, operation='update', json=payload)
 
     def delete(self, prompt_id: str) -> Dict[str, Any]:
         """Delete a prompt."""
         url = f'{self.gateway_url}/{prompt_id}'
-        response = self.request('DELETE', url)
-        return response
+        finish = functools.partial(self._written, (self.gateway_url, url), deleted_id=prompt_id)
+        return self._call('DELETE', url, finish)
 
     def apply(self, prompt_id: str, payload: InstructionData) -> Dict[str, Any]:
         """Apply a prompt and return AI-generated result."""
         url = f'{self.gateway_url}/{prompt_id}/apply'
-        response = self.request('POST', url, json=payload)
+        return self._call('POST', url, endpoint='apply', operation='apply', json=payload)
+
+    def get_mirror(self) -> Optional[PromptMirror]:
+        """Local mirror of the prompts, if enabled and synced at least once."""
+        if not get_settings().prompt_mirror_enabled:
+            return None
+        mirror = get_mirror(self.gateway_url, self._get_domain_id())
+        return mirror if mirror is not None and mirror.synced else None
+
+    def _written(
+            self,
+            urls: Tuple[str, ...],
+            response: Dict[str, Any],
+            deleted_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Write a successful create, update or delete through to the mirror
+        and evict the cached results of ``urls``. A failed write leaves the
+        caches of all processes as they are.
+        """
+        if 'error' in response:
+            return response
+        self._update_mirror(response, deleted_id)
+        self._invalidate_cache(*urls)
         return response
+
+    def _update_mirror(self, response: Dict[str, Any], deleted_id: Optional[str] = None) -> None:
+        """Write a create, update or delete through to the mirror."""
+        mirror = self.get_mirror()
+        if mirror is None:
+            return
+        if deleted_id:
+            mirror.remove(deleted_id)
+        else:
+            mirror.put(response)
+
+
+class Prompts(PromptsBase):
+    """Provides methods to create, read, update, delete, and apply prompts
+    for AI-assisted content generation and processing.
+    """
+
+    def iter_all(self, size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield all prompts, fetching them page by page.
+
+        While a page is consumed, the next one is already requested in the
+        background. Iteration stops after the last page as given by the
+        ``next`` or ``total`` of the gateway's response, or after a short
+        page. Raises ``PromptListError`` if a page cannot be fetched.
+        """
+        page = 1
+        response = self.list(page=page, size=size)
+        while True:
+            if 'error' in response:
+                raise PromptListError(response['error'])
+
+            prompts = response.get('prompts', [])
+            pending = self._list_later(page + 1, size) if self._has_next_page(response, page, size) else None
+            yield from prompts
+            if pending is None:
+                return
+            response = pending.result()
+            page += 1
+
+    def get_catalog(self, size: int = 100) -> PromptCatalog:
+        """Catalog of all prompts, kept in the prompt cache.
+
+        The catalog is rebuilt from the local mirror, if there is one, or
+        the prompt list once it expires or a prompt is created, updated or
+        deleted. Raises ``PromptListError`` if the list cannot be fetched.
+        """
+        cache = self._get_cache()
+        key = (self.gateway_url, 'catalog', self._get_domain_id())
+        entry = cache.get(key) if cache is not None else None
+        if entry is not None and entry.fresh:
+            return entry.data
+
+        mirror = self.get_mirror()
+        catalog = PromptCatalog(mirror.get_prompts() if mirror is not None else self.iter_all(size))
+        if cache is not None:
+            cache.set(key, catalog, catalog.size, {})
+        return catalog
+
+    def sync_mirror(self, size: int = 100) -> Dict[str, Any]:
+        """Bring the local mirror up to date with the gateway and return its
+        state with the number of added, updated, deleted and unchanged
+        prompts as ``changes``.
+
+        Raises ``PromptListError`` if the list cannot be fetched, the
+        mirror is left unchanged then.
+        """
+        # The sync must see the gateway's state, not cached pages
+        self._invalidate_cache(self.gateway_url, broadcast=False)
+        mirror = get_mirror(self.gateway_url, self._get_domain_id(), create=True)
+        counts = mirror.sync(self.iter_all(size))
+        if counts['added'] or counts['updated'] or counts['deleted']:
+            self._invalidate_cache(self.gateway_url)
+        return {**mirror.info(), 'changes': counts}
+
+    @staticmethod
+    def _has_next_page(response: Dict[str, Any], page: int, size: int) -> bool:
+        prompts = response.get('prompts') or []
+        if 'next' in response:
+            return bool(response['next']) and bool(prompts)
+        if response.get('total') is not None:
+            return page * size < response['total'] and bool(prompts)
+        return len(prompts) >= size
+
+    def _list_later(self, page: int, size: int) -> _PendingPage:
+        """Request a page of prompts in the shared executor.
+
+        Like ``AsyncAPIBase.request``, everything that needs the site is
+        resolved here in the calling thread. The span of the call is a child
+        of the current one and spans the request in the worker, the slow-call
+        log is written once the page is taken in the calling thread.
+        """
+        url = self.gateway_url
+        params = {'page': page, 'size': size}
+        span = self._start_span('GET', url, 'list')
+        send, timings = self._prepare_request(span, 'GET', url, operation='list', cache=True, params=params)
+
+        def send_in_span() -> Dict[str, Any]:
+            with span:
+                result = send()
+                self._end_span(span, result)
+            if timings is not None:
+                timings.stop()
+            return result
+
+        def finish(result: Dict[str, Any]) -> None:
+            if timings is not None:
+                self._log_slow_call(timings, 'GET', url, 'list', result, span)
+
+        return _PendingPage(executor.submit(send_in_span), finish)
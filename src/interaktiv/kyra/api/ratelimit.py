@@ -0,0 +1,97 @@
+"""Client-side rate limiting of gateway calls per tenant."""
+
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+RATE_LIMIT_BURST_DEFAULT = 10
+
+RateLimitKey = Tuple[str, str]
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` calls per second on average and bursts
+    of up to ``burst`` calls.
+
+    A caller that finds the bucket empty reserves the next token and sleeps
+    until it is due, if that is within its timeout. Reservations are served
+    in order, so waiting callers cannot be overtaken.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int = RATE_LIMIT_BURST_DEFAULT) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waited = 0
+        self._rejected = 0
+
+    def acquire(self, timeout: float = 0) -> bool:
+        """Take a token, waiting at most ``timeout`` seconds for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+
+            delay = (1 - self._tokens) / self.rate
+            if delay > timeout:
+                self._rejected += 1
+                return False
+
+            self._tokens -= 1
+            self._waited += 1
+
+        time.sleep(delay)
+        return True
+
+    def configure(self, rate: float, burst: int) -> None:
+        with self._lock:
+            self.rate = rate
+            self.burst = burst
+            self._tokens = min(self._tokens, burst)
+
+    def info(self) -> Dict[str, Any]:
+        """State of the bucket for operators."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'rate': self.rate,
+                'burst': self.burst,
+                'waited': self._waited,
+                'rejected': self._rejected,
+            }
+
+
+class RateLimiters:
+    """Process-wide token buckets per domain id and operation class."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[RateLimitKey, TokenBucket] = {}
+
+    def get(self, key: RateLimitKey, rate: float, burst: int = RATE_LIMIT_BURST_DEFAULT) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(' '.join(key), rate, burst)
+            elif (bucket.rate, bucket.burst) != (rate, burst):
+                bucket.configure(rate, burst)
+            return bucket
+
+    def info(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return [bucket.info() for bucket in buckets]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+rate_limiters = RateLimiters()
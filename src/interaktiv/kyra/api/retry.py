@@ -0,0 +1,108 @@
+"""Retry policy for Kyra gateway calls."""
+
+import dataclasses
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+
+
+def is_connect_error(error: Exception) -> bool:
+    """Whether the request failed before it reached the server, which makes
+    it safe to repeat for any method.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def get_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Return the ``Retry-After`` header of ``response`` in seconds."""
+    if response is None:
+        return None
+
+    value = (response.headers or {}).get('Retry-After')
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    """Decides whether and when a failed gateway call is repeated.
+
+    Idempotent methods are retried on connection errors, timeouts and
+    ``RETRY_STATUS_CODES``. Other methods, like ``POST`` for apply, are only
+    retried when the connection could not be established. Delays grow
+    exponentially with full jitter up to ``backoff_max``, a ``Retry-After``
+    header takes precedence. No retry is scheduled that would end after
+    the ``deadline`` of the whole call.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 5.0
+    deadline: float = 60.0
+
+    def get_delay(
+            self,
+            method: str,
+            attempt: int,
+            started: float,
+            response: Optional[requests.Response] = None,
+            error: Optional[Exception] = None
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt, ``None`` to give up."""
+        if attempt >= self.max_attempts:
+            return None
+        if not self.is_retryable(method, response, error):
+            return None
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        retry_after = get_retry_after(response)
+        if retry_after is not None:
+            delay = retry_after
+
+        if self.get_remaining(started) <= delay:
+            return None
+        return delay
+
+    def get_remaining(self, started: float) -> float:
+        """Seconds left of the deadline of a call started at ``started``."""
+        return started + self.deadline - time.monotonic()
+
+    @staticmethod
+    def is_retryable(
+            method: str,
+            response: Optional[requests.Response] = None,
+            error: Optional[Exception] = None
+    ) -> bool:
+        if error is not None and is_connect_error(error):
+            return True
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,88 @@
+"""Process-wide pooled HTTP sessions for Kyra API calls."""
+
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional, Tuple
+
+import requests
+from interaktiv.kyra.api.timing import TimedHTTPAdapter
+from requests.adapters import BaseAdapter
+
+HTTP_POOL_CONNECTIONS_DEFAULT = 10
+HTTP_POOL_MAXSIZE_DEFAULT = 10
+HTTP_POOL_IDLE_TIMEOUT_DEFAULT = 60
+
+
+class SessionPool:
+    """Shares one keep-alive ``requests.Session`` between all Zope worker
+    threads, so connections to the gateway and Keycloak are reused instead
+    of doing a TCP and TLS handshake for every call.
+
+    The underlying urllib3 connection pools are thread-safe. The session is
+    rebuilt when the pool settings change or when it was idle for longer
+    than the configured idle timeout, because the remote side will have
+    dropped the kept-alive connections by then anyway. Cookies are never
+    stored, so a ``Set-Cookie`` of one site's or user's call is not sent
+    with the calls of others.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._config: Optional[Tuple[int, int]] = None
+        self._last_used = 0.0
+        self._transport: Optional[BaseAdapter] = None
+
+    def get(
+            self,
+            pool_connections: int = HTTP_POOL_CONNECTIONS_DEFAULT,
+            pool_maxsize: int = HTTP_POOL_MAXSIZE_DEFAULT,
+            idle_timeout: int = HTTP_POOL_IDLE_TIMEOUT_DEFAULT
+    ) -> requests.Session:
+        """Return the shared session for the given pool settings."""
+        config = (pool_connections, pool_maxsize)
+        now = time.monotonic()
+
+        with self._lock:
+            idle_expired = bool(idle_timeout) and now - self._last_used > idle_timeout
+            if self._session is None or self._config != config or idle_expired:
+                self._close_session()
+                self._session = self._create_session(pool_connections, pool_maxsize)
+                self._config = config
+
+            self._last_used = now
+            return self._session
+
+    def set_transport(self, transport: Optional[BaseAdapter]) -> None:
+        """Send all calls through ``transport`` instead of the pooled HTTP
+        connections, e.g. to replay a cassette. ``None`` restores them.
+        """
+        with self._lock:
+            self._close_session()
+            self._transport = transport
+
+    def close(self) -> None:
+        """Close the shared session and drop all pooled connections."""
+        with self._lock:
+            self._close_session()
+
+    def _close_session(self) -> None:
+        if self._session is not None:
+            self._session.close()
+        self._session = None
+        self._config = None
+
+    def _create_session(self, pool_connections: int, pool_maxsize: int) -> requests.Session:
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = self._transport or TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+
+session_pool = SessionPool()
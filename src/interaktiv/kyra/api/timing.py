@@ -0,0 +1,127 @@
+"""Per-phase timing of gateway calls for the slow-call log."""
+
+import contextlib
+import datetime
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+PHASES = ('settings', 'token', 'connect', 'ttfb', 'download', 'decode')
+
+_current_timings: ContextVar[Optional['CallTimings']] = ContextVar('interaktiv.kyra timings', default=None)
+
+
+class CallTimings:
+    """Seconds spent in each phase of one gateway call.
+
+    ``connect`` is only measured for new connections, a call over a kept
+    alive connection has none. ``ttfb`` is the time from sending the
+    request until the response headers arrived, ``download`` the time to
+    read the body after that.
+    """
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        self.started = started if started is not None else time.monotonic()
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.payload_size = 0
+        self.response_size = 0
+        self.stopped: Optional[float] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += max(0.0, seconds)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(phase, time.monotonic() - started)
+
+    @contextlib.contextmanager
+    def exchange(self):
+        """Measure one HTTP exchange, splitting it into connect, time to
+        first byte and download.
+        """
+        started = time.monotonic()
+        connect_before = self.phases['connect']
+        token = _current_timings.set(self)
+        outcome = {}
+        try:
+            yield outcome
+        finally:
+            _current_timings.reset(token)
+            total = time.monotonic() - started
+            connect = self.phases['connect'] - connect_before
+            elapsed = getattr(outcome.get('response'), 'elapsed', None)
+            elapsed = elapsed.total_seconds() if isinstance(elapsed, datetime.timedelta) else total
+            self.add('ttfb', elapsed - connect)
+            self.add('download', total - elapsed)
+
+    def stop(self) -> None:
+        """End the call, for a call that is logged after it finished."""
+        self.stopped = time.monotonic()
+
+    def get_duration(self) -> float:
+        return (self.stopped if self.stopped is not None else time.monotonic()) - self.started
+
+
+def measure(timings: Optional[CallTimings], phase: str):
+    """``timings.measure(phase)``, or a no-op without timings."""
+    if timings is None:
+        return contextlib.nullcontext()
+    return timings.measure(phase)
+
+
+def _record_connect(started: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add('connect', time.monotonic() - started)
+
+
+class TimedHTTPConnection(HTTPConnection):
+
+    def connect(self) -> None:
+        started = time.monotonic()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+
+    def connect(self) -> None:
+        started = time.monotonic()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose connections report their connect time to the
+    timings of the current call.
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
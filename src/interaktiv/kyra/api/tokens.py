@@ -0,0 +1,235 @@
+"""Process-wide in-memory cache for Keycloak access tokens."""
+
+import base64
+import json
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from interaktiv.kyra import logger
+
+TOKEN_REFRESH_MARGIN_DEFAULT = 60
+TOKEN_FETCH_WAIT_TIMEOUT = 30
+TOKEN_RENEWAL_RETRY_DELAY = 10
+
+TokenKey = Tuple[str, str]
+TokenFetch = Callable[[], Tuple[str, float]]
+
+
+class TokenEntry(NamedTuple):
+    token: str
+    fetched_at: float
+    refresh_at: float
+    expires_at: float
+
+
+class _Flight:
+    """A token fetch in progress that other threads can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.token = ''
+
+
+def get_jwt_expiration(token: str) -> Optional[float]:
+    """Return the ``exp`` claim of a JWT access token, if there is one.
+
+    The signature is not verified, the claim is only used to schedule the
+    token renewal.
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenStore:
+    """Thread-safe token cache keyed by realm URL and client id.
+
+    A token is handed out until ``refresh_at``, which lies the refresh
+    margin before its expiry. A background thread renews tokens at that
+    point, so user requests normally never wait for Keycloak. If a request
+    still finds a token due for refresh, exactly one thread fetches a new
+    token while the other threads keep using the old one as long as it has
+    not expired, or wait for the fetch to finish. If the fetch fails, the
+    old token is used until it expires. Tokens that were not used
+    since their last fetch are not renewed in the background. Nothing is
+    persisted, so reading a token never writes to the ZODB.
+    """
+
+    def __init__(self, background_renewal: bool = True) -> None:
+        self.background_renewal = background_renewal
+        self._lock = threading.Condition()
+        self._entries: Dict[TokenKey, TokenEntry] = {}
+        self._flights: Dict[TokenKey, _Flight] = {}
+        self._fetchers: Dict[TokenKey, Tuple[TokenFetch, float]] = {}
+        self._last_used: Dict[TokenKey, float] = {}
+        self._retry_at: Dict[TokenKey, float] = {}
+        self._renewer: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def get(
+            self,
+            key: TokenKey,
+            fetch: TokenFetch,
+            refresh_margin: float = TOKEN_REFRESH_MARGIN_DEFAULT
+    ) -> str:
+        """Return a valid token for ``key``, calling ``fetch`` if needed.
+
+        ``fetch`` returns the new token and its lifetime in seconds. It is
+        also used by the background renewer and therefore must not depend
+        on the current request or site.
+        """
+        now = time.time()
+
+        with self._lock:
+            self._fetchers[key] = (fetch, refresh_margin)
+            self._last_used[key] = now
+            self._ensure_renewer()
+
+            entry = self._entries.get(key)
+            if entry and now < entry.refresh_at:
+                return entry.token
+
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+
+        if not is_leader:
+            if entry and now < entry.expires_at:
+                return entry.token
+            flight.done.wait(TOKEN_FETCH_WAIT_TIMEOUT)
+            return flight.token
+
+        return self._fetch(key, fetch, refresh_margin, flight)
+
+    def set(
+            self,
+            key: TokenKey,
+            token: str,
+            lifetime: float,
+            refresh_margin: float = TOKEN_REFRESH_MARGIN_DEFAULT
+    ) -> None:
+        """Store ``token`` for ``key`` with a lifetime in seconds."""
+        now = time.time()
+        margin = min(refresh_margin, lifetime / 2)
+        with self._lock:
+            self._entries[key] = TokenEntry(
+                token=token,
+                fetched_at=now,
+                refresh_at=now + lifetime - margin,
+                expires_at=now + lifetime
+            )
+            self._retry_at.pop(key, None)
+            self._lock.notify_all()
+
+    def peek(self, key: TokenKey) -> Optional[TokenEntry]:
+        """Return the cached entry for ``key`` without refreshing it."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def invalidate(self, key: TokenKey) -> None:
+        """Drop the cached token for ``key``."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached tokens and stop renewing them."""
+        with self._lock:
+            self._entries.clear()
+            self._fetchers.clear()
+            self._last_used.clear()
+            self._retry_at.clear()
+
+    def stop(self) -> None:
+        """Stop the background renewer thread."""
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        if self._renewer is not None:
+            self._renewer.join()
+        self._renewer = None
+        self._stopped = False
+
+    def _fetch(self, key: TokenKey, fetch: TokenFetch, refresh_margin: float, flight: _Flight) -> str:
+        try:
+            token, lifetime = fetch()
+            if token:
+                self.set(key, token, lifetime, refresh_margin)
+            else:
+                # Keep using the old token while Keycloak is unavailable
+                entry = self.peek(key)
+                if entry and time.time() < entry.expires_at:
+                    token = entry.token
+            flight.token = token
+            return token
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _ensure_renewer(self) -> None:
+        if not self.background_renewal:
+            return
+        if self._renewer is not None and self._renewer.is_alive():
+            return
+        self._renewer = threading.Thread(
+            target=self._run_renewer,
+            name='interaktiv.kyra token renewer',
+            daemon=True
+        )
+        self._renewer.start()
+
+    def _next_renewal(self) -> Tuple[Optional[TokenKey], float]:
+        next_key, next_due = None, 0.0
+        for key in list(self._fetchers):
+            entry = self._entries.get(key)
+            if entry is None or self._last_used.get(key, 0) < entry.fetched_at:
+                # Unused since the last fetch, the next request fetches inline
+                del self._fetchers[key]
+                continue
+
+            due = max(entry.refresh_at, self._retry_at.get(key, 0))
+            if due >= entry.expires_at:
+                del self._fetchers[key]
+                continue
+
+            if next_key is None or due < next_due:
+                next_key, next_due = key, due
+        return next_key, next_due
+
+    def _run_renewer(self) -> None:
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+
+                key, due = self._next_renewal()
+                if key is None:
+                    self._lock.wait()
+                    continue
+
+                delay = due - time.time()
+                if delay > 0:
+                    self._lock.wait(delay)
+                    continue
+
+                if key in self._flights:
+                    self._retry_at[key] = time.time() + TOKEN_RENEWAL_RETRY_DELAY
+                    continue
+
+                fetch, refresh_margin = self._fetchers[key]
+                flight = self._flights[key] = _Flight()
+                self._retry_at[key] = time.time() + TOKEN_RENEWAL_RETRY_DELAY
+
+            try:
+                self._fetch(key, fetch, refresh_margin, flight)
+            except Exception as e:
+                logger.error(f'Keycloak token renewal failed: {e}')
+
+
+token_store = TokenStore()
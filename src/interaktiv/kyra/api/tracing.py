@@ -0,0 +1,208 @@
+"""Optional tracing of Kyra calls with W3C trace context propagation.
+
+Spans follow the OpenTelemetry data model and are written as JSON lines
+to a local file, one span per line, with OTLP field names. While no file
+is configured, ``start_span`` only returns a shared no-op span.
+
+The file is part of the server configuration, not of the site settings,
+so only the operator of the instance can choose where spans are written.
+It is taken from the ``KYRA_TRACING_FILE`` environment variable or the
+``tracing-file`` key of the ``interaktiv.kyra`` product config in
+``zope.conf``::
+
+    <product-config interaktiv.kyra>
+        tracing-file /var/log/plone/kyra-spans.jsonl
+    </product-config>
+"""
+
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from App.config import getConfiguration
+from interaktiv.kyra import logger
+
+TRACING_FILE_ENVIRONMENT_VARIABLE = 'KYRA_TRACING_FILE'
+PRODUCT_CONFIG_NAME = 'interaktiv.kyra'
+
+TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+SPAN_KIND_INTERNAL = 'SPAN_KIND_INTERNAL'
+SPAN_KIND_SERVER = 'SPAN_KIND_SERVER'
+SPAN_KIND_CLIENT = 'SPAN_KIND_CLIENT'
+
+STATUS_UNSET = 'STATUS_CODE_UNSET'
+STATUS_ERROR = 'STATUS_CODE_ERROR'
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('interaktiv.kyra span', default=None)
+
+
+def get_tracing_file() -> str:
+    """Path of the span file from the environment or ``zope.conf``, or an
+    empty string if tracing is off.
+    """
+    path = os.environ.get(TRACING_FILE_ENVIRONMENT_VARIABLE)
+    if path is None:
+        product_config = getattr(getConfiguration(), 'product_config', None) or {}
+        path = (product_config.get(PRODUCT_CONFIG_NAME) or {}).get('tracing-file')
+    return (path or '').strip()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Return trace id and parent span id of a W3C ``traceparent`` header."""
+    match = TRACEPARENT_PATTERN.match((value or '').strip().lower())
+    if match is None or set(match.group(1)) == {'0'} or set(match.group(2)) == {'0'}:
+        return None
+    return match.group(1), match.group(2)
+
+
+def get_traceparent() -> Optional[str]:
+    """W3C ``traceparent`` header of the current span, if tracing is on."""
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+class Span:
+    """A timed operation, recorded when the ``with`` block ends."""
+
+    def __init__(
+            self,
+            exporter: 'FileSpanExporter',
+            name: str,
+            kind: str = SPAN_KIND_INTERNAL,
+            attributes: Optional[Dict[str, Any]] = None,
+            traceparent: Optional[str] = None
+    ) -> None:
+        self.exporter = exporter
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status = STATUS_UNSET
+        self.status_message = ''
+
+        parent = _current_span.get()
+        remote = parse_traceparent(traceparent) if parent is None else None
+        if parent is not None:
+            self.trace_id, self.parent_span_id = parent.trace_id, parent.span_id
+        elif remote is not None:
+            self.trace_id, self.parent_span_id = remote
+        else:
+            self.trace_id, self.parent_span_id = secrets.token_hex(16), ''
+        self.span_id = secrets.token_hex(8)
+        self.start = self.end = 0
+
+    @property
+    def traceparent(self) -> str:
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def __enter__(self) -> 'Span':
+        self.start = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.time_ns()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.set_error(f'{exc_type.__name__}: {exc}')
+        self.exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': self.start,
+            'endTimeUnixNano': self.end,
+            'attributes': self.attributes,
+            'status': {'code': self.status, 'message': self.status_message},
+        }
+
+
+class _NoopSpan:
+    """Stand-in for ``Span`` while tracing is disabled."""
+
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class FileSpanExporter:
+    """Appends finished spans as JSON lines to ``path``."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + '\n'
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            logger.error(f'Writing span to {self.path} failed: {e}')
+
+
+class Tracer:
+    """Creates spans while an exporter is configured."""
+
+    def __init__(self) -> None:
+        self.exporter: Optional[FileSpanExporter] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(self, path: Optional[str]) -> None:
+        """Export spans to ``path``, or disable tracing if it is empty."""
+        if not path:
+            self.exporter = None
+        elif self.exporter is None or self.exporter.path != path:
+            self.exporter = FileSpanExporter(path)
+
+    def start_span(
+            self,
+            name: str,
+            kind: str = SPAN_KIND_INTERNAL,
+            attributes: Optional[Dict[str, Any]] = None,
+            traceparent: Optional[str] = None
+    ):
+        """Return a span to be used as context manager.
+
+        ``traceparent`` continues a trace started by the caller, unless a
+        span is already active in this context.
+        """
+        exporter = self.exporter
+        if exporter is None:
+            return NOOP_SPAN
+        return Span(exporter, name, kind, attributes, traceparent)
+
+
+tracer = Tracer()
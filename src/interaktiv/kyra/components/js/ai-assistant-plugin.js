@@ -62,7 +62,7 @@
     const apiService = {
       async fetchPrompts() {
         try {
-          const response = await fetch(`${getApiBaseUrl()}/prompts?page=1&size=100`, { method: 'GET', headers: getHeaders() });
+          const response = await fetch(`${getApiBaseUrl()}/prompts`, { method: 'GET', headers: getHeaders() });
           if (!response.ok) throw new Error(`HTTP ${response.status}: ${response.statusText}`);
           const data = await response.json();
           return data.prompts || [];
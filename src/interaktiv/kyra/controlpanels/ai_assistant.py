@@ -1,13 +1,41 @@
 from interaktiv.kyra import _
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.cache import broadcast_invalidation
+from interaktiv.kyra.api.cache import prompt_cache
+from interaktiv.kyra.api.prompts import PromptListError
 from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
 
 from plone.app.registry.browser import controlpanel
+from Products.statusmessages.interfaces import IStatusMessage
+from z3c.form import button
 
 
 class AIAssistantSettingsControlPanelForm(controlpanel.RegistryEditForm):
     schema = IAIAssistantSchema
     label = _('trans_label_controlpanel_ai_assistant_settings')
 
+    buttons = controlpanel.RegistryEditForm.buttons.copy()
+    handlers = controlpanel.RegistryEditForm.handlers.copy()
+
+    @button.buttonAndHandler(_('trans_button_flush_prompt_cache'), name='flush_cache')
+    def handle_flush_cache(self, action):
+        # The other ZEO clients drop their entries at their next transaction
+        prompt_cache.clear()
+        broadcast_invalidation()
+        IStatusMessage(self.request).addStatusMessage(_('trans_status_prompt_cache_flushed'), 'info')
+        self.request.response.redirect(self.request.getURL())
+
+    @button.buttonAndHandler(_('trans_button_sync_prompt_mirror'), name='sync_mirror')
+    def handle_sync_mirror(self, action):
+        status = IStatusMessage(self.request)
+        try:
+            KyraAPI().prompts.sync_mirror()
+        except PromptListError as e:
+            status.addStatusMessage(str(e), 'error')
+        else:
+            status.addStatusMessage(_('trans_status_prompt_mirror_synced'), 'info')
+        self.request.response.redirect(self.request.getURL())
+
 
 class AIAssistantSettingsControlPanel(controlpanel.ControlPanelFormWrapper):
     form = AIAssistantSettingsControlPanelForm
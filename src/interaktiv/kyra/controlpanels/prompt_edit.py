@@ -29,6 +29,11 @@ class PromptEditView(PromptManagerBaseView):
             self._add_message(f"{_('trans_status_no_prompt_id')}", 'error')
             return {}
 
+        mirror = self.kyra.prompts.get_mirror()
+        prompt = mirror.get(self.prompt_id) if mirror is not None else None
+        if prompt is not None:
+            return prompt
+
         response = self.kyra.prompts.get(self.prompt_id)
         if 'error' in response:
             self._add_message(response['error'], 'error')
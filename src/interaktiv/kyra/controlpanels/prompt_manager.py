@@ -2,6 +2,7 @@ from typing import Any, Dict, List
 
 from Products.Five.browser.pagetemplatefile import ViewPageTemplateFile
 from interaktiv.kyra import _
+from interaktiv.kyra.api.prompts import PromptListError
 from interaktiv.kyra.controlpanels.prompt_base import PromptManagerBaseView
 
 
@@ -21,15 +22,21 @@ class PromptManagerView(PromptManagerBaseView):
         return self.template()
 
     def get_prompts(self) -> List[Dict[str, Any]]:
-        response = self.kyra.prompts.list(page=1, size=100)
-        if 'error' in response:
-            self._add_message(response['error'], 'error')
-            return []
+        mirror = self.kyra.prompts.get_mirror()
+        if mirror is not None:
+            prompts = mirror.get_prompts()
+        else:
+            prompts = []
+            try:
+                prompts.extend(self.kyra.prompts.iter_all())
+            except PromptListError as e:
+                self._add_message(str(e), 'error')
+                if not prompts:
+                    return []
 
         # Add translated action labels to metadata
         replace_str = _('trans_option_action_replace')
         append_str = _('trans_option_action_append')
-        prompts = response.get('prompts', [])
         for prompt in prompts:
             metadata = prompt.get('metadata', {})
             if not metadata:
@@ -43,7 +50,7 @@ class PromptManagerView(PromptManagerBaseView):
             else:
                 metadata['action_translation'] = action
 
-        return response.get('prompts', [])
+        return prompts
 
     def _create_prompt(self) -> None:
         name = self.request.form.get('name', '').strip()
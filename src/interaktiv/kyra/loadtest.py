@@ -0,0 +1,248 @@
+"""Load test of the prompt services with concurrent editors.
+
+Every simulated editor follows the request pattern of the TinyMCE plugin:
+it loads ``@@ai-assistant-translations``, lists the prompts with
+``GET prompts`` and then applies random prompts with
+``POST prompts/{id}/apply`` until the test ends, pausing for a think time
+in between. Like the plugin, it calls the services on a content object::
+
+    kyra-load-test http://localhost:8080/Plone/front-page --user admin --password admin \\
+        --editors 20 --duration 60 --think-time uniform:1,3 --zope-threads 4
+
+The report shows throughput, latency percentiles and error rates per
+request type. Zope thread saturation is estimated with Little's law from
+throughput and mean latency: more concurrently served requests than
+worker threads means requests were queueing in front of Zope.
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from interaktiv.kyra.stubserver import parse_distribution
+
+STEPS = ('translations', 'list', 'apply')
+PERCENTILES = (50, 90, 95, 99)
+
+# Name of the prompt services as used by the TinyMCE plugin
+SERVICE_NAME = 'prompts'
+
+
+@dataclasses.dataclass
+class LoadConfig:
+    """Parameters of a load test run."""
+    url: str
+    user: str = 'admin'
+    password: str = 'admin'
+    editors: int = 10
+    duration: float = 60.0
+    ramp_up: float = 0.0
+    think_time: str = 'uniform:1,3'
+    text_size: int = 500
+    zope_threads: int = 4
+    timeout: float = 180.0
+    seed: Optional[int] = None
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return 0.0
+    rank = max(1, min(len(values), math.ceil(percent / 100 * len(values))))
+    return values[rank - 1]
+
+
+class LoadStats:
+    """Thread-safe latencies and outcomes per request type."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {step: [] for step in STEPS}
+        self.errors: Dict[str, Dict[str, int]] = {step: {} for step in STEPS}
+        self.started = self.ended = 0.0
+
+    def record(self, step: str, latency: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.latencies[step].append(latency)
+            if error is not None:
+                self.errors[step][error] = self.errors[step].get(error, 0) + 1
+
+    def summarize(self, zope_threads: int) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(self.ended - self.started, 1e-9)
+            steps = {}
+            busy = 0.0
+            for step in STEPS:
+                latencies = sorted(self.latencies[step])
+                count = len(latencies)
+                errors = sum(self.errors[step].values())
+                busy += sum(latencies) / elapsed
+                steps[step] = {
+                    'requests': count,
+                    'throughput': count / elapsed,
+                    'error_rate': errors / count if count else 0.0,
+                    'errors': dict(self.errors[step]),
+                    'latency': {
+                        'mean': sum(latencies) / count if count else 0.0,
+                        **{f'p{p}': percentile(latencies, p) for p in PERCENTILES},
+                        'max': latencies[-1] if latencies else 0.0,
+                    },
+                }
+            total = sum(step['requests'] for step in steps.values())
+            return {
+                'duration': elapsed,
+                'requests': total,
+                'throughput': total / elapsed,
+                'steps': steps,
+                # Little's law: requests in service = arrival rate x time in system
+                'concurrent_requests': busy,
+                'zope_threads': zope_threads,
+                'thread_saturation': busy / zope_threads if zope_threads else 0.0,
+            }
+
+
+class Editor(threading.Thread):
+    """One simulated editor using the TinyMCE plugin."""
+
+    def __init__(self, config: LoadConfig, stats: LoadStats, stop: threading.Event, seed: Optional[int]) -> None:
+        super().__init__(daemon=True)
+        self.config = config
+        self.stats = stats
+        self.stop = stop
+        self.random = random.Random(seed)
+        self.think_time = parse_distribution(config.think_time)
+        self.session = requests.Session()
+        self.session.auth = (config.user, config.password)
+        self.session.headers.update({'Accept': 'application/json', 'Content-Type': 'application/json'})
+
+    def run(self) -> None:
+        url = self.config.url.rstrip('/')
+        try:
+            self._call('translations', 'GET', f'{url}/@@ai-assistant-translations')
+            prompts = self._call('list', 'GET', f'{url}/{SERVICE_NAME}')
+            prompt_ids = [prompt['id'] for prompt in (prompts or {}).get('prompts', []) if prompt.get('id')]
+            if not prompt_ids:
+                return
+
+            while not self.stop.is_set():
+                body = {
+                    'text': 'x' * self.config.text_size,
+                    'query': 'Apply prompt to selected text',
+                    'include_context': True,
+                }
+                prompt_id = self.random.choice(prompt_ids)
+                self._call('apply', 'POST', f'{url}/{SERVICE_NAME}/{prompt_id}/apply', json=body)
+                self.stop.wait(self.think_time(self.random))
+        finally:
+            self.session.close()
+
+    def _call(self, step: str, method: str, url: str, **kwargs) -> Optional[Dict[str, Any]]:
+        started = time.monotonic()
+        data, error = None, None
+        try:
+            response = self.session.request(method, url, timeout=self.config.timeout, **kwargs)
+            if response.status_code >= 400:
+                error = f'HTTP {response.status_code}'
+            else:
+                data = response.json()
+                if isinstance(data, dict) and 'error' in data:
+                    error = 'busy' if data.get('busy') else 'gateway error'
+        except requests.Timeout:
+            error = 'timeout'
+        except requests.RequestException:
+            error = 'connection error'
+        except ValueError:
+            error = 'invalid JSON'
+        self.stats.record(step, time.monotonic() - started, error)
+        return data
+
+
+def run(config: LoadConfig) -> Dict[str, Any]:
+    """Run the load test and return its summary."""
+    stats = LoadStats()
+    stop = threading.Event()
+    seeds = random.Random(config.seed)
+    editors = [
+        Editor(config, stats, stop, seeds.randrange(2 ** 32) if config.seed is not None else None)
+        for _ in range(config.editors)
+    ]
+
+    stats.started = time.monotonic()
+    ends = stats.started + config.duration
+    for number, editor in enumerate(editors):
+        editor.start()
+        if config.ramp_up and number < len(editors) - 1:
+            stop.wait(config.ramp_up / len(editors))
+    stop.wait(max(0.0, ends - time.monotonic()))
+    stop.set()
+    for editor in editors:
+        editor.join(config.timeout)
+    stats.ended = time.monotonic()
+    return stats.summarize(config.zope_threads)
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    lines = [
+        f'{summary["requests"]} requests in {summary["duration"]:.1f}s, '
+        f'{summary["throughput"]:.2f} requests/s',
+        '',
+        f'{"request":<14}{"count":>8}{"req/s":>9}{"errors":>9}{"mean":>9}'
+        + ''.join(f'{f"p{p}":>9}' for p in PERCENTILES) + f'{"max":>9}',
+    ]
+    for step, data in summary['steps'].items():
+        latency = data['latency']
+        lines.append(
+            f'{step:<14}{data["requests"]:>8}{data["throughput"]:>9.2f}{data["error_rate"]:>9.1%}'
+            f'{latency["mean"]:>9.3f}' + ''.join(f'{latency[f"p{p}"]:>9.3f}' for p in PERCENTILES)
+            + f'{latency["max"]:>9.3f}'
+        )
+    lines.append('')
+    for step, data in summary['steps'].items():
+        for error, count in sorted(data['errors'].items()):
+            lines.append(f'{step} errors: {error}: {count}')
+    lines.append(
+        f'Concurrently served requests: {summary["concurrent_requests"]:.2f} '
+        f'for {summary["zope_threads"]} Zope threads ({summary["thread_saturation"]:.0%} saturation)'
+    )
+    if summary['thread_saturation'] > 1:
+        lines.append('Requests were queueing for Zope threads, add threads or instances.')
+    return '\n'.join(lines)
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Load test the prompt services with concurrent editors.')
+    parser.add_argument('url', help='URL of a content object in the Plone site, e.g. its front page')
+    parser.add_argument('--user', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--editors', type=int, default=10, help='number of concurrent editors')
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='seconds over which the editors start')
+    parser.add_argument('--think-time', default='uniform:1,3',
+                        help='pause between apply calls, e.g. fixed:2 or uniform:1,3 (seconds)')
+    parser.add_argument('--text-size', type=int, default=500, help='size of the selected text in bytes')
+    parser.add_argument('--zope-threads', type=int, default=4, help='worker threads of the tested instance')
+    parser.add_argument('--timeout', type=float, default=180.0, help='request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for reproducible runs')
+    parser.add_argument('--json', dest='json_path', help='also write the summary to this JSON file')
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Console script ``kyra-load-test``."""
+    options = vars(parse_args(args))
+    json_path = options.pop('json_path')
+    summary = run(LoadConfig(**options))
+    print(format_report(summary))
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
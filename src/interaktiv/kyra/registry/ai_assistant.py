@@ -35,9 +35,261 @@ class IAIAssistantSchema(Interface):
         default=1200
     )
 
+    keycloak_token_refresh_margin = schema.Int(
+        title=_('trans_label_keycloak_token_refresh_margin'),
+        description=_('trans_help_keycloak_token_refresh_margin'),
+        required=True,
+        default=60
+    )
+
     domain_id = schema.TextLine(
         title=_('trans_label_domain_id'),
         description=_('trans_help_domain_id'),
         default='plone',
         required=True
     )
+
+    http_pool_connections = schema.Int(
+        title=_('trans_label_http_pool_connections'),
+        description=_('trans_help_http_pool_connections'),
+        required=True,
+        default=10
+    )
+
+    http_pool_maxsize = schema.Int(
+        title=_('trans_label_http_pool_maxsize'),
+        description=_('trans_help_http_pool_maxsize'),
+        required=True,
+        default=10
+    )
+
+    http_pool_idle_timeout = schema.Int(
+        title=_('trans_label_http_pool_idle_timeout'),
+        description=_('trans_help_http_pool_idle_timeout'),
+        required=True,
+        default=60
+    )
+
+    retry_max_attempts = schema.Int(
+        title=_('trans_label_retry_max_attempts'),
+        description=_('trans_help_retry_max_attempts'),
+        required=True,
+        default=3
+    )
+
+    retry_backoff_base = schema.Float(
+        title=_('trans_label_retry_backoff_base'),
+        description=_('trans_help_retry_backoff_base'),
+        required=True,
+        default=0.5
+    )
+
+    retry_backoff_max = schema.Float(
+        title=_('trans_label_retry_backoff_max'),
+        description=_('trans_help_retry_backoff_max'),
+        required=True,
+        default=5.0
+    )
+
+    retry_deadline = schema.Int(
+        title=_('trans_label_retry_deadline'),
+        description=_('trans_help_retry_deadline'),
+        required=True,
+        default=60
+    )
+
+    breaker_failure_threshold = schema.Int(
+        title=_('trans_label_breaker_failure_threshold'),
+        description=_('trans_help_breaker_failure_threshold'),
+        required=True,
+        default=5
+    )
+
+    breaker_reset_timeout = schema.Int(
+        title=_('trans_label_breaker_reset_timeout'),
+        description=_('trans_help_breaker_reset_timeout'),
+        required=True,
+        default=30
+    )
+
+    timeout_list_connect = schema.Float(
+        title=_('trans_label_timeout_list_connect'),
+        description=_('trans_help_timeout_connect'),
+        required=True,
+        default=3.05
+    )
+
+    timeout_list_read = schema.Float(
+        title=_('trans_label_timeout_list_read'),
+        description=_('trans_help_timeout_read'),
+        required=True,
+        default=10.0
+    )
+
+    timeout_get_connect = schema.Float(
+        title=_('trans_label_timeout_get_connect'),
+        description=_('trans_help_timeout_connect'),
+        required=True,
+        default=3.05
+    )
+
+    timeout_get_read = schema.Float(
+        title=_('trans_label_timeout_get_read'),
+        description=_('trans_help_timeout_read'),
+        required=True,
+        default=10.0
+    )
+
+    timeout_apply_connect = schema.Float(
+        title=_('trans_label_timeout_apply_connect'),
+        description=_('trans_help_timeout_connect'),
+        required=True,
+        default=3.05
+    )
+
+    timeout_apply_read = schema.Float(
+        title=_('trans_label_timeout_apply_read'),
+        description=_('trans_help_timeout_read'),
+        required=True,
+        default=120.0
+    )
+
+    timeout_upload_connect = schema.Float(
+        title=_('trans_label_timeout_upload_connect'),
+        description=_('trans_help_timeout_connect'),
+        required=True,
+        default=3.05
+    )
+
+    timeout_upload_read = schema.Float(
+        title=_('trans_label_timeout_upload_read'),
+        description=_('trans_help_timeout_read'),
+        required=True,
+        default=60.0
+    )
+
+    timeout_download_connect = schema.Float(
+        title=_('trans_label_timeout_download_connect'),
+        description=_('trans_help_timeout_connect'),
+        required=True,
+        default=3.05
+    )
+
+    timeout_download_read = schema.Float(
+        title=_('trans_label_timeout_download_read'),
+        description=_('trans_help_timeout_read'),
+        required=True,
+        default=60.0
+    )
+
+    timeout_token_connect = schema.Float(
+        title=_('trans_label_timeout_token_connect'),
+        description=_('trans_help_timeout_connect'),
+        required=True,
+        default=3.05
+    )
+
+    timeout_token_read = schema.Float(
+        title=_('trans_label_timeout_token_read'),
+        description=_('trans_help_timeout_read'),
+        required=True,
+        default=10.0
+    )
+
+    request_budget = schema.Int(
+        title=_('trans_label_request_budget'),
+        description=_('trans_help_request_budget'),
+        required=True,
+        default=0
+    )
+
+    compression_min_size = schema.Int(
+        title=_('trans_label_compression_min_size'),
+        description=_('trans_help_compression_min_size'),
+        required=True,
+        default=0
+    )
+
+    rate_limit_apply = schema.Float(
+        title=_('trans_label_rate_limit_apply'),
+        description=_('trans_help_rate_limit_apply'),
+        required=True,
+        default=0.0
+    )
+
+    rate_limit_apply_burst = schema.Int(
+        title=_('trans_label_rate_limit_apply_burst'),
+        description=_('trans_help_rate_limit_apply_burst'),
+        required=True,
+        default=5
+    )
+
+    rate_limit_metadata = schema.Float(
+        title=_('trans_label_rate_limit_metadata'),
+        description=_('trans_help_rate_limit_metadata'),
+        required=True,
+        default=0.0
+    )
+
+    rate_limit_metadata_burst = schema.Int(
+        title=_('trans_label_rate_limit_metadata_burst'),
+        description=_('trans_help_rate_limit_metadata_burst'),
+        required=True,
+        default=20
+    )
+
+    rate_limit_max_wait = schema.Float(
+        title=_('trans_label_rate_limit_max_wait'),
+        description=_('trans_help_rate_limit_max_wait'),
+        required=True,
+        default=2.0
+    )
+
+    bulkhead_apply_max_concurrent = schema.Int(
+        title=_('trans_label_bulkhead_apply_max_concurrent'),
+        description=_('trans_help_bulkhead_apply_max_concurrent'),
+        required=True,
+        default=4
+    )
+
+    bulkhead_apply_max_queue = schema.Int(
+        title=_('trans_label_bulkhead_apply_max_queue'),
+        description=_('trans_help_bulkhead_apply_max_queue'),
+        required=True,
+        default=8
+    )
+
+    bulkhead_apply_queue_timeout = schema.Float(
+        title=_('trans_label_bulkhead_apply_queue_timeout'),
+        description=_('trans_help_bulkhead_apply_queue_timeout'),
+        required=True,
+        default=5.0
+    )
+
+    slow_call_threshold = schema.Float(
+        title=_('trans_label_slow_call_threshold'),
+        description=_('trans_help_slow_call_threshold'),
+        required=True,
+        default=0.0
+    )
+
+    prompt_cache_ttl = schema.Int(
+        title=_('trans_label_prompt_cache_ttl'),
+        description=_('trans_help_prompt_cache_ttl'),
+        required=True,
+        default=60
+    )
+
+    prompt_cache_max_size = schema.Int(
+        title=_('trans_label_prompt_cache_max_size'),
+        description=_('trans_help_prompt_cache_max_size'),
+        required=True,
+        default=10
+    )
+
+    prompt_mirror_enabled = schema.Bool(
+        title=_('trans_label_prompt_mirror_enabled'),
+        description=_('trans_help_prompt_mirror_enabled'),
+        required=False,
+        default=False
+    )
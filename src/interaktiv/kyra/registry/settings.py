@@ -0,0 +1,155 @@
+"""Cached, immutable snapshot of the AI Assistant settings."""
+
+import dataclasses
+import threading
+from typing import Dict, Optional, Tuple
+
+from Acquisition import aq_base
+from BTrees.Length import Length
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from plone.registry.interfaces import IRecordEvent
+from plone.registry.interfaces import IRegistry
+from zope.annotation.interfaces import IAnnotations
+from zope.component import adapter
+from zope.component import getUtility
+from zope.component.hooks import getSite
+
+RECORD_PREFIX = f'{IAIAssistantSchema.__identifier__}.'
+
+
+@dataclasses.dataclass(frozen=True)
+class AIAssistantSettings:
+    """Values of the ``IAIAssistantSchema`` records at the time of reading.
+
+    Records that do not exist yet, e.g. before an upgrade step ran, fall
+    back to the schema defaults.
+    """
+
+    gateway_url: Optional[str] = None
+    keycloak_realms_url: Optional[str] = None
+    keycloak_client_id: Optional[str] = None
+    keycloak_client_secret: Optional[str] = None
+    keycloak_token_expiration_time: int = 1200
+    keycloak_token_refresh_margin: int = 60
+    domain_id: str = 'plone'
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = 10
+    http_pool_idle_timeout: int = 60
+    retry_max_attempts: int = 3
+    retry_backoff_base: float = 0.5
+    retry_backoff_max: float = 5.0
+    retry_deadline: int = 60
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: int = 30
+    timeout_list_connect: float = 3.05
+    timeout_list_read: float = 10.0
+    timeout_get_connect: float = 3.05
+    timeout_get_read: float = 10.0
+    timeout_apply_connect: float = 3.05
+    timeout_apply_read: float = 120.0
+    timeout_upload_connect: float = 3.05
+    timeout_upload_read: float = 60.0
+    timeout_download_connect: float = 3.05
+    timeout_download_read: float = 60.0
+    timeout_token_connect: float = 3.05
+    timeout_token_read: float = 10.0
+    request_budget: int = 0
+    compression_min_size: int = 0
+    rate_limit_apply: float = 0.0
+    rate_limit_apply_burst: int = 5
+    rate_limit_metadata: float = 0.0
+    rate_limit_metadata_burst: int = 20
+    rate_limit_max_wait: float = 2.0
+    bulkhead_apply_max_concurrent: int = 4
+    bulkhead_apply_max_queue: int = 8
+    bulkhead_apply_queue_timeout: float = 5.0
+    slow_call_threshold: float = 0.0
+    prompt_cache_ttl: int = 60
+    prompt_cache_max_size: int = 10
+    prompt_mirror_enabled: bool = False
+
+
+GENERATION_KEY = 'interaktiv.kyra.settings_generation'
+
+_lock = threading.Lock()
+_snapshots: Dict[Optional[str], Tuple[int, AIAssistantSettings]] = {}
+
+
+def get_settings() -> AIAssistantSettings:
+    """Return the settings snapshot of the current site.
+
+    The snapshot is built from the registry on first use and then kept
+    as long as the settings generation stored in the site's annotations
+    is unchanged. Since the ZODB is shared, a record modified in another
+    ZEO client is seen at the next transaction of this one.
+    """
+    site = getSite()
+    key = '/'.join(site.getPhysicalPath()) if site is not None else None
+    generation, committed = _get_generation(site)
+
+    cached = _snapshots.get(key)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    snapshot = _read_settings()
+    # A snapshot read under an older generation, e.g. by a thread whose
+    # transaction started before the change, or from uncommitted changes
+    # must not replace the current one
+    if committed:
+        with _lock:
+            cached = _snapshots.get(key)
+            if cached is None or cached[0] < generation:
+                _snapshots[key] = (generation, snapshot)
+    return snapshot
+
+
+def invalidate_settings() -> None:
+    """Drop all settings snapshots of this process, they are rebuilt on
+    next access.
+    """
+    with _lock:
+        _snapshots.clear()
+
+
+def _get_generation(site) -> Tuple[int, bool]:
+    """The settings generation of ``site`` and whether it is committed."""
+    if site is None:
+        return 0, True
+    # Read the annotations directly, adapting the site costs more than all
+    # the rest of ``get_settings``
+    annotations = getattr(aq_base(site), '__annotations__', None)
+    counter = annotations.get(GENERATION_KEY) if annotations is not None else None
+    if counter is None:
+        return 0, True
+    committed = counter._p_jar is not None and not counter._p_changed
+    return counter(), committed
+
+
+def _read_settings() -> AIAssistantSettings:
+    registry = getUtility(IRegistry)
+    values = {}
+    for field in dataclasses.fields(AIAssistantSettings):
+        value = registry.get(f'{RECORD_PREFIX}{field.name}')
+        if value is not None:
+            values[field.name] = value
+    return AIAssistantSettings(**values)
+
+
+@adapter(IRecordEvent)
+def settings_record_changed(event: IRecordEvent) -> None:
+    """Bump the settings generation when an AI Assistant record changes,
+    so all processes rebuild their snapshot once the change is committed.
+    """
+    record_name = getattr(event.record, '__name__', '') or ''
+    if not record_name.startswith(RECORD_PREFIX):
+        return
+
+    site = getSite()
+    if site is None:
+        invalidate_settings()
+        return
+    annotations = IAnnotations(site)
+    counter = annotations.get(GENERATION_KEY)
+    if counter is None:
+        counter = annotations[GENERATION_KEY] = Length()
+    counter.change(1)
@@ -1,4 +1,8 @@
 from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.tracing import SPAN_KIND_SERVER
+from interaktiv.kyra.api.tracing import get_tracing_file
+from interaktiv.kyra.api.tracing import tracer
+from interaktiv.kyra.registry.settings import get_settings
 
 from plone.protect.interfaces import IDisableCSRFProtection
 from plone.restapi.services import Service
@@ -12,4 +16,25 @@ class ServiceBase(Service):
         super().__init__(context, request)
         alsoProvides(self.request, IDisableCSRFProtection)
 
-        self.kyra = KyraAPI()
+        # Gateway calls of this request share the configured time budget
+        self.kyra = KyraAPI(budget=get_settings().request_budget)
+
+    def render(self):
+        tracer.configure(get_tracing_file())
+        if not tracer.enabled:
+            return super().render()
+
+        attributes = {
+            'http.request.method': self.request.get('REQUEST_METHOD', ''),
+            'url.path': self.request.get('PATH_INFO', ''),
+        }
+        span = tracer.start_span(
+            f'{self.__class__.__name__}.reply',
+            SPAN_KIND_SERVER,
+            attributes,
+            traceparent=self.request.getHeader('traceparent')
+        )
+        with span:
+            result = super().render()
+            span.set_attribute('http.response.status_code', self.request.response.getStatus())
+            return result
@@ -5,6 +5,7 @@ from typing import Dict, Any, Self
 from urllib.parse import parse_qs
 
 from ZPublisher.HTTPRequest import HTTPRequest
+from interaktiv.kyra.api.prompts import PromptListError
 from interaktiv.kyra.services.base import ServiceBase
 from plone.dexterity.content import DexterityContent
 from zope.interface import implementer
@@ -17,24 +18,49 @@ class PromptsGet(ServiceBase):
     Endpoint: GET /@prompts
 
     Query Parameters:
-        page: Page number for pagination (default: 1)
+        page: Page number for pagination, all prompts if omitted
         size: Number of items per page (default: 100)
+        category: Only prompts of this category
+        action: Only prompts with this action, ``replace`` or ``append``
+        q: Only prompts whose name or description contains words starting
+            with the given words
+
+    Requests without ``page`` or with a filter are answered from the prompt
+    catalog, filters ignore ``page``.
     """
 
+    FILTERS = {'category': 'category', 'action': 'action', 'query': 'q'}
+
     page: int
     size: int
 
     def __init__(self, context, request):
         super().__init__(context, request)
         self.query = parse_qs(self.request.get('QUERY_STRING'))
-        self.page = self.query.get('page', 1)
-        self.size = self.query.get('size', 100)
+        self.page = self._get_int('page', 1)
+        self.size = self._get_int('size', 100)
+
+    def _get_int(self, name: str, default: int) -> int:
+        try:
+            return max(1, int(self.query[name][0]))
+        except (KeyError, IndexError, ValueError):
+            return default
+
+    def _get_text(self, name: str) -> str:
+        values = self.query.get(name) or ['']
+        return values[0].strip()
 
     # noinspection PyMethodMayBeStatic
     def reply(self) -> Dict[str, Any]:
-        response = self.kyra.prompts.list(self.page, self.size)
-
-        return response
+        filters = {name: self._get_text(param) for name, param in self.FILTERS.items()}
+        if 'page' in self.query and not any(filters.values()):
+            return self.kyra.prompts.list(self.page, self.size)
+
+        try:
+            prompts = self.kyra.prompts.get_catalog(self.size).search(**filters)
+        except PromptListError as e:
+            return {'error': str(e)}
+        return {'prompts': prompts, 'total': len(prompts)}
 
 
 @implementer(IPublishTraverse)
@@ -0,0 +1,480 @@
+"""Local stand-in for the Kyra gateway and Keycloak, for load tests.
+
+Implements the token endpoint and the prompt and file endpoints used by
+``interaktiv.kyra.api`` with an in-memory store. Latency, error rates and
+payload sizes are configurable, so production failure modes like slow
+LLM calls, 503 bursts, hanging requests and dropped connections can be
+reproduced on one machine::
+
+    kyra-stub-server --port 9090 --latency lognormal:-3,0.5 \\
+        --apply-latency uniform:1,5 --error-rate 0.02 --prompts 500
+
+Then set the gateway URL to ``http://localhost:9090/api/prompts`` and the
+Keycloak realms URL to ``http://localhost:9090/realms/kyra``. Any client
+ID and secret are accepted.
+"""
+
+import argparse
+import base64
+import dataclasses
+import email.parser
+import email.policy
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from interaktiv.kyra import logger
+
+GATEWAY_PATH_DEFAULT = '/api/prompts'
+TOKEN_PATH_PATTERN = re.compile(r'^/realms/[^/]+/protocol/openid-connect/token$')
+TOKEN_LIFETIME_DEFAULT = 300
+
+Distribution = Callable[[random.Random], float]
+
+DISTRIBUTIONS = {
+    'fixed': lambda rnd, value: value,
+    'uniform': lambda rnd, low, high: rnd.uniform(low, high),
+    'normal': lambda rnd, mean, stddev: rnd.gauss(mean, stddev),
+    'lognormal': lambda rnd, mu, sigma: rnd.lognormvariate(mu, sigma),
+    'exponential': lambda rnd, mean: rnd.expovariate(1 / mean),
+}
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """Parse a latency distribution like ``fixed:0.05``, ``uniform:0.01,0.2``,
+    ``normal:0.1,0.02``, ``lognormal:-3,0.5`` or ``exponential:0.1``.
+
+    Samples are in seconds and never negative.
+    """
+    name, _, args = spec.partition(':')
+    sample = DISTRIBUTIONS.get(name)
+    if sample is None:
+        raise ValueError(f'Unknown distribution {name!r}, use one of {", ".join(DISTRIBUTIONS)}')
+    try:
+        params = [float(arg) for arg in args.split(',')] if args else []
+        sample(random.Random(0), *params)
+    except (TypeError, ValueError, ZeroDivisionError):
+        raise ValueError(f'Invalid parameters for {name} distribution: {args!r}')
+    return lambda rnd: max(0.0, sample(rnd, *params))
+
+
+@dataclasses.dataclass
+class StubConfig:
+    """Behaviour of the stub server."""
+    host: str = '127.0.0.1'
+    port: int = 9090
+    gateway_path: str = GATEWAY_PATH_DEFAULT
+    latency: str = 'fixed:0'
+    apply_latency: str = 'fixed:0'
+    token_latency: str = 'fixed:0'
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (503,)
+    hang_rate: float = 0.0
+    hang_time: float = 30.0
+    reset_rate: float = 0.0
+    prompts: int = 20
+    files: int = 0
+    prompt_size: int = 200
+    response_size: int = 500
+    file_size: int = 1024
+    token_lifetime: int = TOKEN_LIFETIME_DEFAULT
+    seed: Optional[int] = None
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def create_token(lifetime: int) -> str:
+    """Unsigned JWT whose ``exp`` claim the client reads."""
+    def encode(data: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    claims = {'exp': int(time.time()) + lifetime, 'sub': 'kyra-stub', 'jti': uuid.uuid4().hex}
+    return f'{encode({"alg": "none", "typ": "JWT"})}.{encode(claims)}.'
+
+
+class StubGateway:
+    """In-memory prompts and files with the configured failure behaviour."""
+
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._latency = parse_distribution(config.latency)
+        self._apply_latency = parse_distribution(config.apply_latency)
+        self._token_latency = parse_distribution(config.token_latency)
+        self._lock = threading.Lock()
+        self.prompts: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.requests = 0
+        for number in range(1, config.prompts + 1):
+            prompt = self.create_prompt({
+                'name': f'Prompt {number}',
+                'description': f'Generated prompt {number}',
+                'prompt': self._get_text(config.prompt_size),
+                'metadata': {
+                    'categories': [f'category-{number % 5}'],
+                    'action': 'replace' if number % 2 else 'append',
+                },
+            })
+            for file_number in range(1, config.files + 1):
+                self.add_file(prompt['id'], f'file-{file_number}.txt', 'text/plain', b'x' * config.file_size)
+
+    def _get_text(self, size: int) -> str:
+        words = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit')
+        text = ''
+        while len(text) < size:
+            text += self._random.choice(words) + ' '
+        return text[:size]
+
+    def sample_latency(self, operation: str) -> float:
+        distribution = {'apply': self._apply_latency, 'token': self._token_latency}.get(operation, self._latency)
+        with self._lock:
+            self.requests += 1
+            return distribution(self._random)
+
+    def sample_failure(self) -> Optional[Any]:
+        """``'reset'``, ``'hang'``, an HTTP error status or ``None`` for a
+        gateway call. Token requests always succeed.
+        """
+        config = self.config
+        with self._lock:
+            roll = self._random.random()
+            if roll < config.reset_rate:
+                return 'reset'
+            if roll < config.reset_rate + config.hang_rate:
+                return 'hang'
+            if roll < config.reset_rate + config.hang_rate + config.error_rate:
+                return self._random.choice(config.error_statuses)
+        return None
+
+    def list_prompts(self, page: int, size: int) -> Dict[str, Any]:
+        with self._lock:
+            prompts = [dict(prompt) for prompt in self.prompts.values()]
+        start = (page - 1) * size
+        return {'prompts': prompts[start:start + size], 'total': len(prompts), 'page': page, 'size': size}
+
+    def create_prompt(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        created = now_iso()
+        prompt = {
+            'id': str(uuid.uuid4()),
+            'name': data.get('name', ''),
+            'description': data.get('description', ''),
+            'prompt': data.get('prompt', ''),
+            'metadata': data.get('metadata') or {'categories': [], 'action': 'replace'},
+            'createdAt': created,
+            'updatedAt': created,
+            'version': 1,
+        }
+        with self._lock:
+            self.prompts[prompt['id']] = prompt
+            self.files[prompt['id']] = {}
+        return prompt
+
+    def get_prompt(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            prompt = self.prompts.get(prompt_id)
+            return dict(prompt) if prompt is not None else None
+
+    def list_files(self, prompt_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            files = self.files.get(prompt_id)
+            return list(files.values()) if files is not None else None
+
+    def update_prompt(self, prompt_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            prompt = self.prompts.get(prompt_id)
+            if prompt is None:
+                return None
+            for key in ('name', 'description', 'prompt', 'metadata'):
+                if key in data:
+                    prompt[key] = data[key]
+            prompt['updatedAt'] = now_iso()
+            prompt['version'] += 1
+            return dict(prompt)
+
+    def delete_prompt(self, prompt_id: str) -> bool:
+        with self._lock:
+            for file_id in self.files.pop(prompt_id, {}):
+                self.contents.pop(file_id, None)
+            return self.prompts.pop(prompt_id, None) is not None
+
+    def add_file(self, prompt_id: str, filename: str, mime_type: str, content: bytes) -> Dict[str, Any]:
+        file = {
+            'id': str(uuid.uuid4()),
+            'promptId': prompt_id,
+            'filename': filename,
+            'mimeType': mime_type,
+            'sizeBytes': len(content),
+            'createdAt': now_iso(),
+        }
+        with self._lock:
+            self.files[prompt_id][file['id']] = file
+            self.contents[file['id']] = content
+        return file
+
+    def get_file(self, prompt_id: str, file_id: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        with self._lock:
+            file = self.files.get(prompt_id, {}).get(file_id)
+            return (file, self.contents[file_id]) if file is not None else None
+
+    def delete_file(self, prompt_id: str, file_id: str) -> bool:
+        with self._lock:
+            self.contents.pop(file_id, None)
+            return self.files.get(prompt_id, {}).pop(file_id, None) is not None
+
+    def apply(self, prompt_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        text = data.get('text', '')
+        with self._lock:
+            generated = self._get_text(self.config.response_size)
+        return {'response': f'{text} {generated}'.strip(), 'prompt_id': prompt_id}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Routes gateway and Keycloak requests to the ``StubGateway``."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'KyraStub/1.0'
+    gateway: StubGateway
+
+    def do_GET(self) -> None:
+        self._handle('GET')
+
+    def do_POST(self) -> None:
+        self._handle('POST')
+
+    def do_PATCH(self) -> None:
+        self._handle('PATCH')
+
+    def do_DELETE(self) -> None:
+        self._handle('DELETE')
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format % args)
+
+    def _handle(self, method: str) -> None:
+        path, _, query = self.path.partition('?')
+        body = self._read_body()
+        route = self._route(method, path)
+        if route is None:
+            return self._send_json(404, {'error': 'Not found'})
+        operation, handler, params = route
+
+        time.sleep(self.gateway.sample_latency(operation))
+        failure = self.gateway.sample_failure() if operation != 'token' else None
+        if failure == 'reset':
+            self.close_connection = True
+            return
+        if failure == 'hang':
+            time.sleep(self.gateway.config.hang_time)
+            self.close_connection = True
+            return
+        if failure is not None:
+            return self._send_json(failure, {'error': 'Service unavailable'})
+
+        if operation != 'token' and not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._send_json(401, {'error': 'Unauthorized'})
+        try:
+            handler(body=body, query=dict(parse_qsl(query)), **params)
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': f'Bad request: {e}'})
+
+    def _route(self, method: str, path: str) -> Optional[Tuple[str, Callable, Dict[str, str]]]:
+        if method == 'POST' and TOKEN_PATH_PATTERN.match(path):
+            return 'token', self._token, {}
+
+        base = self.gateway.config.gateway_path.rstrip('/')
+        if path.rstrip('/') == base:
+            return {'GET': ('list', self._list, {}), 'POST': ('create', self._create, {})}.get(method)
+        if not path.startswith(base + '/'):
+            return None
+
+        parts = path[len(base) + 1:].strip('/').split('/')
+        prompt = {'prompt_id': parts[0]}
+        routes = {
+            (1, 'GET'): ('get', self._get, prompt),
+            (1, 'PATCH'): ('update', self._update, prompt),
+            (1, 'DELETE'): ('delete', self._delete, prompt),
+        }
+        if len(parts) == 2 and parts[1] == 'apply' and method == 'POST':
+            return 'apply', self._apply, prompt
+        if len(parts) >= 2 and parts[1] == 'files':
+            if len(parts) == 2:
+                return {'GET': ('list', self._list_files, prompt), 'POST': ('upload', self._upload, prompt)}.get(method)
+            file = {**prompt, 'file_id': parts[2]}
+            if len(parts) == 4 and parts[3] == 'download' and method == 'GET':
+                return 'download', self._download, file
+            if len(parts) == 3 and method == 'DELETE':
+                return 'delete', self._delete_file, file
+            return None
+        return routes.get((len(parts), method))
+
+    def _read_body(self) -> bytes:
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return body
+
+    def _token(self, body: bytes, query: Dict[str, str]) -> None:
+        lifetime = self.gateway.config.token_lifetime
+        self._send_json(200, {
+            'access_token': create_token(lifetime),
+            'expires_in': lifetime,
+            'token_type': 'Bearer',
+        })
+
+    def _list(self, body: bytes, query: Dict[str, str]) -> None:
+        page, size = int(query.get('page', 1)), int(query.get('size', 100))
+        self._send_json(200, self.gateway.list_prompts(max(1, page), max(1, size)))
+
+    def _create(self, body: bytes, query: Dict[str, str]) -> None:
+        data = json.loads(body)
+        if not data.get('name') or not data.get('prompt'):
+            return self._send_json(400, {'error': 'name and prompt are required'})
+        self._send_json(201, self.gateway.create_prompt(data))
+
+    def _get(self, body: bytes, query: Dict[str, str], prompt_id: str) -> None:
+        prompt = self.gateway.get_prompt(prompt_id)
+        if prompt is None:
+            return self._send_json(404, {'error': 'Prompt not found'})
+        self._send_json(200, prompt)
+
+    def _update(self, body: bytes, query: Dict[str, str], prompt_id: str) -> None:
+        prompt = self.gateway.update_prompt(prompt_id, json.loads(body))
+        if prompt is None:
+            return self._send_json(404, {'error': 'Prompt not found'})
+        self._send_json(200, prompt)
+
+    def _delete(self, body: bytes, query: Dict[str, str], prompt_id: str) -> None:
+        if not self.gateway.delete_prompt(prompt_id):
+            return self._send_json(404, {'error': 'Prompt not found'})
+        self._send_empty()
+
+    def _apply(self, body: bytes, query: Dict[str, str], prompt_id: str) -> None:
+        if self.gateway.get_prompt(prompt_id) is None:
+            return self._send_json(404, {'error': 'Prompt not found'})
+        self._send_json(200, self.gateway.apply(prompt_id, json.loads(body)))
+
+    def _list_files(self, body: bytes, query: Dict[str, str], prompt_id: str) -> None:
+        files = self.gateway.list_files(prompt_id)
+        if files is None:
+            return self._send_json(404, {'error': 'Prompt not found'})
+        self._send_json(200, {'files': files})
+
+    def _upload(self, body: bytes, query: Dict[str, str], prompt_id: str) -> None:
+        if self.gateway.list_files(prompt_id) is None:
+            return self._send_json(404, {'error': 'Prompt not found'})
+        head = f'Content-Type: {self.headers.get("Content-Type", "")}\r\n\r\n'.encode()
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(head + body)
+        if not message.is_multipart():
+            return self._send_json(400, {'error': 'Expected multipart/form-data'})
+        files = [
+            self.gateway.add_file(prompt_id, part.get_filename(), part.get_content_type(), part.get_payload(decode=True))
+            for part in message.iter_parts() if part.get_filename()
+        ]
+        self._send_json(201, {'files': files})
+
+    def _download(self, body: bytes, query: Dict[str, str], prompt_id: str, file_id: str) -> None:
+        found = self.gateway.get_file(prompt_id, file_id)
+        if found is None:
+            return self._send_json(404, {'error': 'File not found'})
+        file, content = found
+        self._send(200, content, file['mimeType'])
+
+    def _delete_file(self, body: bytes, query: Dict[str, str], prompt_id: str, file_id: str) -> None:
+        if not self.gateway.delete_file(prompt_id, file_id):
+            return self._send_json(404, {'error': 'File not found'})
+        self._send_empty()
+
+    def _send_json(self, status: int, data: Any) -> None:
+        self._send(status, json.dumps(data).encode(), 'application/json')
+
+    def _send_empty(self) -> None:
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send(self, status: int, content: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def create_server(config: StubConfig) -> ThreadingHTTPServer:
+    """Create the stub server without starting it; port ``0`` picks a free
+    port, see ``server.server_address``.
+    """
+    handler = type('StubRequestHandler', (StubRequestHandler,), {'gateway': StubGateway(config)})
+    server = ThreadingHTTPServer((config.host, config.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_args(args: Optional[List[str]] = None) -> StubConfig:
+    defaults = StubConfig()
+    parser = argparse.ArgumentParser(description='Local stand-in Kyra gateway and Keycloak server.')
+    parser.add_argument('--host', default=defaults.host)
+    parser.add_argument('--port', type=int, default=defaults.port)
+    parser.add_argument('--gateway-path', default=defaults.gateway_path, help='path of the prompts endpoint')
+    parser.add_argument('--latency', default=defaults.latency, type=_distribution,
+                        help='latency of all calls except apply and token, e.g. fixed:0.05, uniform:0.01,0.2, '
+                             'normal:0.1,0.02, lognormal:-3,0.5 or exponential:0.1 (seconds)')
+    parser.add_argument('--apply-latency', default=defaults.apply_latency, type=_distribution)
+    parser.add_argument('--token-latency', default=defaults.token_latency, type=_distribution)
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate,
+                        help='share of calls answered with an error status')
+    parser.add_argument('--error-statuses', default='503', help='comma separated error statuses to pick from')
+    parser.add_argument('--hang-rate', type=float, default=defaults.hang_rate,
+                        help='share of calls that hang for --hang-time seconds and then drop the connection')
+    parser.add_argument('--hang-time', type=float, default=defaults.hang_time)
+    parser.add_argument('--reset-rate', type=float, default=defaults.reset_rate,
+                        help='share of calls whose connection is dropped without a response')
+    parser.add_argument('--prompts', type=int, default=defaults.prompts, help='number of generated prompts')
+    parser.add_argument('--files', type=int, default=defaults.files, help='generated files per prompt')
+    parser.add_argument('--prompt-size', type=int, default=defaults.prompt_size, help='prompt text size in bytes')
+    parser.add_argument('--response-size', type=int, default=defaults.response_size,
+                        help='size of generated apply responses in bytes')
+    parser.add_argument('--file-size', type=int, default=defaults.file_size, help='generated file size in bytes')
+    parser.add_argument('--token-lifetime', type=int, default=defaults.token_lifetime, help='seconds')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for reproducible runs')
+    options = vars(parser.parse_args(args))
+    options['error_statuses'] = tuple(int(status) for status in options['error_statuses'].split(','))
+    return StubConfig(**options)
+
+
+def _distribution(spec: str) -> str:
+    try:
+        parse_distribution(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return spec
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Console script ``kyra-stub-server``."""
+    config = parse_args(args)
+    server = create_server(config)
+    host, port = server.server_address[:2]
+    print(f'Gateway URL:         http://{host}:{port}{config.gateway_path}')
+    print(f'Keycloak Realms URL: http://{host}:{port}/realms/kyra')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,8 @@
+import json
+from datetime import timedelta
+from unittest.mock import Mock
+
+import requests
 from plone.app.testing import (
     FunctionalTesting,
     IntegrationTesting,
@@ -5,6 +10,39 @@ from plone.app.testing import (
     PloneSandboxLayer,
 )
 from plone.testing.zope import WSGI_SERVER_FIXTURE
+from requests.structures import CaseInsensitiveDict
+
+
+def create_response(data=None, status_code=200, headers=None, request_body=None, real=False):
+    """Mock of a gateway ``requests.Response`` with ``data`` as JSON body.
+
+    ``raise_for_status`` raises for error status codes, ``request_body``
+    is the body of the request that was sent. With ``real`` set, a real
+    ``requests.Response`` is built instead, for benchmarks that must not
+    measure the overhead of ``Mock``.
+    """
+    content = json.dumps(data).encode() if data is not None else b''
+    if real:
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = 'OK' if status_code < 400 else 'Error'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json', **(headers or {})})
+        response._content = content
+        response.elapsed = timedelta(0)
+        if request_body is not None:
+            response.request = requests.PreparedRequest()
+            response.request.body = request_body
+        return response
+
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {'content-type': 'application/json', **(headers or {})}
+    response.content = content
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    if request_body is not None:
+        response.request.body = request_body
+    return response
 
 
 class InteraktivKyraLayer(PloneSandboxLayer):
@@ -21,9 +59,33 @@ class InteraktivKyraLayer(PloneSandboxLayer):
         import interaktiv.kyra
         self.loadZCML(package=interaktiv.kyra)
 
+        # Tests must not renew Keycloak tokens in the background
+        from interaktiv.kyra.api.tokens import token_store
+        token_store.background_renewal = False
+
     def setUpPloneSite(self, portal):
         self.applyProfile(portal, 'interaktiv.kyra:default')
 
+    def testSetUp(self):
+        # Tokens, settings and breaker states are kept in memory per process,
+        # don't leak them between tests
+        from interaktiv.kyra.api.breaker import circuit_breakers
+        from interaktiv.kyra.api.bulkhead import apply_bulkhead
+        from interaktiv.kyra.api.cache import prompt_cache
+        from interaktiv.kyra.api.coalesce import single_flight
+        from interaktiv.kyra.api.metrics import metrics
+        from interaktiv.kyra.api.ratelimit import rate_limiters
+        from interaktiv.kyra.api.tokens import token_store
+        from interaktiv.kyra.registry.settings import invalidate_settings
+        token_store.clear()
+        invalidate_settings()
+        circuit_breakers.clear()
+        single_flight.clear()
+        rate_limiters.clear()
+        apply_bulkhead.reset()
+        metrics.clear()
+        prompt_cache.clear()
+
 
 INTERAKTIV_KYRA_FIXTURE = InteraktivKyraLayer()
 
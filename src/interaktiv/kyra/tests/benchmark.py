@@ -0,0 +1,133 @@
+"""Helpers for the benchmark tests in ``test_benchmarks.py``.
+
+Benchmarks run at test level 2, so a normal test run skips them::
+
+    bin/test -s interaktiv.kyra -t benchmarks -a 2
+
+Every benchmark is compared with its baseline in ``benchmarks.json`` and
+fails when its fastest time per call is more than ``KYRA_BENCHMARK_THRESHOLD``
+(default ``0.5``, i.e. 50 %) slower. Times are normalized by a fixed pure
+Python workload measured right before each benchmark, so baselines
+recorded on a different or busier machine still give meaningful
+comparisons. Run with ``KYRA_BENCHMARK_UPDATE=1`` to record new baselines.
+"""
+
+import gc
+import json
+import os
+import statistics
+import time
+import unittest
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'benchmarks.json')
+THRESHOLD_DEFAULT = 0.5
+
+# Minimum duration of one round, fast calls are repeated to reach it
+ROUND_DURATION = 0.02
+
+
+def measure(func: Callable[[], Any], rounds: int = 20, warmup: int = 3) -> Dict[str, float]:
+    """Seconds per call of ``func``: minimum, median and 95th percentile
+    over ``rounds`` rounds. Like ``timeit``, garbage collection is off
+    while measuring.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _measure(func, rounds, warmup)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _measure(func: Callable[[], Any], rounds: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        func()
+
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= ROUND_DURATION or number >= 10000:
+            break
+        number *= 2
+
+    times: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - started) / number)
+
+    times.sort()
+    return {
+        'median': statistics.median(times),
+        'min': times[0],
+        'p95': times[min(len(times) - 1, int(len(times) * 0.95))],
+        'calls_per_round': number,
+    }
+
+
+def calibrate() -> float:
+    """Seconds of a fixed workload, the unit for comparing benchmarks
+    across machines.
+    """
+    def workload():
+        data = {str(i): [i, str(i)] for i in range(2000)}
+        json.loads(json.dumps(data))
+        sorted(data, key=lambda key: data[key][1])
+    return measure(workload, rounds=15)['min']
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    """Base class of benchmark tests, compares results with the baselines
+    and records them with ``KYRA_BENCHMARK_UPDATE=1``.
+    """
+
+    level = 2
+
+    def assertNoRegression(self, name: str, func: Callable[[], Any], rounds: int = 20) -> None:
+        calibration = calibrate()
+        result = {**measure(func, rounds=rounds), 'calibration': calibration}
+        if os.environ.get('KYRA_BENCHMARK_UPDATE'):
+            save_baseline(name, result)
+            return
+
+        baseline = get_baseline(name, calibration)
+        if baseline is None:
+            return
+
+        threshold = float(os.environ.get('KYRA_BENCHMARK_THRESHOLD', THRESHOLD_DEFAULT))
+        ratio = result['min'] / baseline
+        self.assertLessEqual(
+            ratio,
+            1 + threshold,
+            f'{name} regressed: {result["min"] * 1e6:.1f} us per call, '
+            f'{ratio:.2f}x the baseline of {baseline * 1e6:.1f} us (threshold {threshold:.0%})'
+        )
+
+
+def load_baselines() -> Dict[str, Any]:
+    try:
+        with open(BASELINES_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(name: str, result: Dict[str, float]) -> None:
+    baselines = load_baselines()
+    baselines.setdefault('benchmarks', {})[name] = result
+    with open(BASELINES_PATH, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def get_baseline(name: str, calibration: float) -> Optional[float]:
+    """Baseline time of ``name`` scaled to the current ``calibration``."""
+    benchmark = load_baselines().get('benchmarks', {}).get(name)
+    if benchmark is None:
+        return None
+    return benchmark['min'] * calibration / benchmark['calibration']
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestKyraAPI(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.APIBase._get_api_credentials')
+    def test_init__no_credentials_or_token_lookup(self, mock_get_creds, mock_get_token):
+        # do it
+        KyraAPI()
+
+        # postcondition
+        mock_get_creds.assert_not_called()
+        mock_get_token.assert_not_called()
+
+    def test_sub_clients__created_on_first_access(self):
+        # setup
+        kyra = KyraAPI()
+
+        # do it
+        prompts1 = kyra.prompts
+        prompts2 = kyra.prompts
+
+        # postcondition
+        self.assertIs(prompts1, prompts2)
+        self.assertNotIn('files', kyra.__dict__)
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.APIBase._get_api_credentials')
+    def test_sub_clients__share_context(self, mock_get_creds, mock_get_token):
+        # setup
+        mock_get_creds.return_value = ('http://localhost:8080/api', 'realms', 'id', 'secret')
+        mock_get_token.return_value = 'test_token_123'
+        kyra = KyraAPI()
+
+        # do it
+        prompts_token = kyra.prompts.token
+        files_token = kyra.files.token
+        gateway_url = kyra.files.gateway_url
+
+        # postcondition
+        self.assertIs(kyra.prompts.context, kyra.files.context)
+        self.assertEqual(prompts_token, 'test_token_123')
+        self.assertEqual(files_token, 'test_token_123')
+        self.assertEqual(gateway_url, 'http://localhost:8080/api')
+        mock_get_creds.assert_called_once()
+        mock_get_token.assert_called_once()
@@ -0,0 +1,117 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import plone.api as api
+from interaktiv.kyra.api import AsyncKyraAPI
+from interaktiv.kyra.api.cache import prompt_cache
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestAsyncKyraAPI(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+        api.portal.set_registry_record(
+            name='gateway_url',
+            interface=IAIAssistantSchema,
+            value='http://localhost:8080/api/prompts'
+        )
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_gather__returns_results_in_order(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+
+        def respond(method, url, **kwargs):
+            if url.endswith('/files'):
+                return create_response({'files': [{'id': 'file-1'}]})
+            return create_response({'id': 'test-id'})
+
+        mock_request.side_effect = respond
+        kyra = AsyncKyraAPI()
+
+        # do it
+        prompt, files = kyra.gather(
+            kyra.prompts.get('test-id'),
+            kyra.files.get('test-id')
+        )
+
+        # postcondition
+        self.assertEqual(prompt, {'id': 'test-id'})
+        self.assertEqual(files, [{'id': 'file-1'}])
+        self.assertEqual(mock_request.call_count, 2)
+        mock_get_token.assert_called_once()
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_gather__calls_overlap(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        barrier = threading.Barrier(3, timeout=5)
+
+        def respond(method, url, **kwargs):
+            # Only passes if all three calls are in flight at the same time
+            barrier.wait()
+            return create_response({'url': url})
+
+        mock_request.side_effect = respond
+        kyra = AsyncKyraAPI()
+
+        # do it
+        results = kyra.gather(
+            kyra.prompts.get('prompt-1'),
+            kyra.prompts.get('prompt-2'),
+            kyra.prompts.get('prompt-3')
+        )
+
+        # postcondition
+        self.assertEqual(
+            [result['url'] for result in results],
+            [
+                'http://localhost:8080/api/prompts/prompt-1',
+                'http://localhost:8080/api/prompts/prompt-2',
+                'http://localhost:8080/api/prompts/prompt-3'
+            ]
+        )
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_gather__no_headers(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = ''
+        kyra = AsyncKyraAPI()
+
+        # do it
+        result, = kyra.gather(kyra.prompts.list())
+
+        # postcondition
+        self.assertEqual(result, {'error': 'No headers available'})
+        mock_request.assert_not_called()
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_gather__update_evicts_cached_prompt(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = create_response({'id': 'test-id'})
+        key = ('http://localhost:8080/api/prompts/test-id', '', 'plone')
+        prompt_cache.set(key, {'id': 'test-id'}, 10, {})
+        kyra = AsyncKyraAPI()
+
+        # do it
+        result, = kyra.gather(kyra.prompts.update('test-id', {'name': 'Updated'}))
+
+        # postcondition
+        self.assertEqual(result, {'id': 'test-id'})
+        self.assertIsNone(prompt_cache.get(key))
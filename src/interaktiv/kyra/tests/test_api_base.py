@@ -1,11 +1,14 @@
+import base64
+import json
 import time
 import unittest
 from unittest.mock import patch, Mock
 
 import plone.api as api
+import requests
 from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.tokens import token_store
 from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
-from interaktiv.kyra.registry.ai_assistant_cache import IAIAssistantCacheSchema
 from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
 from plone.app.testing import TEST_USER_ID, setRoles
 
@@ -64,133 +67,119 @@ class TestServiceBase(unittest.TestCase):
         # postcondition
         self.assertTupleEqual(result, (None, None, None, None))
 
-    def test__get_token_from_registry__token__valid_timestamp(self):
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    def test_get_token__success(self, mock_post):
         # setup
-        api.portal.set_registry_record(
-            name='keycloak_token_value',
-            interface=IAIAssistantCacheSchema,
-            value='test_token'
-        )
-        api.portal.set_registry_record(
-            name='keycloak_token_timestamp',
-            interface=IAIAssistantCacheSchema,
-            value=str(time.time())
-        )
+        realms_url = 'http://localhost:8080/realms/kyra'
+        client_id = 'client_id'
+        client_secret = 'client_secret'
+        mocked_token = 'mocked_access_token_12345'
+
+        mock_response = Mock()
+        mock_response.json.return_value = {'access_token': mocked_token}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        service = APIBase()
 
         # do it
-        result = APIBase._get_token_from_registry()
+        result = service._get_token(realms_url, client_id, client_secret)
 
         # postcondition
-        self.assertEqual(result, 'test_token')
+        self.assertEqual(result, mocked_token)
 
-    def test__get_token_from_registry__token__no_timestamp(self):
-        # setup
-        api.portal.set_registry_record(
-            name='keycloak_token_value',
-            interface=IAIAssistantCacheSchema,
-            value='test_token'
-        )
-        api.portal.set_registry_record(
-            name='keycloak_token_timestamp',
-            interface=IAIAssistantCacheSchema,
-            value=''
+        mock_post.assert_called_once_with(
+            'http://localhost:8080/realms/kyra/protocol/openid-connect/token',
+            data={
+                'grant_type': 'client_credentials',
+                'client_id': 'client_id',
+                'client_secret': 'client_secret'
+            },
+            timeout=(3.05, 10.0)
         )
 
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    def test_get_token__uses_token_store(self, mock_post):
+        # setup
+        mock_response = Mock()
+        mock_response.json.return_value = {'access_token': 'mocked_access_token_12345'}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        service = APIBase()
+
         # do it
-        result = APIBase._get_token_from_registry()
+        token1 = service._get_token('http://localhost:8080/realms/kyra', 'client_id', 'client_secret')
+        token2 = service._get_token('http://localhost:8080/realms/kyra', 'client_id', 'client_secret')
 
         # postcondition
-        self.assertEqual(result, '')
+        self.assertEqual(token1, 'mocked_access_token_12345')
+        self.assertEqual(token2, 'mocked_access_token_12345')
+        mock_post.assert_called_once()
+
+        entry = token_store.peek(('http://localhost:8080/realms/kyra', 'client_id'))
+        self.assertEqual(entry.token, 'mocked_access_token_12345')
 
-    def test__get_token_from_registry__no_token__valid_timestamp(self):
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    def test_get_token__uses_expires_in(self, mock_post):
         # setup
-        api.portal.set_registry_record(
-            name='keycloak_token_value',
-            interface=IAIAssistantCacheSchema,
-            value=''
-        )
-        api.portal.set_registry_record(
-            name='keycloak_token_timestamp',
-            interface=IAIAssistantCacheSchema,
-            value=str(time.time())
-        )
+        mock_response = Mock()
+        mock_response.json.return_value = {'access_token': 'test_token', 'expires_in': 300}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        service = APIBase()
 
         # do it
-        result = APIBase._get_token_from_registry()
+        service._get_token('http://localhost:8080/realms/kyra', 'client_id', 'client_secret')
 
         # postcondition
-        self.assertEqual(result, '')
+        entry = token_store.peek(('http://localhost:8080/realms/kyra', 'client_id'))
+        self.assertAlmostEqual(entry.expires_at - entry.fetched_at, 300, places=3)
+        self.assertAlmostEqual(entry.expires_at - entry.refresh_at, 60, places=3)
+
+    def test_get_token_lifetime__expires_in(self):
+        # do it
+        result = APIBase._get_token_lifetime({'expires_in': 300}, 'opaque-token', 1200)
 
-    def test__get_token_from_registry__token__old_timestamp(self):
+        # postcondition
+        self.assertEqual(result, 300)
+
+    def test_get_token_lifetime__jwt_exp(self):
         # setup
-        api.portal.set_registry_record(
-            name='keycloak_token_value',
-            interface=IAIAssistantCacheSchema,
-            value='test_token'
-        )
-        now_timestamp = time.time()
-        one_day_ago = now_timestamp - 86400
-        api.portal.set_registry_record(
-            name='keycloak_token_timestamp',
-            interface=IAIAssistantCacheSchema,
-            value=str(one_day_ago)
-        )
+        exp = int(time.time()) + 600
+        payload = base64.urlsafe_b64encode(json.dumps({'exp': exp}).encode()).decode().rstrip('=')
 
         # do it
-        result = APIBase._get_token_from_registry()
+        result = APIBase._get_token_lifetime({}, f'header.{payload}.signature', 1200)
 
         # postcondition
-        self.assertEqual(result, '')
+        self.assertTrue(590 < result <= 600)
 
-    def test__update_token_in_registry(self):
+    def test_get_token_lifetime__default(self):
         # do it
-        APIBase._update_token_in_registry(token='test_token')
+        result = APIBase._get_token_lifetime({}, 'opaque-token', 1200)
 
         # postcondition
-        token = api.portal.get_registry_record(
-            name='keycloak_token_value',
-            interface=IAIAssistantCacheSchema
-        )
-        self.assertEqual(token, 'test_token')
-
-        token_timestamp = api.portal.get_registry_record(
-             name='keycloak_token_timestamp',
-             interface=IAIAssistantCacheSchema
-        )
-        now_timestamp = time.time()
-        self.assertTrue(float(now_timestamp) > float(token_timestamp))
+        self.assertEqual(result, 1200)
 
-    @patch('interaktiv.kyra.api.base.requests.post')
-    def test_get_token__success(self, mock_post):
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    def test_get_token__http_error_not_cached(self, mock_post):
         # setup
-        realms_url = 'http://localhost:8080/realms/kyra'
-        client_id = 'client_id'
-        client_secret = 'client_secret'
-        mocked_token = 'mocked_access_token_12345'
-
         mock_response = Mock()
-        mock_response.json.return_value = {'access_token': mocked_token}
-        mock_response.raise_for_status = Mock()
+        mock_response.raise_for_status.side_effect = requests.HTTPError('401')
         mock_post.return_value = mock_response
 
         service = APIBase()
 
         # do it
-        result = service._get_token(realms_url, client_id, client_secret)
+        result = service._get_token('http://localhost:8080/realms/kyra', 'client_id', 'client_secret')
 
         # postcondition
-        self.assertEqual(result, mocked_token)
-
-        mock_post.assert_called_once_with(
-            'http://localhost:8080/realms/kyra/protocol/openid-connect/token',
-            data={
-                'grant_type': 'client_credentials',
-                'client_id': 'client_id',
-                'client_secret': 'client_secret'
-            }
-        )
+        self.assertEqual(result, '')
+        self.assertIsNone(token_store.peek(('http://localhost:8080/realms/kyra', 'client_id')))
 
-    @patch('interaktiv.kyra.api.base.requests.post')
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
     def test_get_token__request_error(self, mock_post):
         # setup
         mock_post.side_effect = Exception('Connection error')
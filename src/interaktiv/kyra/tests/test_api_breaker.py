@@ -0,0 +1,162 @@
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.breaker import CLOSED, HALF_OPEN, OPEN
+from interaktiv.kyra.api.breaker import CircuitBreaker
+from interaktiv.kyra.api.breaker import circuit_breakers
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30)
+
+    def test_opens_after_failure_threshold(self):
+        # do it
+        self.breaker.record(False)
+        state_after_one = self.breaker.state
+        self.breaker.record(False)
+
+        # postcondition
+        self.assertEqual(state_after_one, CLOSED)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_failures(self):
+        # do it
+        self.breaker.record(False)
+        self.breaker.record(True)
+        self.breaker.record(False)
+
+        # postcondition
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    @patch('interaktiv.kyra.api.breaker.time.monotonic')
+    def test_half_open_allows_single_trial(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 1000.0
+        self.breaker.record(False)
+        self.breaker.record(False)
+
+        # do it
+        mock_monotonic.return_value = 1031.0
+        first = self.breaker.allow()
+        second = self.breaker.allow()
+
+        # postcondition
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(first)
+        self.assertFalse(second)
+
+    @patch('interaktiv.kyra.api.breaker.time.monotonic')
+    def test_half_open_trial_success_closes(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 1000.0
+        self.breaker.record(False)
+        self.breaker.record(False)
+        mock_monotonic.return_value = 1031.0
+        self.breaker.allow()
+
+        # do it
+        self.breaker.record(True)
+
+        # postcondition
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    @patch('interaktiv.kyra.api.breaker.time.monotonic')
+    def test_half_open_trial_failure_opens(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 1000.0
+        self.breaker.record(False)
+        self.breaker.record(False)
+        mock_monotonic.return_value = 1031.0
+        self.breaker.allow()
+
+        # do it
+        self.breaker.record(False)
+
+        # postcondition
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+
+class TestSendWithBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+        self.options = RequestOptions(breaker=self.breaker)
+        self.headers = {'x-domain-id': 'plone'}
+
+    def test_send__server_error_opens_breaker(self):
+        # setup
+        session = Mock()
+        session.request.return_value = create_response(status_code=503, data={'error': 'down'})
+
+        # do it
+        APIBase._send(session, 'GET', 'http://localhost/prompts', self.headers, options=self.options)
+        result = APIBase._send(session, 'GET', 'http://localhost/prompts', self.headers, options=self.options)
+
+        # postcondition
+        self.assertEqual(result, {'error': 'Service temporarily unavailable - please try again later'})
+        session.request.assert_called_once()
+
+    def test_send__client_error_keeps_breaker_closed(self):
+        # setup
+        session = Mock()
+        session.request.return_value = create_response(status_code=404, data={'error': 'not found'})
+
+        # do it
+        APIBase._send(session, 'GET', 'http://localhost/prompts/x', self.headers, options=self.options)
+
+        # postcondition
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_send__open_breaker_serves_fallback(self):
+        # setup
+        session = Mock()
+        session.request.side_effect = [
+            create_response(status_code=200, data={'prompts': [{'id': 'test-1'}]}),
+            requests.ConnectionError()
+        ]
+        kwargs = {'params': {'page': 1, 'size': 100}}
+        APIBase._send(session, 'GET', 'http://localhost/prompts', self.headers, options=self.options, **kwargs)
+        APIBase._send(session, 'GET', 'http://localhost/prompts', self.headers, options=self.options, **kwargs)
+
+        # do it
+        result = APIBase._send(session, 'GET', 'http://localhost/prompts', self.headers, options=self.options, **kwargs)
+
+        # postcondition
+        self.assertEqual(result, {'prompts': [{'id': 'test-1'}]})
+        self.assertEqual(session.request.call_count, 2)
+
+
+class TestCircuitBreakersView(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    def test_view__lists_breakers(self):
+        # setup
+        breaker = circuit_breakers.get(('http://localhost:8080/api/prompts', 'apply'), failure_threshold=1)
+        breaker.record(False)
+
+        # do it
+        view = self.portal.restrictedTraverse('@@kyra-circuit-breakers')
+        result = json.loads(view())
+
+        # postcondition
+        self.assertEqual(len(result['circuit_breakers']), 1)
+        self.assertEqual(result['circuit_breakers'][0]['name'], 'http://localhost:8080/api/prompts apply')
+        self.assertEqual(result['circuit_breakers'][0]['state'], OPEN)
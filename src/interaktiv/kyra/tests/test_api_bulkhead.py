@@ -0,0 +1,126 @@
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+import plone.api as api
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.bulkhead import Bulkhead
+from interaktiv.kyra.api.bulkhead import apply_bulkhead
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestBulkhead(unittest.TestCase):
+
+    def test_acquire__rejects_when_full(self):
+        # setup
+        bulkhead = Bulkhead('test', max_concurrent=1, max_queue=0)
+        bulkhead.acquire()
+
+        # do it
+        result = bulkhead.acquire(timeout=1)
+
+        # postcondition
+        self.assertFalse(result)
+        self.assertEqual(bulkhead.info()['rejected'], 1)
+
+    def test_acquire__queue_times_out(self):
+        # setup
+        bulkhead = Bulkhead('test', max_concurrent=1, max_queue=1)
+        bulkhead.acquire()
+
+        # do it
+        result = bulkhead.acquire(timeout=0.01)
+
+        # postcondition
+        self.assertFalse(result)
+        self.assertEqual(bulkhead.info()['timed_out'], 1)
+        self.assertEqual(bulkhead.info()['waiting'], 0)
+
+    def test_acquire__waiter_gets_released_slot(self):
+        # setup
+        bulkhead = Bulkhead('test', max_concurrent=1, max_queue=1)
+        bulkhead.acquire()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(bulkhead.acquire(timeout=5)))
+
+        # do it
+        waiter.start()
+        while bulkhead.info()['waiting'] < 1:
+            threading.Event().wait(0.01)
+        bulkhead.release()
+        waiter.join(5)
+
+        # postcondition
+        self.assertEqual(results, [True])
+        self.assertEqual(bulkhead.info()['active'], 1)
+
+    def test_send__busy_and_slot_released(self):
+        # setup
+        bulkhead = Bulkhead('test', max_concurrent=1, max_queue=0)
+        options = RequestOptions(bulkhead=bulkhead)
+        session = Mock()
+        session.request.return_value = Mock(status_code=204)
+
+        # do it
+        bulkhead.acquire()
+        busy = APIBase._send(session, 'POST', 'http://localhost/prompts/x/apply', {}, options=options)
+        bulkhead.release()
+        result = APIBase._send(session, 'POST', 'http://localhost/prompts/x/apply', {}, options=options)
+
+        # postcondition
+        self.assertTrue(busy['busy'])
+        self.assertEqual(result, {})
+        self.assertEqual(bulkhead.info()['active'], 0)
+        session.request.assert_called_once()
+
+
+class TestApplyBulkhead(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    def test_get_bulkhead__only_for_apply(self):
+        # setup
+        api.portal.set_registry_record('bulkhead_apply_max_concurrent', 2, interface=IAIAssistantSchema)
+
+        # do it & postcondition
+        self.assertIs(APIBase._get_bulkhead('apply'), apply_bulkhead)
+        self.assertEqual(apply_bulkhead.max_concurrent, 2)
+        self.assertIsNone(APIBase._get_bulkhead('list'))
+
+    def test_get_bulkhead__disabled(self):
+        # setup
+        api.portal.set_registry_record('bulkhead_apply_max_concurrent', 0, interface=IAIAssistantSchema)
+
+        # do it & postcondition
+        self.assertIsNone(APIBase._get_bulkhead('apply'))
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_apply__busy_while_slots_taken(self, mock_request, mock_get_token):
+        # setup
+        api.portal.set_registry_record('bulkhead_apply_max_concurrent', 1, interface=IAIAssistantSchema)
+        api.portal.set_registry_record('bulkhead_apply_max_queue', 0, interface=IAIAssistantSchema)
+        mock_get_token.return_value = 'test-token'
+        kyra = KyraAPI()
+        kyra.prompts._get_request_options('apply', 'apply')
+        apply_bulkhead.acquire()
+
+        # do it
+        try:
+            result = kyra.prompts.apply('test-prompt', {'text': 'Text', 'query': 'Query'})
+        finally:
+            apply_bulkhead.release()
+
+        # postcondition
+        self.assertEqual(result, {'error': 'Assistant busy - please try again in a moment', 'busy': True})
+        mock_request.assert_not_called()
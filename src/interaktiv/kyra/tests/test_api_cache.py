@@ -0,0 +1,321 @@
+import dataclasses
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import plone.api as api
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.breaker import CLOSED
+from interaktiv.kyra.api.breaker import CircuitBreaker
+from interaktiv.kyra.api.cache import GENERATION_KEY
+from interaktiv.kyra.api.cache import ResponseCache
+from interaktiv.kyra.api.cache import broadcast_invalidation
+from interaktiv.kyra.api.cache import prompt_cache
+from interaktiv.kyra.api.coalesce import single_flight
+from interaktiv.kyra.controlpanels.ai_assistant import AIAssistantSettingsControlPanelForm
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from plone.app.testing import TEST_USER_ID, setRoles
+from zope.annotation.interfaces import IAnnotations
+
+URL = 'http://localhost/prompts'
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_get__fresh_and_stale(self):
+        # setup
+        cache = ResponseCache('test', ttl=0.05)
+        cache.set('key', {'id': 'test-1'}, 10, {})
+
+        # do it & postcondition
+        self.assertTrue(cache.get('key').fresh)
+        time.sleep(0.06)
+        self.assertFalse(cache.get('key').fresh)
+        self.assertEqual(cache.info()['hits'], 1)
+        self.assertEqual(cache.info()['misses'], 1)
+
+    def test_set__evicts_least_recently_used(self):
+        # setup
+        cache = ResponseCache('test', max_size=25)
+        cache.set('first', {}, 10, {})
+        cache.set('second', {}, 10, {})
+        cache.get('first')
+
+        # do it
+        cache.set('third', {}, 10, {})
+
+        # postcondition
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertEqual(cache.info()['size'], 20)
+
+    def test_set__skips_entries_larger_than_the_cache(self):
+        # setup
+        cache = ResponseCache('test', max_size=5)
+
+        # do it
+        cache.set('key', {}, 10, {})
+
+        # postcondition
+        self.assertIsNone(cache.get('key'))
+
+    def test_set__keeps_a_copy(self):
+        # setup
+        cache = ResponseCache('test')
+        data = {'prompts': [{'id': 'test-1'}]}
+
+        # do it
+        cache.set('key', data, 10, {'ETag': '"v1"'})
+        data['prompts'].clear()
+
+        # postcondition
+        self.assertEqual(cache.get('key').data, {'prompts': [{'id': 'test-1'}]})
+        self.assertEqual(cache.get('key').get_validators(), {'If-None-Match': '"v1"'})
+
+
+class TestSendCache(unittest.TestCase):
+
+    def setUp(self):
+        single_flight.clear()
+        self.cache = ResponseCache('test', ttl=60)
+        self.options = RequestOptions(operation='list', cache=self.cache)
+        self.headers = {'x-domain-id': 'plone'}
+        self.session = Mock()
+
+    def _send(self, page=1):
+        return APIBase._send(self.session, 'GET', URL, self.headers, options=self.options, params={'page': page})
+
+    def test_send__fresh_entry_is_served_from_the_cache(self):
+        # setup
+        self.session.request.return_value = create_response({'prompts': [{'id': 'test-1'}]})
+
+        # do it
+        first = self._send()
+        second = self._send()
+        other_page = self._send(page=2)
+
+        # postcondition
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(other_page, first)
+
+    def test_send__stale_entry_is_revalidated(self):
+        # setup
+        self.session.request.return_value = create_response(
+            {'prompts': [{'id': 'test-1'}]},
+            headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 15 Jan 2025 10:30:00 GMT'}
+        )
+        self._send()
+        self.cache.get(APIBase._get_request_key('GET', URL, self.headers, {'params': {'page': 1}})).expires_at = 0
+        self.session.request.return_value = create_response(status_code=304)
+
+        # do it
+        result = self._send()
+
+        # postcondition
+        headers = self.session.request.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Wed, 15 Jan 2025 10:30:00 GMT')
+        self.assertEqual(result, {'prompts': [{'id': 'test-1'}]})
+        self.assertEqual(self.cache.info()['revalidated'], 1)
+
+    def test_send__evicted_entry_is_fetched_again(self):
+        # setup
+        self.session.request.return_value = create_response({'prompts': [{'id': 'test-1'}]}, headers={'ETag': '"v1"'})
+        self._send()
+        self.cache.get(APIBase._get_request_key('GET', URL, self.headers, {'params': {'page': 1}})).expires_at = 0
+
+        def respond(method, url, headers, **kwargs):
+            if 'If-None-Match' in headers:
+                self.cache.clear()
+                return create_response(status_code=304)
+            return create_response({'prompts': [{'id': 'test-2'}]}, headers={'ETag': '"v2"'})
+
+        self.session.request.side_effect = respond
+
+        # do it
+        result = self._send()
+
+        # postcondition
+        self.assertEqual(result, {'prompts': [{'id': 'test-2'}]})
+        self.assertEqual(self.session.request.call_count, 3)
+        self.assertNotIn('If-None-Match', self.session.request.call_args.kwargs['headers'])
+
+    def test_send__evicted_entry_is_fetched_again_in_half_open_state(self):
+        # setup
+        self.session.request.return_value = create_response({'prompts': [{'id': 'test-1'}]}, headers={'ETag': '"v1"'})
+        self._send()
+        self.cache.get(APIBase._get_request_key('GET', URL, self.headers, {'params': {'page': 1}})).expires_at = 0
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+        breaker.record(False)
+        self.options = dataclasses.replace(self.options, breaker=breaker)
+
+        def respond(method, url, headers, **kwargs):
+            if 'If-None-Match' in headers:
+                self.cache.clear()
+                return create_response(status_code=304)
+            return create_response({'prompts': [{'id': 'test-2'}]}, headers={'ETag': '"v2"'})
+
+        self.session.request.side_effect = respond
+
+        # do it
+        result = self._send()
+
+        # postcondition
+        self.assertEqual(result, {'prompts': [{'id': 'test-2'}]})
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.info()['rejected'], 0)
+
+    def test_send__errors_are_not_cached(self):
+        # setup
+        self.session.request.return_value = create_response({'error': 'Failed'}, status_code=500)
+
+        # do it
+        self._send()
+
+        # postcondition
+        self.assertEqual(self.cache.info()['entries'], 0)
+
+
+class TestPromptCache(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+
+    def test_get_cache__configured_from_settings(self):
+        # setup
+        api.portal.set_registry_record(name='prompt_cache_ttl', interface=IAIAssistantSchema, value=30)
+        api.portal.set_registry_record(name='prompt_cache_max_size', interface=IAIAssistantSchema, value=2)
+
+        # do it
+        cache = APIBase()._get_cache()
+
+        # postcondition
+        self.assertIs(cache, prompt_cache)
+        self.assertEqual(cache.ttl, 30)
+        self.assertEqual(cache.max_size, 2 * 1024 * 1024)
+
+    def test_get_cache__disabled(self):
+        # setup
+        api.portal.set_registry_record(name='prompt_cache_ttl', interface=IAIAssistantSchema, value=0)
+
+        # do it & postcondition
+        self.assertIsNone(APIBase()._get_cache())
+
+    def test_controlpanel__flush_cache(self):
+        # setup
+        prompt_cache.set('key', {}, 10, {})
+        form = AIAssistantSettingsControlPanelForm(self.portal, self.request)
+        form.update()
+
+        # do it
+        form.handlers.getHandler(form.buttons['flush_cache'])(form, None)
+
+        # postcondition
+        self.assertEqual(prompt_cache.info()['entries'], 0)
+        self.assertEqual(IAnnotations(self.portal)[GENERATION_KEY](), 1)
+
+
+class TestPromptCacheInvalidation(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+        api.portal.set_registry_record(name='gateway_url', interface=IAIAssistantSchema, value=URL)
+        self.list_key = (URL, 'page=1&size=100', 'plone')
+        self.prompt_key = (f'{URL}/test-1', '', 'plone')
+        self.other_prompt_key = (f'{URL}/test-2', '', 'plone')
+        self.other_domain_key = (URL, 'page=1&size=100', 'other')
+        for key in (self.list_key, self.prompt_key, self.other_prompt_key, self.other_domain_key):
+            prompt_cache.set(key, {}, 10, {})
+
+    def _get_keys(self):
+        return {
+            key for key in (self.list_key, self.prompt_key, self.other_prompt_key, self.other_domain_key)
+            if prompt_cache.get(key) is not None
+        }
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_create__evicts_lists(self, mock_request):
+        # setup
+        mock_request.return_value = {'id': 'test-3'}
+
+        # do it
+        KyraAPI().prompts.create({'name': 'Test', 'prompt': 'Prompt'})
+
+        # postcondition
+        self.assertEqual(self._get_keys(), {self.prompt_key, self.other_prompt_key, self.other_domain_key})
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_update__evicts_lists_and_prompt(self, mock_request):
+        # setup
+        mock_request.return_value = {'id': 'test-1'}
+
+        # do it
+        KyraAPI().prompts.update('test-1', {'name': 'Test'})
+
+        # postcondition
+        self.assertEqual(self._get_keys(), {self.other_prompt_key, self.other_domain_key})
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_delete__evicts_lists_and_prompt(self, mock_request):
+        # setup
+        mock_request.return_value = {}
+
+        # do it
+        KyraAPI().prompts.delete('test-1')
+
+        # postcondition
+        self.assertEqual(self._get_keys(), {self.other_prompt_key, self.other_domain_key})
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_update__broadcasts_invalidation(self, mock_request):
+        # setup
+        mock_request.return_value = {'id': 'test-1'}
+
+        # do it
+        KyraAPI().prompts.update('test-1', {'name': 'Test'})
+        KyraAPI().prompts.delete('test-1')
+
+        # postcondition
+        self.assertEqual(IAnnotations(self.portal)[GENERATION_KEY](), 2)
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_update__error_keeps_cache(self, mock_request):
+        # setup
+        mock_request.return_value = {'error': 'API Error'}
+
+        # do it
+        KyraAPI().prompts.update('test-1', {'name': 'Test'})
+
+        # postcondition
+        self.assertEqual(len(self._get_keys()), 4)
+        self.assertIsNone(IAnnotations(self.portal).get(GENERATION_KEY))
+
+    def test_get_cache__drops_entries_invalidated_by_other_process(self):
+        # setup
+        APIBase()._get_cache()
+        broadcast_invalidation()
+
+        # do it
+        APIBase()._get_cache()
+
+        # postcondition
+        self.assertEqual(self._get_keys(), {self.other_domain_key})
+
+    def test_get_cache__keeps_entries_without_invalidation(self):
+        # do it
+        APIBase()._get_cache()
+        APIBase()._get_cache()
+
+        # postcondition
+        self.assertEqual(len(self._get_keys()), 4)
@@ -0,0 +1,197 @@
+import base64
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import plone.api as api
+import requests
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.cache import prompt_cache
+from interaktiv.kyra.api.cassette import Cassette
+from interaktiv.kyra.api.cassette import CassetteAdapter
+from interaktiv.kyra.api.cassette import CassetteError
+from interaktiv.kyra.api.cassette import use_cassette
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(0.05)
+        self._respond({'path': self.path})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path.endswith('/token'):
+            self._respond({'access_token': 'test-token', 'refresh_token': 'test-refresh-token', 'expires_in': 300})
+        else:
+            self._respond({'path': self.path, 'echo': json.loads(body)})
+
+    def _respond(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCassette(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        server_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        for name, value in (
+                ('gateway_url', f'{server_url}/api/prompts'),
+                ('keycloak_realms_url', f'{server_url}/realms/kyra'),
+                ('keycloak_client_id', 'test_client_id'),
+                ('keycloak_client_secret', 'test_client_secret'),
+        ):
+            api.portal.set_registry_record(name=name, interface=IAIAssistantSchema, value=value)
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.remove(self.path)
+
+    def _record(self):
+        with use_cassette(self.path, mode='record'):
+            listed = KyraAPI().prompts.list(page=2, size=10)
+            applied = KyraAPI().prompts.apply('test-prompt', {'text': 'Text', 'query': 'Query'})
+        # Replay must reach the transport, not the prompt cache
+        prompt_cache.clear()
+        return listed, applied
+
+    def test_record__writes_interactions(self):
+        # do it
+        self._record()
+
+        # postcondition
+        with open(self.path) as f:
+            data = json.load(f)
+        self.assertEqual(data['version'], 1)
+        self.assertEqual(
+            [(i['request']['method'], i['request']['url']) for i in data['interactions']],
+            [
+                ('POST', f'{KyraAPI().prompts.realms_url}/protocol/openid-connect/token'),
+                ('GET', f'{KyraAPI().prompts.gateway_url}?page=2&size=10'),
+                ('POST', f'{KyraAPI().prompts.gateway_url}/test-prompt/apply'),
+            ]
+        )
+        self.assertGreaterEqual(data['interactions'][1]['latency'], 0.05)
+        self.assertNotIn('test_client_secret', json.dumps(data))
+
+    def test_record__replaces_tokens(self):
+        # do it
+        self._record()
+
+        # postcondition
+        with open(self.path) as f:
+            interactions = json.load(f)['interactions']
+        bodies = [base64.b64decode(i['response']['body_base64']).decode() for i in interactions]
+        self.assertEqual(
+            json.loads(bodies[0]),
+            {'access_token': 'recorded-access_token', 'refresh_token': 'recorded-refresh_token', 'expires_in': 300}
+        )
+        self.assertFalse([body for body in bodies if 'test-token' in body or 'test-refresh-token' in body])
+
+    def test_replay__without_gateway(self):
+        # setup
+        listed, applied = self._record()
+        self.server.shutdown()
+        self.server.server_close()
+
+        # do it
+        with use_cassette(self.path, latency_scale=0):
+            replayed_list = KyraAPI().prompts.list(size=10, page=2)
+            replayed_apply = KyraAPI().prompts.apply('test-prompt', {'text': 'Text', 'query': 'Query'})
+            unknown = KyraAPI().prompts.get('unknown')
+
+        # postcondition
+        self.assertEqual(replayed_list, listed)
+        self.assertEqual(replayed_apply, applied)
+        self.assertIn('No recorded interaction', unknown['error'])
+
+    def test_replay__scales_latency(self):
+        # setup
+        self._record()
+
+        # do it
+        with use_cassette(self.path, latency_scale=4):
+            started = time.monotonic()
+            KyraAPI().prompts.list(page=2, size=10)
+            duration = time.monotonic() - started
+
+        # postcondition
+        self.assertGreaterEqual(duration, 0.2)
+
+
+class TestCassetteAdapter(unittest.TestCase):
+
+    def _create_session(self, interactions, latency_scale=1.0):
+        cassette = Cassette('unused.json')
+        cassette.interactions = interactions
+        session = requests.Session()
+        session.mount('http://', CassetteAdapter(cassette, latency_scale=latency_scale))
+        return session
+
+    @staticmethod
+    def _create_interaction(body, latency=0.0, body_sha256=''):
+        return {
+            'request': {'method': 'GET', 'url': 'http://gateway/prompts', 'body_sha256': body_sha256},
+            'response': {
+                'status': 200,
+                'reason': 'OK',
+                'headers': {'Content-Type': 'application/json'},
+                'body_base64': base64.b64encode(body).decode(),
+            },
+            'latency': latency,
+        }
+
+    def test_replay__cycles_through_repeated_requests(self):
+        # setup
+        session = self._create_session([
+            self._create_interaction(b'{"n": 1}'),
+            self._create_interaction(b'{"n": 2}'),
+        ])
+
+        # do it
+        results = [session.get('http://gateway/prompts').json()['n'] for _ in range(3)]
+
+        # postcondition
+        self.assertEqual(results, [1, 2, 1])
+
+    def test_replay__latency_above_read_timeout(self):
+        # setup
+        session = self._create_session([self._create_interaction(b'{}', latency=10.0)], latency_scale=0.1)
+
+        # do it / postcondition
+        with self.assertRaises(requests.ReadTimeout):
+            session.get('http://gateway/prompts', timeout=(1.0, 0.05))
+
+    def test_replay__unknown_request(self):
+        # setup
+        session = self._create_session([])
+
+        # do it / postcondition
+        with self.assertRaises(CassetteError):
+            session.get('http://gateway/prompts')
@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch
+
+import plone.api as api
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.catalog import PromptCatalog
+from interaktiv.kyra.api.catalog import normalize
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+PROMPTS = [
+    {
+        'id': 'summarize',
+        'name': 'Summarize',
+        'description': 'Short summary of the selected text',
+        'metadata': {'categories': ['Writing'], 'action': 'replace'},
+    },
+    {
+        'id': 'translate',
+        'name': 'Übersetzen',
+        'description': 'Translate the text to English',
+        'metadata': {'categories': ['Language', 'Writing'], 'action': 'replace'},
+    },
+    {
+        'id': 'continue',
+        'name': 'Continue text',
+        'description': 'Write the next paragraph',
+        'metadata': {'categories': ['Writing'], 'action': 'append'},
+    },
+    {'id': 'bare', 'name': 'Bare prompt', 'metadata': None},
+]
+
+
+def get_ids(prompts):
+    return [prompt['id'] for prompt in prompts]
+
+
+class TestPromptCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = PromptCatalog(PROMPTS)
+
+    def test_normalize(self):
+        # do it & postcondition
+        self.assertEqual(normalize('Übersetzen'), 'ubersetzen')
+
+    def test_search__no_filters_returns_all(self):
+        # do it & postcondition
+        self.assertEqual(get_ids(self.catalog.search()), ['summarize', 'translate', 'continue', 'bare'])
+
+    def test_search__category(self):
+        # do it & postcondition
+        self.assertEqual(get_ids(self.catalog.search(category='writing')), ['summarize', 'translate', 'continue'])
+        self.assertEqual(get_ids(self.catalog.search(category='Language')), ['translate'])
+        self.assertEqual(self.catalog.search(category='Unknown'), [])
+
+    def test_search__action(self):
+        # do it & postcondition
+        self.assertEqual(get_ids(self.catalog.search(action='append')), ['continue'])
+
+    def test_search__query_matches_word_prefixes(self):
+        # do it & postcondition
+        self.assertEqual(get_ids(self.catalog.search(query='text')), ['summarize', 'translate', 'continue'])
+        self.assertEqual(get_ids(self.catalog.search(query='uber')), ['translate'])
+        self.assertEqual(get_ids(self.catalog.search(query='TRANS eng')), ['translate'])
+        self.assertEqual(self.catalog.search(query='ext'), [])
+
+    def test_search__filters_are_combined(self):
+        # do it & postcondition
+        self.assertEqual(get_ids(self.catalog.search(category='writing', action='replace', query='sum')), ['summarize'])
+
+    def test_get_categories(self):
+        # do it & postcondition
+        self.assertEqual(self.catalog.get_categories(), ['language', 'writing'])
+
+
+class TestPromptCatalogService(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+        api.portal.set_registry_record(
+            name='gateway_url', interface=IAIAssistantSchema, value='http://localhost:8080/api/prompts'
+        )
+
+    def _reply(self, query_string):
+        from Products.Five import BrowserView
+        from interaktiv.kyra.services.prompts import PromptsGet
+        service_class = type('PromptsGet', (PromptsGet, BrowserView), {})
+        self.request.set('QUERY_STRING', query_string)
+        return service_class(self.portal, self.request).reply()
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_service__filters_from_catalog(self, mock_iter_all):
+        # setup
+        mock_iter_all.side_effect = lambda size: iter(PROMPTS)
+
+        # do it
+        by_category = self._reply('category=Language')
+        by_action = self._reply('action=append')
+        by_query = self._reply('q=summ&page=1')
+
+        # postcondition
+        self.assertEqual(get_ids(by_category['prompts']), ['translate'])
+        self.assertEqual(by_category['total'], 1)
+        self.assertEqual(get_ids(by_action['prompts']), ['continue'])
+        self.assertEqual(get_ids(by_query['prompts']), ['summarize'])
+        mock_iter_all.assert_called_once_with(100)
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_get_catalog__rebuilt_after_update(self, mock_iter_all, mock_request):
+        # setup
+        mock_iter_all.side_effect = lambda size: iter(PROMPTS)
+        mock_request.return_value = {'id': 'summarize'}
+        kyra = KyraAPI()
+        kyra.prompts.get_catalog()
+
+        # do it
+        kyra.prompts.update('summarize', {'name': 'Summary'})
+        kyra.prompts.get_catalog()
+
+        # postcondition
+        self.assertEqual(mock_iter_all.call_count, 2)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_get_catalog__not_kept_with_cache_disabled(self, mock_iter_all):
+        # setup
+        api.portal.set_registry_record(name='prompt_cache_ttl', interface=IAIAssistantSchema, value=0)
+        mock_iter_all.side_effect = lambda size: iter(PROMPTS)
+
+        # do it
+        KyraAPI().prompts.get_catalog()
+        KyraAPI().prompts.get_catalog()
+
+        # postcondition
+        self.assertEqual(mock_iter_all.call_count, 2)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.list')
+    def test_service__error(self, mock_list):
+        # setup
+        mock_list.return_value = {'error': 'API Error'}
+
+        # do it & postcondition
+        self.assertEqual(self._reply('category=Writing'), {'error': 'API Error'})
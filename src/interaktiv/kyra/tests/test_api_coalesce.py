@@ -0,0 +1,126 @@
+import threading
+import unittest
+from unittest.mock import Mock
+
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.coalesce import SingleFlight
+from interaktiv.kyra.api.coalesce import single_flight
+from interaktiv.kyra.testing import create_response
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+
+    def test_do__coalesces_concurrent_calls(self):
+        # setup
+        release = threading.Event()
+        entered = threading.Event()
+        calls = []
+
+        def call():
+            calls.append(1)
+            entered.set()
+            release.wait(5)
+            return {'prompts': []}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.flight.do('key', call))) for _ in range(3)]
+
+        # do it
+        threads[0].start()
+        entered.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while self.flight.info()['coalesced'] < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        # postcondition
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'prompts': []}] * 3)
+        self.assertEqual(self.flight.info(), {'executed': 1, 'coalesced': 2, 'in_flight': 0})
+
+    def test_do__sequential_calls_run_again(self):
+        # do it
+        self.flight.do('key', lambda: 1)
+        self.flight.do('key', lambda: 2)
+
+        # postcondition
+        self.assertEqual(self.flight.info()['executed'], 2)
+        self.assertEqual(self.flight.info()['coalesced'], 0)
+
+    def test_do__error_is_raised(self):
+        # setup
+        def call():
+            raise ValueError('failed')
+
+        # do it & postcondition
+        with self.assertRaises(ValueError):
+            self.flight.do('key', call)
+        self.assertEqual(self.flight.info()['in_flight'], 0)
+
+
+class TestSendCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        single_flight.clear()
+        self.headers = {'x-domain-id': 'plone'}
+
+    def test_send__identical_gets_share_one_call(self):
+        # setup
+        release = threading.Event()
+        entered = threading.Event()
+        session = Mock()
+
+        def respond(method, url, **kwargs):
+            entered.set()
+            release.wait(5)
+            return create_response({'prompts': [{'id': 'test-1'}]})
+
+        session.request.side_effect = respond
+        results = []
+
+        def send():
+            results.append(APIBase._send(
+                session, 'GET', 'http://localhost/prompts', self.headers,
+                options=RequestOptions(), params={'page': ['1'], 'size': ['100']}
+            ))
+
+        threads = [threading.Thread(target=send) for _ in range(3)]
+
+        # do it
+        threads[0].start()
+        entered.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while single_flight.info()['coalesced'] < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        # postcondition
+        session.request.assert_called_once()
+        self.assertEqual(results, [{'prompts': [{'id': 'test-1'}]}] * 3)
+        self.assertIsNot(results[0], results[1])
+
+    def test_request_key__differs_by_params_and_domain(self):
+        # do it
+        key = APIBase._get_request_key('GET', 'http://localhost/prompts', self.headers, {'params': {'page': 1}})
+        other_page = APIBase._get_request_key('GET', 'http://localhost/prompts', self.headers, {'params': {'page': 2}})
+        other_domain = APIBase._get_request_key(
+            'GET', 'http://localhost/prompts', {'x-domain-id': 'other'}, {'params': {'page': 1}}
+        )
+
+        # postcondition
+        self.assertNotEqual(key, other_page)
+        self.assertNotEqual(key, other_domain)
+
+    def test_request_key__none_for_post(self):
+        # do it & postcondition
+        self.assertIsNone(APIBase._get_request_key('POST', 'http://localhost/prompts', self.headers, {}))
@@ -0,0 +1,147 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+import plone.api as api
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.codec import JSONCodec
+from interaktiv.kyra.api.codec import get_codec
+from interaktiv.kyra.api.codec import set_codec
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestJSONCodec(unittest.TestCase):
+
+    def test_roundtrip(self):
+        # setup
+        data = {'text': '<p>Grüße</p>', 'useContext': True}
+
+        # do it
+        result = get_codec().loads(get_codec().dumps(data))
+
+        # postcondition
+        self.assertEqual(result, data)
+
+    def test_set_codec(self):
+        # setup
+        previous = get_codec()
+        codec = JSONCodec()
+
+        # do it
+        set_codec(codec)
+        try:
+            current = get_codec()
+        finally:
+            set_codec(previous)
+
+        # postcondition
+        self.assertIs(current, codec)
+
+
+class TestEncodeBody(unittest.TestCase):
+
+    def setUp(self):
+        self.headers = {'Content-Type': 'application/json'}
+        self.payload = {'text': 'x' * 100}
+
+    def test_encode_body__compressed_above_threshold(self):
+        # setup
+        options = RequestOptions(compress_min_size=50)
+
+        # do it
+        headers, kwargs = APIBase._encode_body(self.headers, options, {'json': self.payload})
+
+        # postcondition
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('json', kwargs)
+        self.assertEqual(json.loads(gzip.decompress(kwargs['data'])), self.payload)
+        self.assertNotIn('Content-Encoding', self.headers)
+
+    def test_encode_body__plain_below_threshold(self):
+        # setup
+        options = RequestOptions(compress_min_size=1000)
+
+        # do it
+        headers, kwargs = APIBase._encode_body(self.headers, options, {'json': self.payload})
+
+        # postcondition
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(json.loads(kwargs['data']), self.payload)
+
+    def test_encode_body__disabled(self):
+        # do it
+        headers, kwargs = APIBase._encode_body(self.headers, RequestOptions(), {'json': self.payload})
+
+        # postcondition
+        self.assertNotIn('Content-Encoding', headers)
+
+    def test_encode_body__without_json(self):
+        # setup
+        kwargs = {'params': {'page': 1}}
+
+        # do it
+        headers, result = APIBase._encode_body(self.headers, RequestOptions(), kwargs)
+
+        # postcondition
+        self.assertIs(result, kwargs)
+
+
+class TestCompressedRequests(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_apply__large_payload_is_compressed(self, mock_request, mock_get_token):
+        # setup
+        api.portal.set_registry_record('compression_min_size', 4096, interface=IAIAssistantSchema)
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+        payload = {'text': '<p>Text</p>' * 1000, 'query': 'Summarize'}
+
+        # do it
+        KyraAPI().prompts.apply('test-prompt', payload)
+
+        # postcondition
+        call_kwargs = mock_request.call_args[1]
+        self.assertEqual(call_kwargs['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(call_kwargs['headers']['Accept-Encoding'], 'gzip,deflate')
+        self.assertEqual(json.loads(gzip.decompress(call_kwargs['data'])), payload)
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_apply__not_compressed_by_default(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+        payload = {'text': '<p>Text</p>' * 1000, 'query': 'Summarize'}
+
+        # do it
+        KyraAPI().prompts.apply('test-prompt', payload)
+
+        # postcondition
+        self.assertNotIn('Content-Encoding', mock_request.call_args[1]['headers'])
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_delete__never_compressed(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+
+        # do it
+        KyraAPI().prompts.delete('test-prompt')
+
+        # postcondition
+        self.assertNotIn('Content-Encoding', mock_request.call_args[1]['headers'])
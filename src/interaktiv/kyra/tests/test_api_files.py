@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import patch, Mock
 
@@ -52,8 +53,8 @@ class TestFiles(unittest.TestCase):
         mock_file.headers = {'content-type': content_type}
         return mock_file
 
-    @patch('interaktiv.kyra.api.base.requests.post')
-    @patch('interaktiv.kyra.api.base.requests.request')
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
     def test_get__success(self, mock_request, mock_post):
         # setup
         mock_token_response = Mock()
@@ -65,11 +66,11 @@ class TestFiles(unittest.TestCase):
         mock_files_response = Mock()
         mock_files_response.status_code = 200
         mock_files_response.headers = {'content-type': 'application/json'}
-        mock_files_response.json.return_value = {
+        mock_files_response.content = json.dumps({
             'files': [
                 {'id': 'file-1', 'filename': 'test.txt', 'size': 1024}
             ]
-        }
+        }).encode()
         mock_files_response.raise_for_status = Mock()
         mock_request.return_value = mock_files_response
 
@@ -89,8 +90,8 @@ class TestFiles(unittest.TestCase):
         self.assertIn(prompt_id, call_args[0][1])  # URL contains prompt_id
         self.assertIn('files', call_args[0][1])  # URL contains 'files'
 
-    @patch('interaktiv.kyra.api.base.requests.post')
-    @patch('interaktiv.kyra.api.base.requests.request')
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
     def test_upload__success_single_file(self, mock_request, mock_post):
         # setup
         mock_token_response = Mock()
@@ -102,9 +103,9 @@ class TestFiles(unittest.TestCase):
         mock_upload_response = Mock()
         mock_upload_response.status_code = 201
         mock_upload_response.headers = {'content-type': 'application/json'}
-        mock_upload_response.json.return_value = [
+        mock_upload_response.content = json.dumps([
             {'id': 'file-1', 'filename': 'test.txt'}
-        ]
+        ]).encode()
         mock_upload_response.raise_for_status = Mock()
         mock_request.return_value = mock_upload_response
 
@@ -124,8 +125,8 @@ class TestFiles(unittest.TestCase):
         call_kwargs = mock_request.call_args[1]
         self.assertIn('files', call_kwargs)
 
-    @patch('interaktiv.kyra.api.base.requests.post')
-    @patch('interaktiv.kyra.api.base.requests.request')
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
     def test_upload__success_multiple_files(self, mock_request, mock_post):
         # setup
         mock_token_response = Mock()
@@ -137,10 +138,10 @@ class TestFiles(unittest.TestCase):
         mock_upload_response = Mock()
         mock_upload_response.status_code = 201
         mock_upload_response.headers = {'content-type': 'application/json'}
-        mock_upload_response.json.return_value = [
+        mock_upload_response.content = json.dumps([
             {'id': 'file-1', 'filename': 'test1.txt'},
             {'id': 'file-2', 'filename': 'test2.txt'}
-        ]
+        ]).encode()
         mock_upload_response.raise_for_status = Mock()
         mock_request.return_value = mock_upload_response
 
@@ -156,8 +157,8 @@ class TestFiles(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 2)
 
-    @patch('interaktiv.kyra.api.base.requests.post')
-    @patch('interaktiv.kyra.api.base.requests.request')
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
     def test_download__success(self, mock_request, mock_post):
         # setup
         mock_token_response = Mock()
@@ -183,8 +184,8 @@ class TestFiles(unittest.TestCase):
         self.assertIsInstance(result, dict)
         self.assertEqual(result['content'], b'file content')
 
-    @patch('interaktiv.kyra.api.base.requests.post')
-    @patch('interaktiv.kyra.api.base.requests.request')
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
     def test_delete__success(self, mock_request, mock_post):
         # setup
         mock_token_response = Mock()
@@ -220,7 +221,7 @@ class TestFiles(unittest.TestCase):
 
         mock_file = self._create_mock_file('test.txt', b'test content')
 
-        with patch('interaktiv.kyra.api.base.requests.post') as mock_post:
+        with patch('interaktiv.kyra.api.base.requests.Session.post') as mock_post:
             mock_token_response = Mock()
             mock_token_response.json.return_value = {'access_token': 'test_token'}
             mock_token_response.raise_for_status = Mock()
@@ -245,7 +246,7 @@ class TestFiles(unittest.TestCase):
         mock_file1 = self._create_mock_file('test1.txt', b'content 1')
         mock_file2 = self._create_mock_file('test2.txt', b'content 2')
 
-        with patch('interaktiv.kyra.api.base.requests.post') as mock_post:
+        with patch('interaktiv.kyra.api.base.requests.Session.post') as mock_post:
             mock_token_response = Mock()
             mock_token_response.json.return_value = {'access_token': 'test_token'}
             mock_token_response.raise_for_status = Mock()
@@ -269,7 +270,7 @@ class TestFiles(unittest.TestCase):
         mock_file.read.return_value = b''
         mock_file.headers = {'content-type': 'text/plain'}
 
-        with patch('interaktiv.kyra.api.base.requests.post') as mock_post:
+        with patch('interaktiv.kyra.api.base.requests.Session.post') as mock_post:
             mock_token_response = Mock()
             mock_token_response.json.return_value = {'access_token': 'test_token'}
             mock_token_response.raise_for_status = Mock()
@@ -287,7 +288,7 @@ class TestFiles(unittest.TestCase):
         # setup
         mock_file = self._create_mock_file('test.txt', b'test content')
 
-        with patch('interaktiv.kyra.api.base.requests.post') as mock_post:
+        with patch('interaktiv.kyra.api.base.requests.Session.post') as mock_post:
             mock_token_response = Mock()
             mock_token_response.json.return_value = {'access_token': 'test_token'}
             mock_token_response.raise_for_status = Mock()
@@ -311,7 +312,7 @@ class TestFiles(unittest.TestCase):
         mock_file.read.return_value = b'test content'
         mock_file.headers = {'content-type': 'text/plain'}
 
-        with patch('interaktiv.kyra.api.base.requests.post') as mock_post:
+        with patch('interaktiv.kyra.api.base.requests.Session.post') as mock_post:
             mock_token_response = Mock()
             mock_token_response.json.return_value = {'access_token': 'test_token'}
             mock_token_response.raise_for_status = Mock()
@@ -332,7 +333,7 @@ class TestFiles(unittest.TestCase):
         mock_file.read.return_value = b''
         mock_file.headers = {'content-type': 'text/plain'}
 
-        with patch('interaktiv.kyra.api.base.requests.post') as mock_post:
+        with patch('interaktiv.kyra.api.base.requests.Session.post') as mock_post:
             mock_token_response = Mock()
             mock_token_response.json.return_value = {'access_token': 'test_token'}
             mock_token_response.raise_for_status = Mock()
@@ -0,0 +1,131 @@
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.metrics import Metrics
+from interaktiv.kyra.api.metrics import metrics
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from plone.app.testing import TEST_USER_ID, setRoles
+from zExceptions import Unauthorized
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_render__histogram(self):
+        # setup
+        self.metrics.observe_request('list', '200', 0.2)
+        self.metrics.observe_request('list', '200', 3.0)
+
+        # do it
+        text = self.metrics.render()
+
+        # postcondition
+        self.assertIn('# TYPE kyra_request_duration_seconds histogram', text)
+        self.assertIn('kyra_request_duration_seconds_bucket{operation="list",le="0.1"} 0', text)
+        self.assertIn('kyra_request_duration_seconds_bucket{operation="list",le="0.25"} 1', text)
+        self.assertIn('kyra_request_duration_seconds_bucket{operation="list",le="+Inf"} 2', text)
+        self.assertIn('kyra_request_duration_seconds_sum{operation="list"} 3.2', text)
+        self.assertIn('kyra_request_duration_seconds_count{operation="list"} 2', text)
+        self.assertIn('kyra_requests_total{operation="list",status="200"} 2', text)
+
+    def test_render__counters(self):
+        # setup
+        self.metrics.count_request('apply', 'busy')
+        self.metrics.count_retry('get')
+        self.metrics.count_token_refresh(True)
+        self.metrics.count_token_refresh(False)
+
+        # do it
+        text = self.metrics.render(['kyra_extra 1'])
+
+        # postcondition
+        self.assertIn('kyra_requests_total{operation="apply",status="busy"} 1', text)
+        self.assertIn('kyra_request_retries_total{operation="get"} 1', text)
+        self.assertIn('kyra_token_refreshes_total{result="failure"} 1', text)
+        self.assertIn('kyra_token_refreshes_total{result="success"} 1', text)
+        self.assertTrue(text.endswith('kyra_extra 1\n'))
+
+
+class TestSendMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.clear()
+
+    def test_send__records_status_and_bytes(self):
+        # setup
+        session = Mock()
+        session.request.return_value = create_response({'response': 'Result'}, request_body=b'{"text":"Text"}')
+        options = RequestOptions(operation='apply')
+
+        # do it
+        APIBase._send(session, 'POST', 'http://localhost/prompts/x/apply', {}, options=options)
+
+        # postcondition
+        text = metrics.render()
+        self.assertIn('kyra_requests_total{operation="apply",status="200"} 1', text)
+        self.assertIn('kyra_request_bytes_sent_total{operation="apply"} 15', text)
+        self.assertIn('kyra_response_bytes_received_total{operation="apply"} 22', text)
+
+    def test_send__records_timeout(self):
+        # setup
+        session = Mock()
+        session.request.side_effect = requests.ReadTimeout()
+
+        # do it
+        APIBase._send(session, 'GET', 'http://localhost/prompts', {}, options=RequestOptions(operation='list'))
+
+        # postcondition
+        self.assertIn('kyra_requests_total{operation="list",status="timeout"} 1', metrics.render())
+
+    @patch('interaktiv.kyra.api.base.requests.Session.post')
+    def test_fetch_token__records_refresh(self, mock_post):
+        # setup
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = {'access_token': 'token', 'expires_in': 300}
+        mock_post.return_value = mock_response
+
+        # do it
+        APIBase._fetch_token('http://localhost/realms/kyra', 'client', 'secret', (10, 10, 60), 1200)
+
+        # postcondition
+        text = metrics.render()
+        self.assertIn('kyra_token_refreshes_total{result="success"} 1', text)
+        self.assertIn('kyra_requests_total{operation="token",status="200"} 1', text)
+
+
+class TestMetricsView(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+
+    def test_view__renders_prometheus_text(self):
+        # setup
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+        metrics.observe_request('list', '200', 0.2)
+
+        # do it
+        view = self.portal.restrictedTraverse('@@kyra-metrics')
+        text = view()
+
+        # postcondition
+        self.assertIn('kyra_requests_total{operation="list",status="200"} 1', text)
+        self.assertIn('kyra_bulkhead_active 0', text)
+        self.assertTrue(self.request.response.getHeader('Content-Type').startswith('text/plain'))
+
+    def test_view__protected(self):
+        # setup
+        setRoles(self.portal, TEST_USER_ID, ['Member'])
+
+        # do it & postcondition
+        with self.assertRaises(Unauthorized):
+            self.portal.restrictedTraverse('@@kyra-metrics')
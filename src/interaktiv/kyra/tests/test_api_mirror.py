@@ -0,0 +1,242 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import plone.api as api
+import transaction
+from interaktiv.kyra.api import AsyncKyraAPI
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.mirror import get_mirror
+from interaktiv.kyra.api.prompts import PromptListError
+from interaktiv.kyra.controlpanels.prompt_edit import PromptEditView
+from interaktiv.kyra.controlpanels.prompt_manager import PromptManagerView
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from interaktiv.kyra.views.prompt_mirror import PromptMirrorSyncView
+from plone.app.testing import TEST_USER_ID, setRoles
+
+GATEWAY_URL = 'http://localhost:8080/api/prompts'
+
+
+def create_prompt(prompt_id, version=1, name='Prompt'):
+    return {
+        'id': prompt_id,
+        'name': name,
+        'description': '',
+        'prompt': 'Prompt text',
+        'metadata': {'categories': ['Writing'], 'action': 'replace'},
+        'updatedAt': f'2025-01-15T10:30:0{version}.000Z',
+        'version': version,
+    }
+
+
+class TestPromptMirror(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        self.mirror = get_mirror(GATEWAY_URL, 'plone', create=True)
+        self.mirror.sync([create_prompt('a'), create_prompt('b'), create_prompt('c')])
+
+    def test_sync__applies_changes_only(self):
+        # do it
+        changes = self.mirror.sync([create_prompt('c'), create_prompt('a', version=2), create_prompt('d')])
+
+        # postcondition
+        self.assertEqual(changes, {'added': 1, 'updated': 1, 'deleted': 1, 'unchanged': 1})
+        self.assertEqual([prompt['id'] for prompt in self.mirror.get_prompts()], ['c', 'a', 'd'])
+        self.assertEqual(self.mirror.get('a')['version'], 2)
+        self.assertIsNone(self.mirror.get('b'))
+        self.assertEqual(self.mirror.info()['watermark'], '2025-01-15T10:30:02.000Z')
+
+    def test_sync__failing_list_leaves_mirror_unchanged(self):
+        # setup
+        def prompts():
+            yield create_prompt('a')
+            raise PromptListError('API Error')
+
+        # do it
+        with self.assertRaises(PromptListError):
+            self.mirror.sync(prompts())
+
+        # postcondition
+        self.assertEqual([prompt['id'] for prompt in self.mirror.get_prompts()], ['a', 'b', 'c'])
+
+    def test_get__returns_copies(self):
+        # do it
+        self.mirror.get('a')['metadata']['action'] = 'append'
+
+        # postcondition
+        self.assertEqual(self.mirror.get('a')['metadata']['action'], 'replace')
+
+    def test_get_mirror__other_source(self):
+        # do it & postcondition
+        self.assertIsNone(get_mirror(GATEWAY_URL, 'other'))
+        self.assertEqual(get_mirror(GATEWAY_URL, 'other', create=True).get_prompts(), [])
+
+    def test_sync__committed(self):
+        # do it
+        transaction.commit()
+
+        # postcondition
+        self.assertEqual(len(get_mirror(GATEWAY_URL, 'plone').get_prompts()), 3)
+
+
+class TestPromptMirrorReads(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+        api.portal.set_registry_record(name='gateway_url', interface=IAIAssistantSchema, value=GATEWAY_URL)
+        api.portal.set_registry_record(name='prompt_mirror_enabled', interface=IAIAssistantSchema, value=True)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def _sync(self, mock_iter_all):
+        mock_iter_all.return_value = iter([create_prompt('a'), create_prompt('b')])
+        return KyraAPI().prompts.sync_mirror()
+
+    def test_get_mirror__not_synced(self):
+        # do it & postcondition
+        self.assertIsNone(KyraAPI().prompts.get_mirror())
+
+    def test_get_mirror__disabled(self):
+        # setup
+        self._sync()
+        api.portal.set_registry_record(name='prompt_mirror_enabled', interface=IAIAssistantSchema, value=False)
+
+        # do it & postcondition
+        self.assertIsNone(KyraAPI().prompts.get_mirror())
+
+    def test_sync_mirror(self):
+        # do it
+        result = self._sync()
+
+        # postcondition
+        self.assertEqual(result['changes'], {'added': 2, 'updated': 0, 'deleted': 0, 'unchanged': 0})
+        self.assertEqual(result['prompts'], 2)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_prompt_manager__reads_from_mirror(self, mock_iter_all):
+        # setup
+        self._sync()
+
+        # do it
+        prompts = PromptManagerView(self.portal, self.request).get_prompts()
+
+        # postcondition
+        self.assertEqual([prompt['id'] for prompt in prompts], ['a', 'b'])
+        self.assertEqual(prompts[0]['metadata']['action_translation'], 'trans_option_action_replace')
+        mock_iter_all.assert_not_called()
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.get')
+    def test_prompt_edit__reads_from_mirror(self, mock_get):
+        # setup
+        self._sync()
+        self.request.form['prompt_id'] = 'b'
+
+        # do it
+        prompt = PromptEditView(self.portal, self.request).get_prompt()
+
+        # postcondition
+        self.assertEqual(prompt['id'], 'b')
+        mock_get.assert_not_called()
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_catalog__built_from_mirror(self, mock_iter_all):
+        # setup
+        self._sync()
+
+        # do it
+        prompts = KyraAPI().prompts.get_catalog().search(category='writing')
+
+        # postcondition
+        self.assertEqual([prompt['id'] for prompt in prompts], ['a', 'b'])
+        mock_iter_all.assert_not_called()
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_update_and_delete__written_through(self, mock_request):
+        # setup
+        self._sync()
+        kyra = KyraAPI()
+
+        # do it
+        mock_request.return_value = create_prompt('a', version=2, name='Updated')
+        kyra.prompts.update('a', {'name': 'Updated'})
+        mock_request.return_value = {}
+        kyra.prompts.delete('b')
+
+        # postcondition
+        mirror = kyra.prompts.get_mirror()
+        self.assertEqual([prompt['name'] for prompt in mirror.get_prompts()], ['Updated'])
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_async_create_update_and_delete__written_through(self, mock_request, mock_get_token):
+        # setup
+        self._sync()
+        mock_get_token.return_value = 'test-token'
+        kyra = AsyncKyraAPI()
+
+        # do it
+        mock_request.return_value = create_response(create_prompt('c', name='Created'))
+        kyra.gather(kyra.prompts.create({'name': 'Created'}))
+        mock_request.return_value = create_response(create_prompt('a', version=2, name='Updated'))
+        kyra.gather(kyra.prompts.update('a', {'name': 'Updated'}))
+        mock_request.return_value = create_response(status_code=204)
+        kyra.gather(kyra.prompts.delete('b'))
+
+        # postcondition
+        mirror = KyraAPI().prompts.get_mirror()
+        self.assertEqual([prompt['name'] for prompt in mirror.get_prompts()], ['Updated', 'Created'])
+
+    @patch('interaktiv.kyra.api.base.APIBase.request')
+    def test_delete__error_not_written_through(self, mock_request):
+        # setup
+        self._sync()
+        mock_request.return_value = {'error': 'API Error'}
+
+        # do it
+        KyraAPI().prompts.delete('b')
+
+        # postcondition
+        self.assertEqual(len(KyraAPI().prompts.get_mirror().get_prompts()), 2)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_sync_view(self, mock_iter_all):
+        # setup
+        mock_iter_all.return_value = iter([create_prompt('a')])
+        self.request.method = 'POST'
+
+        # do it
+        result = json.loads(PromptMirrorSyncView(self.portal, self.request)())
+
+        # postcondition
+        self.assertEqual(result['prompt_mirror']['changes']['added'], 1)
+        self.assertEqual(result['prompt_mirror']['watermark'], '2025-01-15T10:30:01.000Z')
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.list')
+    def test_sync_view__error(self, mock_list):
+        # setup
+        mock_list.return_value = {'error': 'API Error'}
+        self.request.method = 'POST'
+
+        # do it
+        result = json.loads(PromptMirrorSyncView(self.portal, self.request)())
+
+        # postcondition
+        self.assertEqual(result, {'error': 'API Error'})
+        self.assertEqual(self.request.response.getStatus(), 502)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.sync_mirror')
+    def test_sync_view__get_not_allowed(self, mock_sync_mirror):
+        # do it
+        result = json.loads(PromptMirrorSyncView(self.portal, self.request)())
+
+        # postcondition
+        self.assertEqual(result, {'error': 'Method Not Allowed'})
+        self.assertEqual(self.request.response.getStatus(), 405)
+        self.assertEqual(self.request.response.getHeader('Allow'), 'POST')
+        mock_sync_mirror.assert_not_called()
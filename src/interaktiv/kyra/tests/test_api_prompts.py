@@ -1,9 +1,12 @@
+import json
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import plone.api as api
 from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
 from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.prompts import PromptListError
 from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
 from plone.app.testing import TEST_USER_ID, setRoles
 
@@ -62,6 +65,8 @@ class TestPromptsService(unittest.TestCase):
         mock_request.assert_called_once_with(
             'GET',
             'http://localhost:8080/api/prompts',
+            operation='list',
+            cache=True,
             params={'page': 1, 'size': 100}
         )
 
@@ -86,6 +91,8 @@ class TestPromptsService(unittest.TestCase):
         mock_request.assert_called_once_with(
             'GET',
             'http://localhost:8080/api/prompts',
+            operation='list',
+            cache=True,
             params={'page': 2, 'size': 5}
         )
 
@@ -113,7 +120,8 @@ class TestPromptsService(unittest.TestCase):
         
         mock_request.assert_called_once_with(
             'GET',
-            f'http://localhost:8080/api/prompts/{prompt_id}'
+            f'http://localhost:8080/api/prompts/{prompt_id}',
+            cache=True
         )
 
     @patch('interaktiv.kyra.api.base.APIBase._get_token')
@@ -144,6 +152,7 @@ class TestPromptsService(unittest.TestCase):
         mock_request.assert_called_once_with(
             'POST',
             'http://localhost:8080/api/prompts',
+            operation='create',
             json=payload
         )
 
@@ -178,6 +187,7 @@ class TestPromptsService(unittest.TestCase):
         mock_request.assert_called_once_with(
             'POST',
             'http://localhost:8080/api/prompts',
+            operation='create',
             json=payload
         )
 
@@ -210,6 +220,7 @@ class TestPromptsService(unittest.TestCase):
         mock_request.assert_called_once_with(
             'PATCH',
             f'http://localhost:8080/api/prompts/{prompt_id}',
+            operation='update',
             json=payload
         )
 
@@ -262,5 +273,116 @@ class TestPromptsService(unittest.TestCase):
         mock_request.assert_called_once_with(
             'POST',
             f'http://localhost:8080/api/prompts/{prompt_id}/apply',
+            endpoint='apply',
+            operation='apply',
             json=payload
         )
+
+
+def create_page(page, size, total):
+    response = Mock(status_code=200, headers={'content-type': 'application/json'})
+    prompts = [{'id': f'prompt-{i}'} for i in range((page - 1) * size, min(page * size, total))]
+    response.content = json.dumps({'prompts': prompts, 'total': total}).encode()
+    return response
+
+
+class TestPromptsIterAll(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+        api.portal.set_registry_record(
+            name='gateway_url', interface=IAIAssistantSchema, value='http://localhost:8080/api/prompts'
+        )
+        patcher = patch('interaktiv.kyra.api.base.APIBase._get_token', return_value='test-token')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_iter_all__fetches_all_pages(self, mock_request):
+        # setup
+        mock_request.side_effect = lambda method, url, **kwargs: create_page(kwargs['params']['page'], 2, 5)
+
+        # do it
+        prompts = list(KyraAPI().prompts.iter_all(size=2))
+
+        # postcondition
+        self.assertEqual([prompt['id'] for prompt in prompts], [f'prompt-{i}' for i in range(5)])
+        self.assertEqual([c.kwargs['params']['page'] for c in mock_request.call_args_list], [1, 2, 3])
+
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_iter_all__prefetches_next_page(self, mock_request):
+        # setup
+        requested = threading.Event()
+
+        def respond(method, url, **kwargs):
+            if kwargs['params']['page'] == 2:
+                requested.set()
+            return create_page(kwargs['params']['page'], 2, 4)
+
+        mock_request.side_effect = respond
+        prompts = KyraAPI().prompts.iter_all(size=2)
+
+        # do it
+        first = next(prompts)
+
+        # postcondition
+        self.assertEqual(first['id'], 'prompt-0')
+        self.assertTrue(requested.wait(5))
+        self.assertEqual(len(list(prompts)), 3)
+
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_iter_all__stops_on_next_marker(self, mock_request):
+        # setup
+        response = Mock(status_code=200, headers={'content-type': 'application/json'})
+        response.content = json.dumps({'prompts': [{'id': 'prompt-0'}, {'id': 'prompt-1'}], 'next': None}).encode()
+        mock_request.return_value = response
+
+        # do it
+        prompts = list(KyraAPI().prompts.iter_all(size=2))
+
+        # postcondition
+        self.assertEqual(len(prompts), 2)
+        mock_request.assert_called_once()
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.list')
+    def test_iter_all__error_raises(self, mock_list):
+        # setup
+        mock_list.return_value = {'error': 'API Error'}
+
+        # do it & postcondition
+        with self.assertRaises(PromptListError):
+            list(KyraAPI().prompts.iter_all())
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.iter_all')
+    def test_service__returns_all_prompts_without_page(self, mock_iter_all):
+        # setup
+        from Products.Five import BrowserView
+        from interaktiv.kyra.services.prompts import PromptsGet
+        service_class = type('PromptsGet', (PromptsGet, BrowserView), {})
+        mock_iter_all.return_value = iter([{'id': 'prompt-0'}, {'id': 'prompt-1'}])
+        self.request.set('QUERY_STRING', 'size=50')
+
+        # do it
+        result = service_class(self.portal, self.request).reply()
+
+        # postcondition
+        self.assertEqual(result, {'prompts': [{'id': 'prompt-0'}, {'id': 'prompt-1'}], 'total': 2})
+        mock_iter_all.assert_called_once_with(50)
+
+    @patch('interaktiv.kyra.api.prompts.Prompts.list')
+    def test_service__returns_requested_page(self, mock_list):
+        # setup
+        from Products.Five import BrowserView
+        from interaktiv.kyra.services.prompts import PromptsGet
+        service_class = type('PromptsGet', (PromptsGet, BrowserView), {})
+        mock_list.return_value = {'prompts': [], 'total': 0}
+        self.request.set('QUERY_STRING', 'page=2&size=20')
+
+        # do it
+        service_class(self.portal, self.request).reply()
+
+        # postcondition
+        mock_list.assert_called_once_with(2, 20)
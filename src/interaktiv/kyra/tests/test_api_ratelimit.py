@@ -0,0 +1,136 @@
+import time
+import unittest
+from unittest.mock import patch, Mock
+
+import plone.api as api
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.ratelimit import TokenBucket
+from interaktiv.kyra.api.ratelimit import rate_limiters
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_acquire__burst_then_reject(self):
+        # setup
+        bucket = TokenBucket('test', rate=0.1, burst=2)
+
+        # do it
+        results = [bucket.acquire() for _ in range(3)]
+
+        # postcondition
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(bucket.info()['rejected'], 1)
+
+    @patch('interaktiv.kyra.api.ratelimit.time.sleep')
+    def test_acquire__waits_within_timeout(self, mock_sleep):
+        # setup
+        bucket = TokenBucket('test', rate=2, burst=1)
+        bucket.acquire()
+
+        # do it
+        result = bucket.acquire(timeout=1)
+
+        # postcondition
+        self.assertTrue(result)
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.5, delta=0.05)
+        self.assertEqual(bucket.info()['waited'], 1)
+
+    @patch('interaktiv.kyra.api.ratelimit.time.monotonic')
+    def test_acquire__refills_over_time(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 1000.0
+        bucket = TokenBucket('test', rate=1, burst=1)
+        bucket.acquire()
+
+        # do it
+        rejected = bucket.acquire()
+        mock_monotonic.return_value = 1001.0
+        allowed = bucket.acquire()
+
+        # postcondition
+        self.assertFalse(rejected)
+        self.assertTrue(allowed)
+
+    def test_send__busy_when_limited(self):
+        # setup
+        session = Mock()
+        options = RequestOptions(rate_limiter=TokenBucket('test', rate=0.1, burst=1))
+        session.request.return_value = Mock(status_code=204)
+        APIBase._send(session, 'POST', 'http://localhost/prompts/x/apply', {}, options=options)
+
+        # do it
+        result = APIBase._send(session, 'POST', 'http://localhost/prompts/x/apply', {}, options=options)
+
+        # postcondition
+        self.assertEqual(result, {'error': 'Assistant busy - please try again in a moment', 'busy': True})
+        session.request.assert_called_once()
+
+    def test_send__wait_limited_by_deadline(self):
+        # setup
+        bucket = TokenBucket('test', rate=0.1, burst=1)
+        bucket.acquire()
+        options = RequestOptions(rate_limiter=bucket, rate_limit_wait=30, deadline=time.monotonic() + 1)
+
+        # do it
+        result = APIBase._send(Mock(), 'GET', 'http://localhost/prompts', {}, options=options)
+
+        # postcondition
+        self.assertTrue(result['busy'])
+
+
+class TestRateLimiterSettings(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    def test_rate_limiter__disabled_by_default(self):
+        # do it & postcondition
+        self.assertIsNone(KyraAPI().prompts._get_rate_limiter('apply'))
+
+    def test_rate_limiter__per_domain_and_operation_class(self):
+        # setup
+        api.portal.set_registry_record('rate_limit_apply', 1.0, interface=IAIAssistantSchema)
+        api.portal.set_registry_record('rate_limit_metadata', 5.0, interface=IAIAssistantSchema)
+        prompts = KyraAPI().prompts
+
+        # do it
+        apply_limiter = prompts._get_rate_limiter('apply')
+        list_limiter = prompts._get_rate_limiter('list')
+        get_limiter = prompts._get_rate_limiter('get')
+
+        # postcondition
+        self.assertEqual(apply_limiter.name, 'plone apply')
+        self.assertEqual((apply_limiter.rate, apply_limiter.burst), (1.0, 5))
+        self.assertEqual(list_limiter.name, 'plone metadata')
+        self.assertIs(list_limiter, get_limiter)
+        self.assertEqual(len(rate_limiters.info()), 2)
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_apply__busy_after_burst(self, mock_request, mock_get_token):
+        # setup
+        api.portal.set_registry_record('rate_limit_apply', 0.01, interface=IAIAssistantSchema)
+        api.portal.set_registry_record('rate_limit_apply_burst', 1, interface=IAIAssistantSchema)
+        api.portal.set_registry_record('rate_limit_max_wait', 0.0, interface=IAIAssistantSchema)
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+        payload = {'text': 'Text', 'query': 'Query'}
+
+        # do it
+        first = KyraAPI().prompts.apply('test-prompt', payload)
+        second = KyraAPI().prompts.apply('test-prompt', payload)
+
+        # postcondition
+        self.assertEqual(first, {})
+        self.assertTrue(second['busy'])
+        mock_request.assert_called_once()
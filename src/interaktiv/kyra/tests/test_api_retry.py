@@ -0,0 +1,183 @@
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.api.retry import RetryPolicy
+from interaktiv.kyra.api.retry import get_retry_after
+from interaktiv.kyra.api.retry import is_connect_error
+from interaktiv.kyra.testing import create_response
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import NewConnectionError
+
+
+def create_connect_error():
+    reason = NewConnectionError(None, 'Connection refused')
+    return requests.ConnectionError(MaxRetryError(None, '/', reason))
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff_base=0.5, backoff_max=5.0, deadline=60)
+
+    @patch('interaktiv.kyra.api.retry.time.monotonic')
+    def test_get_delay__retry_status_get(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 0.0
+
+        # do it
+        delay = self.policy.get_delay('GET', 1, 0.0, response=create_response(status_code=503))
+
+        # postcondition
+        self.assertIsNotNone(delay)
+        self.assertTrue(0 <= delay <= 0.5)
+
+    def test_get_delay__success_status(self):
+        # do it
+        delay = self.policy.get_delay('GET', 1, 0.0, response=create_response(status_code=200))
+
+        # postcondition
+        self.assertIsNone(delay)
+
+    def test_get_delay__post_not_retried_on_status(self):
+        # do it
+        delay = self.policy.get_delay('POST', 1, 0.0, response=create_response(status_code=503))
+
+        # postcondition
+        self.assertIsNone(delay)
+
+    def test_get_delay__post_not_retried_on_timeout(self):
+        # do it
+        delay = self.policy.get_delay('POST', 1, 0.0, error=requests.ReadTimeout())
+
+        # postcondition
+        self.assertIsNone(delay)
+
+    @patch('interaktiv.kyra.api.retry.time.monotonic')
+    def test_get_delay__post_retried_on_connect_error(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 0.0
+
+        # do it
+        delay = self.policy.get_delay('POST', 1, 0.0, error=create_connect_error())
+
+        # postcondition
+        self.assertIsNotNone(delay)
+
+    def test_get_delay__max_attempts_reached(self):
+        # do it
+        delay = self.policy.get_delay('GET', 3, 0.0, response=create_response(status_code=503))
+
+        # postcondition
+        self.assertIsNone(delay)
+
+    @patch('interaktiv.kyra.api.retry.random.uniform')
+    @patch('interaktiv.kyra.api.retry.time.monotonic')
+    def test_get_delay__capped_exponential_backoff(self, mock_monotonic, mock_uniform):
+        # setup
+        mock_monotonic.return_value = 0.0
+        mock_uniform.side_effect = lambda low, high: high
+        policy = RetryPolicy(max_attempts=10, backoff_base=0.5, backoff_max=3.0, deadline=60)
+
+        response = create_response(status_code=503)
+
+        # do it
+        delays = [policy.get_delay('GET', attempt, 0.0, response=response) for attempt in range(1, 5)]
+
+        # postcondition
+        self.assertEqual(delays, [0.5, 1.0, 2.0, 3.0])
+
+    @patch('interaktiv.kyra.api.retry.time.monotonic')
+    def test_get_delay__honors_retry_after(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 0.0
+        response = create_response(status_code=429, headers={'Retry-After': '7'})
+
+        # do it
+        delay = self.policy.get_delay('GET', 1, 0.0, response=response)
+
+        # postcondition
+        self.assertEqual(delay, 7.0)
+
+    @patch('interaktiv.kyra.api.retry.time.monotonic')
+    def test_get_delay__retry_after_exceeds_deadline(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 50.0
+        response = create_response(status_code=429, headers={'Retry-After': '20'})
+
+        # do it
+        delay = self.policy.get_delay('GET', 1, 0.0, response=response)
+
+        # postcondition
+        self.assertIsNone(delay)
+
+    def test_get_retry_after__http_date(self):
+        # setup
+        response = create_response(status_code=503, headers={'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+
+        # do it
+        result = get_retry_after(response)
+
+        # postcondition
+        self.assertEqual(result, 0.0)
+
+    def test_get_retry_after__invalid(self):
+        # do it
+        result = get_retry_after(create_response(status_code=503, headers={'Retry-After': 'soon'}))
+
+        # postcondition
+        self.assertIsNone(result)
+
+    def test_is_connect_error(self):
+        self.assertTrue(is_connect_error(create_connect_error()))
+        self.assertTrue(is_connect_error(requests.ConnectTimeout()))
+        self.assertFalse(is_connect_error(requests.ConnectionError('Connection aborted')))
+        self.assertFalse(is_connect_error(requests.ReadTimeout()))
+
+
+class TestExchange(unittest.TestCase):
+
+    def setUp(self):
+        self.options = RequestOptions(
+            retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01, backoff_max=0.01, deadline=60)
+        )
+
+    @patch('interaktiv.kyra.api.base.time.sleep')
+    def test_exchange__retries_until_success(self, mock_sleep):
+        # setup
+        session = Mock()
+        session.request.side_effect = [create_response(status_code=503), create_response(status_code=200)]
+
+        # do it
+        response = APIBase._exchange(session, 'GET', 'http://localhost', {}, self.options)
+
+        # postcondition
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.request.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch('interaktiv.kyra.api.base.time.sleep')
+    def test_exchange__returns_last_response(self, mock_sleep):
+        # setup
+        session = Mock()
+        session.request.return_value = create_response(status_code=503)
+
+        # do it
+        response = APIBase._exchange(session, 'GET', 'http://localhost', {}, self.options)
+
+        # postcondition
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(session.request.call_count, 3)
+
+    @patch('interaktiv.kyra.api.base.time.sleep')
+    def test_exchange__raises_last_error(self, mock_sleep):
+        # setup
+        session = Mock()
+        session.request.side_effect = requests.ReadTimeout()
+
+        # do it & postcondition
+        with self.assertRaises(requests.ReadTimeout):
+            APIBase._exchange(session, 'POST', 'http://localhost', {}, self.options)
+        session.request.assert_called_once()
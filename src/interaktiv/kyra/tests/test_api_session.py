@@ -0,0 +1,82 @@
+import unittest
+from email.message import Message
+from unittest.mock import Mock, patch
+
+from interaktiv.kyra.api.session import SessionPool
+from requests.cookies import extract_cookies_to_jar
+
+
+class TestSessionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SessionPool()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_get__reuses_session(self):
+        # do it
+        session1 = self.pool.get(10, 10, 60)
+        session2 = self.pool.get(10, 10, 60)
+
+        # postcondition
+        self.assertIs(session1, session2)
+
+    def test_get__mounts_pooled_adapter(self):
+        # do it
+        session = self.pool.get(4, 8, 60)
+
+        # postcondition
+        adapter = session.get_adapter('https://gateway.example.com')
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 8)
+
+    def test_get__rebuilds_session_on_config_change(self):
+        # setup
+        session1 = self.pool.get(10, 10, 60)
+
+        # do it
+        session2 = self.pool.get(10, 20, 60)
+
+        # postcondition
+        self.assertIsNot(session1, session2)
+
+    @patch('interaktiv.kyra.api.session.time.monotonic')
+    def test_get__rebuilds_session_after_idle_timeout(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 1000.0
+        session1 = self.pool.get(10, 10, 60)
+
+        # do it
+        mock_monotonic.return_value = 1061.0
+        session2 = self.pool.get(10, 10, 60)
+
+        # postcondition
+        self.assertIsNot(session1, session2)
+
+    @patch('interaktiv.kyra.api.session.time.monotonic')
+    def test_get__no_idle_timeout(self, mock_monotonic):
+        # setup
+        mock_monotonic.return_value = 1000.0
+        session1 = self.pool.get(10, 10, 0)
+
+        # do it
+        mock_monotonic.return_value = 100000.0
+        session2 = self.pool.get(10, 10, 0)
+
+        # postcondition
+        self.assertIs(session1, session2)
+
+    def test_get__does_not_store_cookies(self):
+        # setup
+        session = self.pool.get(10, 10, 60)
+        request = Mock(url='https://gateway.example.com/api/prompts', headers={})
+        response = Mock()
+        response._original_response.msg = Message()
+        response._original_response.msg['Set-Cookie'] = 'route=node-1; Path=/'
+
+        # do it
+        extract_cookies_to_jar(session.cookies, request, response)
+
+        # postcondition
+        self.assertEqual(len(session.cookies), 0)
@@ -0,0 +1,126 @@
+import time
+import unittest
+from unittest.mock import patch, Mock
+
+import plone.api as api
+import requests
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.base import APIContext
+from interaktiv.kyra.api.base import RequestOptions
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestRequestOptionsTimeout(unittest.TestCase):
+
+    def test_get_timeout__without_deadline(self):
+        # setup
+        options = RequestOptions(timeout=(3.05, 120.0))
+
+        # do it & postcondition
+        self.assertEqual(options.get_timeout(), (3.05, 120.0))
+
+    def test_get_timeout__cut_to_deadline(self):
+        # setup
+        options = RequestOptions(timeout=(3.05, 120.0), deadline=time.monotonic() + 20)
+
+        # do it
+        connect, read = options.get_timeout()
+
+        # postcondition
+        self.assertEqual(connect, 3.05)
+        self.assertLessEqual(read, 20)
+        self.assertGreater(read, 19)
+
+    def test_get_timeout__earliest_deadline_wins(self):
+        # setup
+        options = RequestOptions(timeout=(3.05, 120.0), deadline=time.monotonic() + 20)
+
+        # do it
+        connect, read = options.get_timeout(time.monotonic() + 2)
+
+        # postcondition
+        self.assertLessEqual(connect, 2)
+        self.assertLessEqual(read, 2)
+
+    def test_get_timeout__deadline_exceeded(self):
+        # setup
+        options = RequestOptions(deadline=time.monotonic() - 1)
+
+        # do it & postcondition
+        with self.assertRaises(requests.Timeout):
+            options.get_timeout()
+
+    def test_send__deadline_exceeded_skips_request(self):
+        # setup
+        session = Mock()
+        options = RequestOptions(deadline=time.monotonic() - 1)
+
+        # do it
+        result = APIBase._send(session, 'GET', 'http://localhost/prompts', {}, options=options)
+
+        # postcondition
+        self.assertEqual(result, {'error': 'Request timeout - please try again'})
+        session.request.assert_not_called()
+
+    def test_context__budget_sets_deadline(self):
+        # do it
+        context = APIContext(budget=30)
+
+        # postcondition
+        self.assertAlmostEqual(context.deadline, time.monotonic() + 30, delta=1)
+        self.assertIsNone(APIContext().deadline)
+
+
+class TestOperationTimeouts(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    def test_get_timeout__from_registry(self):
+        # setup
+        api.portal.set_registry_record('timeout_apply_connect', 2.0, interface=IAIAssistantSchema)
+        api.portal.set_registry_record('timeout_apply_read', 180.0, interface=IAIAssistantSchema)
+
+        # do it & postcondition
+        self.assertEqual(APIBase._get_timeout('apply'), (2.0, 180.0))
+        self.assertEqual(APIBase._get_timeout('list'), (3.05, 10.0))
+
+    def test_get_timeout__unknown_operation_uses_get(self):
+        # do it & postcondition
+        self.assertEqual(APIBase._get_timeout('delete'), APIBase._get_timeout('get'))
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_apply__uses_apply_timeout(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+
+        # do it
+        KyraAPI().prompts.apply('test-prompt', {'text': 'Text', 'query': 'Query'})
+
+        # postcondition
+        self.assertEqual(mock_request.call_args[1]['timeout'], (3.05, 120.0))
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_list__capped_by_budget(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+
+        # do it
+        KyraAPI(budget=5).prompts.list()
+
+        # postcondition
+        connect, read = mock_request.call_args[1]['timeout']
+        self.assertEqual(connect, 3.05)
+        self.assertLessEqual(read, 5)
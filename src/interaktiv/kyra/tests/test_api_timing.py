@@ -0,0 +1,148 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import plone.api as api
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.session import SessionPool
+from interaktiv.kyra.api.timing import CallTimings
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from plone.app.testing import TEST_USER_ID, setRoles
+
+REQUEST_BODY = b'{"text": "Text", "query": "Query"}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = b'{"prompts": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCallTimings(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/prompts'
+        self.pool = SessionPool()
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_exchange__measures_connect_only_for_new_connections(self):
+        # setup
+        session = self.pool.get()
+        first, second = CallTimings(), CallTimings()
+
+        # do it
+        with first.exchange() as outcome:
+            outcome['response'] = session.get(self.url)
+        with second.exchange() as outcome:
+            outcome['response'] = session.get(self.url)
+
+        # postcondition
+        self.assertGreater(first.phases['connect'], 0)
+        self.assertEqual(second.phases['connect'], 0)
+        self.assertGreater(second.phases['ttfb'], 0)
+
+    def test_measure(self):
+        # setup
+        timings = CallTimings()
+
+        # do it
+        with timings.measure('decode'):
+            json.loads('{"prompts": []}')
+
+        # postcondition
+        self.assertGreater(timings.phases['decode'], 0)
+
+
+class TestSlowCallLog(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+        api.portal.set_registry_record(
+            name='gateway_url',
+            interface=IAIAssistantSchema,
+            value='http://localhost:8080/api/prompts'
+        )
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_request__logs_slow_call(self, mock_request, mock_get_token):
+        # setup
+        api.portal.set_registry_record('slow_call_threshold', 0.000001, interface=IAIAssistantSchema)
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = create_response({'response': 'Result'}, request_body=REQUEST_BODY)
+
+        # do it
+        with self.assertLogs('interaktiv.kyra.slow_calls', level='WARNING') as logs:
+            KyraAPI().prompts.apply('test-prompt', {'text': 'Text', 'query': 'Query'})
+
+        # postcondition
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['operation'], 'apply')
+        self.assertEqual(record['prompt_id'], 'test-prompt')
+        self.assertEqual(record['payload_size'], 34)
+        self.assertEqual(record['response_size'], 22)
+        self.assertEqual(
+            sorted(record['phases']),
+            ['connect', 'decode', 'download', 'settings', 'token', 'ttfb']
+        )
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_iter_all__logs_slow_prefetched_page(self, mock_request, mock_get_token):
+        # setup
+        api.portal.set_registry_record('slow_call_threshold', 0.000001, interface=IAIAssistantSchema)
+        mock_get_token.return_value = 'test-token'
+        mock_request.side_effect = lambda method, url, params, **kwargs: create_response(
+            {'prompts': [{'id': f'test-{params["page"]}'}], 'total': 2}
+        )
+
+        # do it
+        with self.assertLogs('interaktiv.kyra.slow_calls', level='WARNING') as logs:
+            list(KyraAPI().prompts.iter_all(size=1))
+
+        # postcondition
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual([record['operation'] for record in records], ['list', 'list'])
+        self.assertGreater(records[1]['phases']['ttfb'], 0)
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_request__fast_call_not_logged(self, mock_request, mock_get_token):
+        # setup
+        api.portal.set_registry_record('slow_call_threshold', 60.0, interface=IAIAssistantSchema)
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = create_response({'response': 'Result'}, request_body=REQUEST_BODY)
+
+        # do it
+        with patch('interaktiv.kyra.api.base.slow_call_logger') as mock_logger:
+            KyraAPI().prompts.get('test-prompt')
+
+        # postcondition
+        mock_logger.warning.assert_not_called()
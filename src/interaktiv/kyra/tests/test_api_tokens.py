@@ -0,0 +1,234 @@
+import base64
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch, Mock
+
+from interaktiv.kyra.api.tokens import TokenStore
+from interaktiv.kyra.api.tokens import get_jwt_expiration
+
+KEY = ('http://localhost:8080/realms/kyra', 'client_id')
+
+
+def create_jwt(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip('=')
+    return f'header.{payload}.signature'
+
+
+class TestTokenStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TokenStore(background_renewal=False)
+
+    def test_get__fetches_and_caches_token(self):
+        # setup
+        fetch = Mock(return_value=('token-1', 300))
+
+        # do it
+        token1 = self.store.get(KEY, fetch)
+        token2 = self.store.get(KEY, fetch)
+
+        # postcondition
+        self.assertEqual(token1, 'token-1')
+        self.assertEqual(token2, 'token-1')
+        fetch.assert_called_once()
+
+    def test_get__empty_token_not_cached(self):
+        # setup
+        fetch = Mock(return_value=('', 0))
+
+        # do it
+        self.store.get(KEY, fetch)
+        self.store.get(KEY, fetch)
+
+        # postcondition
+        self.assertEqual(fetch.call_count, 2)
+        self.assertIsNone(self.store.peek(KEY))
+
+    @patch('interaktiv.kyra.api.tokens.time.time')
+    def test_get__uses_token_lifetime_and_refresh_margin(self, mock_time):
+        # setup
+        mock_time.return_value = 1000.0
+
+        # do it
+        self.store.get(KEY, Mock(return_value=('token-1', 300)), refresh_margin=60)
+
+        # postcondition
+        entry = self.store.peek(KEY)
+        self.assertEqual(entry.refresh_at, 1240.0)
+        self.assertEqual(entry.expires_at, 1300.0)
+
+    @patch('interaktiv.kyra.api.tokens.time.time')
+    def test_get__refreshes_expired_token(self, mock_time):
+        # setup
+        mock_time.return_value = 1000.0
+        self.store.get(KEY, Mock(return_value=('old-token', 300)))
+
+        # do it
+        mock_time.return_value = 1301.0
+        result = self.store.get(KEY, Mock(return_value=('new-token', 300)))
+
+        # postcondition
+        self.assertEqual(result, 'new-token')
+
+    @patch('interaktiv.kyra.api.tokens.time.time')
+    def test_get__failed_refresh_keeps_unexpired_token(self, mock_time):
+        # setup
+        mock_time.return_value = 1000.0
+        self.store.get(KEY, Mock(return_value=('old-token', 300)))
+
+        # do it
+        mock_time.return_value = 1299.1
+        fetch = Mock(return_value=('', 0))
+        result = self.store.get(KEY, fetch)
+
+        # postcondition
+        self.assertEqual(result, 'old-token')
+        fetch.assert_called_once()
+        self.assertEqual(self.store.peek(KEY).token, 'old-token')
+
+    @patch('interaktiv.kyra.api.tokens.time.time')
+    def test_get__failed_refresh_after_expiry(self, mock_time):
+        # setup
+        mock_time.return_value = 1000.0
+        self.store.get(KEY, Mock(return_value=('old-token', 300)))
+
+        # do it
+        mock_time.return_value = 1301.0
+        result = self.store.get(KEY, Mock(return_value=('', 0)))
+
+        # postcondition
+        self.assertEqual(result, '')
+
+    @patch('interaktiv.kyra.api.tokens.time.time')
+    def test_get__uses_old_token_while_other_thread_refreshes(self, mock_time):
+        # setup
+        mock_time.return_value = 1000.0
+        self.store.get(KEY, Mock(return_value=('old-token', 300)))
+        mock_time.return_value = 1280.0
+
+        fetch_started = threading.Event()
+        release_fetch = threading.Event()
+
+        def slow_fetch():
+            fetch_started.set()
+            release_fetch.wait(5)
+            return 'new-token', 300
+
+        leader = threading.Thread(target=self.store.get, args=(KEY, slow_fetch))
+        leader.start()
+        fetch_started.wait(5)
+
+        # do it
+        fetch = Mock(return_value=('other-token', 300))
+        result = self.store.get(KEY, fetch)
+        release_fetch.set()
+        leader.join(5)
+
+        # postcondition
+        self.assertEqual(result, 'old-token')
+        fetch.assert_not_called()
+        self.assertEqual(self.store.peek(KEY).token, 'new-token')
+
+    def test_get__single_flight_without_token(self):
+        # setup
+        release_fetch = threading.Event()
+        fetch_calls = []
+
+        def slow_fetch():
+            fetch_calls.append(1)
+            release_fetch.wait(5)
+            return 'new-token', 300
+
+        results = []
+
+        def worker():
+            results.append(self.store.get(KEY, slow_fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+
+        # do it
+        for thread in threads:
+            thread.start()
+        release_fetch.set()
+        for thread in threads:
+            thread.join(5)
+
+        # postcondition
+        self.assertEqual(results, ['new-token'] * 5)
+        self.assertEqual(len(fetch_calls), 1)
+
+    def test_invalidate(self):
+        # setup
+        self.store.get(KEY, Mock(return_value=('token-1', 300)))
+
+        # do it
+        self.store.invalidate(KEY)
+
+        # postcondition
+        self.assertIsNone(self.store.peek(KEY))
+
+
+class TestTokenStoreRenewal(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TokenStore()
+
+    def tearDown(self):
+        self.store.stop()
+
+    def test_renewer__renews_used_token_before_expiry(self):
+        # setup
+        renewed = threading.Event()
+        tokens = iter(['token-1', 'token-2'])
+
+        def fetch():
+            token = next(tokens, 'token-3')
+            if token == 'token-2':
+                renewed.set()
+            return token, 0.4
+
+        # do it
+        self.store.get(KEY, fetch, refresh_margin=0.3)
+        self.store.get(KEY, fetch, refresh_margin=0.3)
+
+        # postcondition
+        self.assertTrue(renewed.wait(2))
+        time.sleep(0.05)
+        self.assertEqual(self.store.peek(KEY).token, 'token-2')
+
+    def test_renewer__skips_unused_token(self):
+        # setup
+        fetch = Mock(return_value=('token-1', 0.4))
+
+        # do it
+        self.store.get(KEY, fetch, refresh_margin=0.3)
+        time.sleep(0.5)
+
+        # postcondition
+        fetch.assert_called_once()
+
+
+class TestGetJwtExpiration(unittest.TestCase):
+
+    def test_get_jwt_expiration__exp_claim(self):
+        # do it
+        result = get_jwt_expiration(create_jwt({'exp': 1700000000}))
+
+        # postcondition
+        self.assertEqual(result, 1700000000.0)
+
+    def test_get_jwt_expiration__no_exp_claim(self):
+        # do it
+        result = get_jwt_expiration(create_jwt({'sub': 'client'}))
+
+        # postcondition
+        self.assertIsNone(result)
+
+    def test_get_jwt_expiration__not_a_jwt(self):
+        # do it
+        result = get_jwt_expiration('opaque-token')
+
+        # postcondition
+        self.assertIsNone(result)
@@ -0,0 +1,234 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.tracing import NOOP_SPAN
+from interaktiv.kyra.api.tracing import Tracer
+from interaktiv.kyra.api.tracing import get_traceparent
+from interaktiv.kyra.api.tracing import get_tracing_file
+from interaktiv.kyra.api.tracing import parse_traceparent
+from interaktiv.kyra.api.tracing import tracer
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from plone.app.testing import TEST_USER_ID, setRoles
+
+TRACEPARENT = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+
+
+def read_spans(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.tracer = Tracer()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_start_span__disabled_returns_noop(self):
+        # do it & postcondition
+        self.assertIs(self.tracer.start_span('test'), NOOP_SPAN)
+
+    def test_start_span__nested_spans_share_trace(self):
+        # setup
+        self.tracer.configure(self.path)
+
+        # do it
+        with self.tracer.start_span('outer') as outer:
+            with self.tracer.start_span('inner'):
+                traceparent = get_traceparent()
+
+        # postcondition
+        inner_span, outer_span = read_spans(self.path)
+        self.assertEqual(inner_span['traceId'], outer_span['traceId'])
+        self.assertEqual(inner_span['parentSpanId'], outer_span['spanId'])
+        self.assertEqual(outer_span['parentSpanId'], '')
+        self.assertEqual(traceparent, f'00-{inner_span["traceId"]}-{inner_span["spanId"]}-01')
+        self.assertGreaterEqual(outer_span['endTimeUnixNano'], outer_span['startTimeUnixNano'])
+        self.assertIsNone(get_traceparent())
+        self.assertEqual(outer.traceparent, f'00-{outer_span["traceId"]}-{outer_span["spanId"]}-01')
+
+    def test_start_span__continues_remote_trace(self):
+        # setup
+        self.tracer.configure(self.path)
+
+        # do it
+        with self.tracer.start_span('server', traceparent=TRACEPARENT):
+            pass
+
+        # postcondition
+        span = read_spans(self.path)[0]
+        self.assertEqual(span['traceId'], '4bf92f3577b34da6a3ce929d0e0e4736')
+        self.assertEqual(span['parentSpanId'], '00f067aa0ba902b7')
+
+    def test_start_span__records_exception(self):
+        # setup
+        self.tracer.configure(self.path)
+
+        # do it
+        with self.assertRaises(ValueError):
+            with self.tracer.start_span('failing'):
+                raise ValueError('broken')
+
+        # postcondition
+        span = read_spans(self.path)[0]
+        self.assertEqual(span['status'], {'code': 'STATUS_CODE_ERROR', 'message': 'ValueError: broken'})
+
+    def test_parse_traceparent(self):
+        self.assertEqual(parse_traceparent(TRACEPARENT), ('4bf92f3577b34da6a3ce929d0e0e4736', '00f067aa0ba902b7'))
+        self.assertIsNone(parse_traceparent('00-00000000000000000000000000000000-00f067aa0ba902b7-01'))
+        self.assertIsNone(parse_traceparent('invalid'))
+        self.assertIsNone(parse_traceparent(None))
+
+
+class TestGetTracingFile(unittest.TestCase):
+
+    @patch.dict(os.environ, {'KYRA_TRACING_FILE': '/tmp/spans.jsonl'})
+    def test_get_tracing_file__environment(self):
+        # do it & postcondition
+        self.assertEqual(get_tracing_file(), '/tmp/spans.jsonl')
+
+    @patch.dict(os.environ, clear=True)
+    @patch('interaktiv.kyra.api.tracing.getConfiguration')
+    def test_get_tracing_file__product_config(self, mock_get_configuration):
+        # setup
+        mock_get_configuration.return_value.product_config = {'interaktiv.kyra': {'tracing-file': '/tmp/spans.jsonl'}}
+
+        # do it & postcondition
+        self.assertEqual(get_tracing_file(), '/tmp/spans.jsonl')
+
+    @patch.dict(os.environ, clear=True)
+    @patch('interaktiv.kyra.api.tracing.getConfiguration')
+    def test_get_tracing_file__not_configured(self, mock_get_configuration):
+        # setup
+        mock_get_configuration.return_value.product_config = None
+
+        # do it & postcondition
+        self.assertEqual(get_tracing_file(), '')
+
+
+class TestRequestTracing(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        environ = patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop('KYRA_TRACING_FILE', None)
+
+    def tearDown(self):
+        tracer.configure(None)
+        os.remove(self.path)
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_request__disabled_sends_no_traceparent(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+
+        # do it
+        KyraAPI().prompts.delete('test-prompt')
+
+        # postcondition
+        self.assertNotIn('traceparent', mock_request.call_args[1]['headers'])
+        self.assertFalse(tracer.enabled)
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_request__sends_traceparent_and_records_span(self, mock_request, mock_get_token):
+        # setup
+        os.environ['KYRA_TRACING_FILE'] = self.path
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+
+        # do it
+        KyraAPI().prompts.list()
+
+        # postcondition
+        span = read_spans(self.path)[0]
+        self.assertEqual(span['name'], 'kyra list')
+        self.assertEqual(span['kind'], 'SPAN_KIND_CLIENT')
+        self.assertEqual(span['attributes']['http.request.method'], 'GET')
+        self.assertEqual(
+            mock_request.call_args[1]['headers']['traceparent'],
+            f'00-{span["traceId"]}-{span["spanId"]}-01'
+        )
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_iter_all__records_span_of_prefetched_page(self, mock_request, mock_get_token):
+        # setup
+        os.environ['KYRA_TRACING_FILE'] = self.path
+        tracer.configure(self.path)
+        mock_get_token.return_value = 'test-token'
+        mock_request.side_effect = lambda method, url, params, **kwargs: create_response(
+            {'prompts': [{'id': f'test-{params["page"]}'}], 'total': 2}
+        )
+
+        # do it
+        with tracer.start_span('outer') as outer:
+            list(KyraAPI().prompts.iter_all(size=1))
+
+        # postcondition
+        client_spans = [span for span in read_spans(self.path) if span['name'] == 'kyra list']
+        self.assertEqual(len(client_spans), 2)
+        self.assertEqual([span['parentSpanId'] for span in client_spans], [outer.span_id] * 2)
+        self.assertEqual(
+            mock_request.call_args[1]['headers']['traceparent'],
+            f'00-{outer.trace_id}-{client_spans[1]["spanId"]}-01'
+        )
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    def test_request__error_marks_span(self, mock_get_token):
+        # setup
+        os.environ['KYRA_TRACING_FILE'] = self.path
+        mock_get_token.return_value = ''
+
+        # do it
+        KyraAPI().prompts.list()
+
+        # postcondition
+        span = read_spans(self.path)[0]
+        self.assertEqual(span['status']['code'], 'STATUS_CODE_ERROR')
+        self.assertEqual(span['status']['message'], 'No headers available')
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_service__continues_incoming_trace(self, mock_request, mock_get_token):
+        # setup
+        from Products.Five import BrowserView
+        from interaktiv.kyra.services.prompts import PromptsGet
+        # plone:service mixes in BrowserView the same way
+        service_class = type('PromptsGet', (PromptsGet, BrowserView), {})
+        os.environ['KYRA_TRACING_FILE'] = self.path
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = Mock(status_code=204)
+        self.request.environ['HTTP_TRACEPARENT'] = TRACEPARENT
+        self.request.set('QUERY_STRING', '')
+
+        # do it
+        service_class(self.portal, self.request).render()
+
+        # postcondition
+        client_span, server_span = read_spans(self.path)
+        self.assertEqual(server_span['name'], 'PromptsGet.reply')
+        self.assertEqual(server_span['kind'], 'SPAN_KIND_SERVER')
+        self.assertEqual(server_span['traceId'], '4bf92f3577b34da6a3ce929d0e0e4736')
+        self.assertEqual(server_span['parentSpanId'], '00f067aa0ba902b7')
+        self.assertEqual(client_span['parentSpanId'], server_span['spanId'])
@@ -0,0 +1,147 @@
+from unittest.mock import patch
+
+import plone.api as api
+import transaction
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.base import APIBase
+from interaktiv.kyra.api.tokens import token_store
+from interaktiv.kyra.controlpanels.prompt_edit import PromptEditView
+from interaktiv.kyra.controlpanels.prompt_manager import PromptManagerView
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import create_response
+from interaktiv.kyra.tests.benchmark import BenchmarkTestCase
+from interaktiv.kyra.views.translations import TranslationsView
+from plone.app.testing import TEST_USER_ID, setRoles
+
+REALMS_URL = 'http://localhost:8080/realms/kyra'
+ITEM_COUNTS = (10, 1000, 10000)
+
+
+def create_prompts(count):
+    return {
+        'prompts': [
+            {
+                'id': f'prompt-{i}',
+                'name': f'Prompt {i}',
+                'description': 'Description',
+                'prompt': 'Prompt text',
+                'metadata': {'categories': ['category'], 'action': 'replace' if i % 2 else 'append'},
+            }
+            for i in range(count)
+        ],
+        'total': count,
+    }
+
+
+def create_files(count):
+    return [
+        {
+            'id': f'file-{i}',
+            'filename': f'file-{i}.txt',
+            'sizeBytes': 1024 * i,
+            'createdAt': '2025-01-15T10:30:00.000Z',
+        }
+        for i in range(count)
+    ]
+
+
+class TestBenchmarks(BenchmarkTestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+        for name, value in (
+                ('gateway_url', 'http://localhost:8080/api/prompts'),
+                ('keycloak_realms_url', REALMS_URL),
+                ('keycloak_client_id', 'test_client_id'),
+                ('keycloak_client_secret', 'test_client_secret'),
+                # Measure the request pipeline, not the prompt cache
+                ('prompt_cache_ttl', 0),
+        ):
+            api.portal.set_registry_record(name=name, interface=IAIAssistantSchema, value=value)
+        # Settings snapshots are only kept once the settings are committed
+        transaction.commit()
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_request__get(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = create_response({'id': 'prompt-1', 'name': 'Prompt'}, real=True)
+        prompts = KyraAPI().prompts
+
+        # do it / postcondition
+        self.assertNoRegression('request_get', lambda: prompts.get('prompt-1'))
+
+    @patch('interaktiv.kyra.api.base.APIBase._get_token')
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_request__apply(self, mock_request, mock_get_token):
+        # setup
+        mock_get_token.return_value = 'test-token'
+        mock_request.return_value = create_response({'response': 'Result'}, real=True)
+        prompts = KyraAPI().prompts
+        payload = {'text': 'Text ' * 100, 'query': 'Query', 'useContext': True}
+
+        # do it / postcondition
+        self.assertNoRegression('request_apply', lambda: prompts.apply('prompt-1', payload))
+
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_token__cached(self, mock_request):
+        # setup
+        mock_request.return_value = create_response({'access_token': 'test-token', 'expires_in': 300}, real=True)
+        api_base = APIBase()
+
+        # do it / postcondition
+        self.assertNoRegression(
+            'token_cached',
+            lambda: api_base._get_token(REALMS_URL, 'test_client_id', 'test_client_secret')
+        )
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('interaktiv.kyra.api.base.requests.Session.request')
+    def test_token__refresh(self, mock_request):
+        # setup
+        mock_request.return_value = create_response({'access_token': 'test-token', 'expires_in': 300}, real=True)
+        api_base = APIBase()
+
+        def refresh():
+            token_store.clear()
+            api_base._get_token(REALMS_URL, 'test_client_id', 'test_client_secret')
+
+        # do it / postcondition
+        self.assertNoRegression('token_refresh', refresh)
+
+    def test_prompt_manager__get_prompts(self):
+        for count in ITEM_COUNTS:
+            with self.subTest(count=count), patch('interaktiv.kyra.api.prompts.Prompts.iter_all') as mock_iter_all:
+                # setup
+                prompts = create_prompts(count)['prompts']
+                mock_iter_all.side_effect = lambda: iter(prompts)
+                view = PromptManagerView(self.portal, self.request)
+
+                # do it / postcondition
+                self.assertNoRegression(f'prompt_manager_get_prompts_{count}', view.get_prompts, rounds=10)
+
+    def test_prompt_edit__get_files(self):
+        self.request.form['prompt_id'] = 'prompt-1'
+        for count in ITEM_COUNTS:
+            with self.subTest(count=count), patch('interaktiv.kyra.api.files.Files.get') as mock_get:
+                # setup
+                mock_get.return_value = create_files(count)
+                view = PromptEditView(self.portal, self.request)
+
+                # do it / postcondition
+                self.assertNoRegression(f'prompt_edit_get_files_{count}', view.get_files, rounds=10)
+
+    def test_translations_view(self):
+        # setup
+        view = TranslationsView(self.portal, self.request)
+
+        # do it / postcondition
+        self.assertNoRegression('translations_view', view)
@@ -64,6 +64,26 @@ class TestPromptManagerView(unittest.TestCase):
         # postcondition
         self.assertEqual(result, [])
 
+    @patch('interaktiv.kyra.controlpanels.prompt_base.IStatusMessage')
+    @patch('interaktiv.kyra.api.prompts.Prompts._list_later')
+    @patch('interaktiv.kyra.api.prompts.Prompts.list')
+    def test_get_prompts__all_pages(self, mock_list, mock_list_later, mock_status_message):
+        # setup
+        mock_list.return_value = {'prompts': [{'id': 'test-1'}], 'total': 300}
+        mock_list_later.side_effect = [
+            Mock(result=Mock(return_value={'prompts': [{'id': 'test-2'}], 'total': 300})),
+            Mock(result=Mock(return_value={'error': 'API Error'})),
+        ]
+        view = self._create_view()
+
+        # do it
+        result = view.get_prompts()
+
+        # postcondition
+        self.assertEqual([prompt['id'] for prompt in result], ['test-1', 'test-2'])
+        mock_list.assert_called_once_with(page=1, size=100)
+        mock_status_message.return_value.addStatusMessage.assert_called_once_with('API Error', type='error')
+
     @patch('interaktiv.kyra.controlpanels.prompt_base.IStatusMessage')
     @patch('interaktiv.kyra.api.prompts.Prompts.create')
     def test__create_prompt__success_without_files(self, mock_create, mock_status_message):
@@ -0,0 +1,104 @@
+import threading
+import unittest
+
+import plone.api as api
+import transaction
+from interaktiv.kyra.loadtest import LoadConfig
+from interaktiv.kyra.loadtest import LoadStats
+from interaktiv.kyra.loadtest import format_report
+from interaktiv.kyra.loadtest import percentile
+from interaktiv.kyra.loadtest import run
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.stubserver import StubConfig
+from interaktiv.kyra.stubserver import create_server
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import SITE_OWNER_NAME
+from plone.app.testing import SITE_OWNER_PASSWORD
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestLoadTest(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        self.server = create_server(StubConfig(port=0, prompts=5, seed=1))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        server_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        for name, value in (
+                ('gateway_url', f'{server_url}/api/prompts'),
+                ('keycloak_realms_url', f'{server_url}/realms/kyra'),
+                ('keycloak_client_id', 'test_client_id'),
+                ('keycloak_client_secret', 'test_client_secret'),
+        ):
+            api.portal.set_registry_record(name=name, interface=IAIAssistantSchema, value=value)
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+        api.content.create(container=self.portal, type='Document', id='document', title='Document')
+        transaction.commit()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_run(self):
+        # setup
+        config = LoadConfig(
+            url=f'http://{self.layer["host"]}:{self.layer["port"]}/plone/document',
+            user=SITE_OWNER_NAME,
+            password=SITE_OWNER_PASSWORD,
+            editors=3,
+            duration=1.0,
+            think_time='fixed:0.05',
+            zope_threads=2,
+            seed=1,
+        )
+
+        # do it
+        summary = run(config)
+
+        # postcondition
+        steps = summary['steps']
+        self.assertEqual(steps['translations']['requests'], 3)
+        self.assertEqual(steps['list']['requests'], 3)
+        self.assertGreater(steps['apply']['requests'], 3)
+        for step in steps.values():
+            self.assertEqual(step['errors'], {})
+        self.assertGreater(summary['throughput'], 0)
+        self.assertIn('Zope threads', format_report(summary))
+
+
+class TestLoadStats(unittest.TestCase):
+
+    def test_percentile(self):
+        # setup
+        values = [float(i) for i in range(1, 101)]
+
+        # do it / postcondition
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([0.5], 95), 0.5)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize(self):
+        # setup
+        stats = LoadStats()
+        stats.started, stats.ended = 0.0, 10.0
+        for _ in range(18):
+            stats.record('apply', 2.0)
+        stats.record('apply', 2.0, error='busy')
+        stats.record('apply', 2.0, error='HTTP 503')
+
+        # do it
+        summary = stats.summarize(zope_threads=2)
+
+        # postcondition
+        apply = summary['steps']['apply']
+        self.assertEqual(apply['throughput'], 2.0)
+        self.assertEqual(apply['error_rate'], 0.1)
+        self.assertEqual(apply['errors'], {'busy': 1, 'HTTP 503': 1})
+        self.assertEqual(summary['concurrent_requests'], 4.0)
+        self.assertEqual(summary['thread_saturation'], 2.0)
+        self.assertIn('queueing', format_report(summary))
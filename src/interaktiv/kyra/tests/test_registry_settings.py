@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import patch
+
+import plone.api as api
+import transaction
+from interaktiv.kyra.registry import settings as settings_module
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.registry.settings import GENERATION_KEY
+from interaktiv.kyra.registry.settings import AIAssistantSettings
+from interaktiv.kyra.registry.settings import get_settings
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_INTEGRATION_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+from plone.registry.interfaces import IRegistry
+from zope.annotation.interfaces import IAnnotations
+from zope.component import getUtility
+
+
+class TestSettings(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_INTEGRATION_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.app = self.layer['app']
+        self.portal = self.layer['portal']
+        self.request = self.layer['request']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    def test_get_settings__defaults(self):
+        # do it
+        settings = get_settings()
+
+        # postcondition
+        self.assertIsInstance(settings, AIAssistantSettings)
+        self.assertIsNone(settings.gateway_url)
+        self.assertEqual(settings.domain_id, 'plone')
+        self.assertEqual(settings.keycloak_token_expiration_time, 1200)
+
+    def test_get_settings__cached(self):
+        # setup
+        get_settings()
+
+        # do it
+        with patch('interaktiv.kyra.registry.settings.getUtility') as mock_get_utility:
+            settings = get_settings()
+
+        # postcondition
+        mock_get_utility.assert_not_called()
+        self.assertEqual(settings.domain_id, 'plone')
+
+    def test_get_settings__rebuilt_on_record_modified(self):
+        # setup
+        get_settings()
+
+        # do it
+        api.portal.set_registry_record(
+            name='domain_id',
+            interface=IAIAssistantSchema,
+            value='test-domain'
+        )
+
+        # postcondition
+        self.assertEqual(get_settings().domain_id, 'test-domain')
+
+    def test_get_settings__other_records_keep_snapshot(self):
+        # setup
+        settings = get_settings()
+
+        # do it
+        registry = getUtility(IRegistry)
+        registry['plone.site_title'] = 'Changed'
+
+        # postcondition
+        self.assertIs(get_settings(), settings)
+
+    def test_get_settings__missing_record_uses_default(self):
+        # setup
+        registry = getUtility(IRegistry)
+        del registry.records['interaktiv.kyra.registry.ai_assistant.IAIAssistantSchema.http_pool_maxsize']
+
+        # do it
+        settings = get_settings()
+
+        # postcondition
+        self.assertEqual(settings.http_pool_maxsize, 10)
+
+    def test_settings__immutable(self):
+        # setup
+        settings = get_settings()
+
+        # do it & postcondition
+        with self.assertRaises(AttributeError):
+            settings.domain_id = 'changed'
+
+
+class TestSettingsGeneration(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        setRoles(self.portal, TEST_USER_ID, ['Manager'])
+
+    def _set_domain_id(self, value):
+        api.portal.set_registry_record(name='domain_id', interface=IAIAssistantSchema, value=value)
+
+    def test_get_settings__rebuilt_on_generation_of_other_process(self):
+        # setup
+        self._set_domain_id('first')
+        transaction.commit()
+        get_settings()
+
+        # do it
+        IAnnotations(self.portal)[GENERATION_KEY].change(1)
+        transaction.commit()
+        with patch.object(settings_module, '_read_settings') as mock_read_settings:
+            mock_read_settings.return_value = AIAssistantSettings(domain_id='second')
+            settings = get_settings()
+
+        # postcondition
+        self.assertEqual(settings.domain_id, 'second')
+        self.assertIs(get_settings(), settings)
+
+    def test_get_settings__uncommitted_change_not_kept(self):
+        # setup
+        self._set_domain_id('first')
+        transaction.commit()
+        get_settings()
+
+        # do it
+        self._set_domain_id('second')
+        uncommitted = get_settings()
+        transaction.abort()
+
+        # postcondition
+        self.assertEqual(uncommitted.domain_id, 'second')
+        self.assertEqual(get_settings().domain_id, 'first')
+
+    def test_get_settings__older_generation_not_stored(self):
+        # setup
+        self._set_domain_id('first')
+        transaction.commit()
+        current = get_settings()
+        generation = IAnnotations(self.portal)[GENERATION_KEY]()
+
+        # do it
+        with patch.object(settings_module, '_get_generation', return_value=(generation - 1, True)):
+            stale = get_settings()
+
+        # postcondition
+        self.assertIsNot(stale, current)
+        self.assertIs(get_settings(), current)
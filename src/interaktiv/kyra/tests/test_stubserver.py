@@ -0,0 +1,143 @@
+import io
+import random
+import threading
+import unittest
+
+import plone.api as api
+from ZPublisher.HTTPRequest import FileUpload
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.session import session_pool
+from interaktiv.kyra.registry.ai_assistant import IAIAssistantSchema
+from interaktiv.kyra.stubserver import StubConfig
+from interaktiv.kyra.stubserver import create_server
+from interaktiv.kyra.stubserver import parse_args
+from interaktiv.kyra.stubserver import parse_distribution
+from interaktiv.kyra.testing import INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+from plone.app.testing import TEST_USER_ID, setRoles
+
+
+class TestStubServer(unittest.TestCase):
+    layer = INTERAKTIV_KYRA_FUNCTIONAL_TESTING
+    product_name = 'interaktiv.kyra'
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+        setRoles(self.portal, TEST_USER_ID, ['Manager', 'Site Administrator'])
+
+    def tearDown(self):
+        session_pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _start(self, **kwargs):
+        self.server = create_server(StubConfig(port=0, seed=1, **kwargs))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        server_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        for name, value in (
+                ('gateway_url', f'{server_url}/api/prompts'),
+                ('keycloak_realms_url', f'{server_url}/realms/kyra'),
+                ('keycloak_client_id', 'test_client_id'),
+                ('keycloak_client_secret', 'test_client_secret'),
+                ('retry_max_attempts', 1),
+        ):
+            api.portal.set_registry_record(name=name, interface=IAIAssistantSchema, value=value)
+        return KyraAPI()
+
+    def test_prompts(self):
+        # setup
+        kyra = self._start(prompts=3, response_size=50)
+
+        # do it
+        listed = kyra.prompts.list(page=1, size=2)
+        created = kyra.prompts.create({
+            'name': 'New', 'description': '', 'prompt': 'Prompt', 'metadata': {'categories': [], 'action': 'append'}
+        })
+        updated = kyra.prompts.update(created['id'], {'name': 'Renamed'})
+        applied = kyra.prompts.apply(created['id'], {'text': 'Text', 'query': 'Query', 'useContext': True})
+        deleted = kyra.prompts.delete(created['id'])
+        missing = kyra.prompts.get(created['id'])
+
+        # postcondition
+        self.assertEqual(listed['total'], 3)
+        self.assertEqual(len(listed['prompts']), 2)
+        self.assertEqual(updated['name'], 'Renamed')
+        self.assertEqual(updated['version'], 2)
+        self.assertTrue(applied['response'].startswith('Text '))
+        self.assertEqual(len(applied['response']), 55)
+        self.assertEqual(deleted, {})
+        self.assertEqual(missing, {'error': 'Prompt not found'})
+
+    def test_files(self):
+        # setup
+        kyra = self._start(prompts=1, files=1, file_size=10)
+        prompt_id = kyra.prompts.list()['prompts'][0]['id']
+        upload = FileUpload(type('Field', (), {
+            'file': io.BytesIO(b'uploaded'),
+            'filename': 'upload.txt',
+            'headers': {'content-type': 'text/plain'},
+            'name': 'file_upload',
+        })())
+
+        # do it
+        uploaded = kyra.files.upload(prompt_id, upload)
+        files = kyra.files.get(prompt_id)
+        downloaded = kyra.files.download(prompt_id, uploaded['files'][0]['id'])
+        deleted = kyra.files.delete(prompt_id, files[0]['id'])
+
+        # postcondition
+        self.assertEqual([file['filename'] for file in files], ['file-1.txt', 'upload.txt'])
+        self.assertEqual(files[0]['sizeBytes'], 10)
+        self.assertEqual(downloaded, {'content': b'uploaded'})
+        self.assertEqual(deleted, {})
+        self.assertEqual(len(kyra.files.get(prompt_id)), 1)
+
+    def test_error_rate(self):
+        # setup
+        kyra = self._start(error_rate=1.0, error_statuses=(502,))
+
+        # do it
+        result = kyra.prompts.list()
+
+        # postcondition
+        self.assertIn('error', result)
+
+    def test_reset_rate(self):
+        # setup
+        kyra = self._start(reset_rate=1.0)
+
+        # do it
+        result = kyra.prompts.list()
+
+        # postcondition
+        self.assertEqual(result, {'error': 'Cannot connect to API service'})
+
+
+class TestStubServerConfig(unittest.TestCase):
+
+    def test_parse_distribution(self):
+        # setup
+        rnd = random.Random(0)
+
+        # do it
+        fixed = parse_distribution('fixed:0.25')(rnd)
+        uniform = [parse_distribution('uniform:0.1,0.2')(rnd) for _ in range(100)]
+        normal = [parse_distribution('normal:0,1')(rnd) for _ in range(100)]
+
+        # postcondition
+        self.assertEqual(fixed, 0.25)
+        self.assertTrue(all(0.1 <= value <= 0.2 for value in uniform))
+        self.assertTrue(all(value >= 0 for value in normal))
+
+    def test_parse_distribution__invalid(self):
+        for spec in ('fixed', 'uniform:1', 'gamma:1,2', 'exponential:0'):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_distribution(spec)
+
+    def test_parse_args(self):
+        # do it
+        config = parse_args(['--port', '0', '--apply-latency', 'uniform:1,5', '--error-statuses', '502,503'])
+
+        # postcondition
+        self.assertEqual(config.port, 0)
+        self.assertEqual(config.apply_latency, 'uniform:1,5')
+        self.assertEqual(config.error_statuses, (502, 503))
@@ -0,0 +1,16 @@
+from plone.registry.interfaces import IRegistry
+from zope.component import getUtility
+
+TOKEN_CACHE_RECORDS = [
+    'interaktiv.kyra.registry.ai_assistant_cache.IAIAssistantCacheSchema.keycloak_token_value',
+    'interaktiv.kyra.registry.ai_assistant_cache.IAIAssistantCacheSchema.keycloak_token_timestamp',
+]
+
+
+# noinspection PyUnusedLocal
+def remove_token_cache_records(context) -> None:
+    """Remove the Keycloak token cache records, tokens are kept in memory"""
+    registry = getUtility(IRegistry)
+    for record_name in TOKEN_CACHE_RECORDS:
+        if record_name in registry.records:
+            del registry.records[record_name]
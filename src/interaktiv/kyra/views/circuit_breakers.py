@@ -0,0 +1,14 @@
+"""Operator view exposing the state of the Kyra gateway circuit breakers."""
+
+import json
+
+from Products.Five import BrowserView
+from interaktiv.kyra.api.breaker import circuit_breakers
+
+
+class CircuitBreakersView(BrowserView):
+
+    def __call__(self):
+        self.request.response.setHeader('Content-Type', 'application/json')
+        self.request.response.setHeader('Cache-Control', 'no-store')
+        return json.dumps({'circuit_breakers': circuit_breakers.info()})
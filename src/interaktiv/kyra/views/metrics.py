@@ -0,0 +1,67 @@
+"""Operator view exposing Kyra client metrics in Prometheus text format."""
+
+from Products.Five import BrowserView
+from interaktiv.kyra.api.breaker import CLOSED, HALF_OPEN, OPEN
+from interaktiv.kyra.api.breaker import circuit_breakers
+from interaktiv.kyra.api.bulkhead import apply_bulkhead
+from interaktiv.kyra.api.cache import prompt_cache
+from interaktiv.kyra.api.coalesce import single_flight
+from interaktiv.kyra.api.metrics import metrics
+from interaktiv.kyra.api.metrics import render_gauge
+from interaktiv.kyra.api.ratelimit import rate_limiters
+
+BREAKER_STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class MetricsView(BrowserView):
+
+    def __call__(self):
+        self.request.response.setHeader('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.request.response.setHeader('Cache-Control', 'no-store')
+        return metrics.render(self._get_state_metrics())
+
+    @staticmethod
+    def _get_state_metrics():
+        lines = []
+
+        flights = single_flight.info()
+        lines += render_gauge(
+            'kyra_coalesced_calls_total', 'GET calls answered by an identical call in flight.',
+            [((), flights['coalesced'])], kind='counter'
+        )
+
+        breakers = circuit_breakers.info()
+        lines += render_gauge(
+            'kyra_circuit_breaker_state', 'Circuit breaker state, 0 closed, 1 half-open, 2 open.',
+            [((('name', info['name']),), BREAKER_STATES[info['state']]) for info in breakers]
+        )
+        lines += render_gauge(
+            'kyra_circuit_breaker_rejected_total', 'Calls rejected by an open circuit breaker.',
+            [((('name', info['name']),), info['rejected']) for info in breakers], kind='counter'
+        )
+
+        lines += render_gauge(
+            'kyra_rate_limit_rejected_total', 'Calls rejected by the client-side rate limit.',
+            [((('name', info['name']),), info['rejected']) for info in rate_limiters.info()], kind='counter'
+        )
+
+        bulkhead = apply_bulkhead.info()
+        lines += render_gauge(
+            'kyra_bulkhead_active', 'Apply calls currently running.', [((), bulkhead['active'])]
+        )
+        lines += render_gauge(
+            'kyra_bulkhead_waiting', 'Apply calls waiting for a free slot.', [((), bulkhead['waiting'])]
+        )
+
+        cache = prompt_cache.info()
+        lines += render_gauge(
+            'kyra_prompt_cache_entries', 'Prompt lists and prompts in the cache.', [((), cache['entries'])]
+        )
+        lines += render_gauge(
+            'kyra_prompt_cache_bytes', 'Response bytes held by the prompt cache.', [((), cache['size'])]
+        )
+        lines += render_gauge(
+            'kyra_prompt_cache_revalidated_total', 'Stale cache entries confirmed by a 304 Not Modified.',
+            [((), cache['revalidated'])], kind='counter'
+        )
+        return lines
@@ -0,0 +1,36 @@
+"""Operator view syncing the local prompt mirror with the gateway."""
+
+import json
+
+from Products.Five import BrowserView
+from interaktiv.kyra.api import KyraAPI
+from interaktiv.kyra.api.prompts import PromptListError
+from plone.protect.interfaces import IDisableCSRFProtection
+from zope.interface import alsoProvides
+
+
+class PromptMirrorSyncView(BrowserView):
+    """Syncs the mirror on POST and answers with the changes, meant to be
+    called periodically, e.g. by cron.
+    """
+
+    def __call__(self):
+        self.request.response.setHeader('Content-Type', 'application/json')
+        self.request.response.setHeader('Cache-Control', 'no-store')
+        if self.request.method != 'POST':
+            self.request.response.setHeader('Allow', 'POST')
+            self.request.response.setStatus(405)
+            return json.dumps({'error': 'Method Not Allowed'})
+
+        # Like the REST services, this view is called by scripts that
+        # authenticate per request and cannot fetch a CSRF token. A forged
+        # POST can only trigger a sync: the view takes no input, needs the
+        # permission to manage the KYRA settings and writes nothing but the
+        # gateway's own prompts.
+        alsoProvides(self.request, IDisableCSRFProtection)
+        try:
+            mirror = KyraAPI().prompts.sync_mirror()
+        except PromptListError as e:
+            self.request.response.setStatus(502)
+            return json.dumps({'error': str(e)})
+        return json.dumps({'prompt_mirror': mirror})